@@ -0,0 +1,119 @@
+"""
+Tempo de inicialização de cada subcomando do cli.py (processo novo, do inicio do python até o fim do subcomando)
+
+Cada subcomando roda sobre uma pasta vazia e um banco temporário, assim o tempo medido é praticamente o das importações.
+A meta de cada subcomando (META_MS) é comparada com o menor tempo das repetições, e o relatório também mostra
+se o pandas e os leitores das distribuidoras foram importados (identify e stats não devem importar)
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_inicializacao
+    python -m benchmarks.bench_inicializacao --repeticoes 10 --saida inicializacao.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_leitor import ambiente
+
+RAIZ: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# meta de inicialização (ms) de cada subcomando
+META_MS: Dict[str, float] = {
+    "identify": 200,
+    "stats": 100,
+    "export": 1000,
+    "ingest": 1000,
+}
+
+# executa o subcomando e informa, na ultima linha, quais modulos pesados foram importados
+CODIGO: str = """
+import sys, json, cli
+cli.executa({argv!r})
+print(json.dumps({{modulo: modulo in sys.modules for modulo in ("pandas", "numpy", "scripts.classes.CPFL")}}))
+"""
+
+
+def comandos(pasta: str, banco: str) -> Dict[str, List[str]]:
+    return {
+        "identify": ["identify", pasta],
+        "stats": ["stats", "--banco", banco],
+        "export": ["export", "--banco", banco, "--saida", pasta],
+        "ingest": ["ingest", pasta, "--banco", banco, "--sem-exportacao", "--cache-textos", "", "--processos", "1"],
+    }
+
+
+def mede(argv: List[str], repeticoes: int) -> Dict[str, Any]:
+    """
+    Executa o subcomando em um processo novo algumas vezes
+
+    Returns:
+        - Dict[str, Any]: menor tempo (ms) e modulos importados
+    """
+    melhor, importados = float("inf"), {}
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        saida = subprocess.run(
+            [sys.executable, "-c", CODIGO.format(argv=argv)], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout
+        melhor = min(melhor, (time.perf_counter() - inicio) * 1000)
+        importados = json.loads(saida.strip().splitlines()[-1])
+    return {"tempo_ms": melhor, "importados": importados}
+
+
+def main_bench(repeticoes: int, saida: str = None) -> Dict[str, Any]:
+    resultados: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="bench_inicializacao_") as pasta:
+        banco = os.path.join(pasta, "vazio.db")
+        # o ingest cria e migra o banco, os demais subcomandos o encontram pronto
+        comandos_ = comandos(pasta, banco)
+        for subcomando in ("ingest", "identify", "stats", "export"):
+            medida = mede(comandos_[subcomando], repeticoes)
+            resultados.append({
+                "subcomando": subcomando,
+                **medida,
+                "meta_ms": META_MS[subcomando],
+                "dentro_da_meta": medida["tempo_ms"] <= META_MS[subcomando],
+            })
+        base = mede_python(repeticoes)
+
+    print(f"{'subcomando':<10} {'tempo (ms)':>11} {'meta (ms)':>10} {'ok':>4}  importados")
+    for r in resultados:
+        importados = ", ".join(modulo for modulo, importado in r["importados"].items() if importado) or "-"
+        print(f"{r['subcomando']:<10} {r['tempo_ms']:>11.1f} {r['meta_ms']:>10.0f} {'sim' if r['dentro_da_meta'] else 'não':>4}  {importados}")
+    print(f"python sem importações: {base['python_ms']:.1f} ms, import main: {base['import_main_ms']:.1f} ms")
+
+    relatorio = {"ambiente": ambiente(), "repeticoes": repeticoes, **base, "resultados": resultados}
+    if saida is not None:
+        with open(saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    return relatorio
+
+
+def mede_python(repeticoes: int) -> Dict[str, float]:
+    """
+    Referências: inicialização do python sozinho e importação do main.py (todas as dependências da leitura)
+    """
+    tempos = {}
+    for nome, codigo in (("python_ms", "pass"), ("import_main_ms", "import main")):
+        melhor = float("inf")
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, check=True)
+            melhor = min(melhor, (time.perf_counter() - inicio) * 1000)
+        tempos[nome] = melhor
+    return tempos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tempo de inicialização dos subcomandos do cli.py")
+    parser.add_argument("--repeticoes", type=int, default=5, help="repetições de cada medição (vale o menor tempo)")
+    parser.add_argument("--saida", default=None, help="arquivo json para salvar os resultados")
+    args = parser.parse_args()
+    main_bench(args.repeticoes, args.saida)
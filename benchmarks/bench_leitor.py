@@ -0,0 +1,176 @@
+"""
+Benchmark do leitor de faturas com faturas sintéticas de cada distribuidora, sem depender de rede ou de faturas reais
+
+Mede a vazão (faturas/s) de cada etapa em escalas de 100 / 1.000 / 10.000 faturas:
+    - identificacao: abertura do pdf + Identificador (pdfs sintéticos gerados em uma pasta temporária)
+    - leitura: main() de cada distribuidora a partir do texto ja extraído (total e por distribuidora)
+    - dataframe: montagem das tabelas de consumo e demanda (set_consumos_e_demandas)
+    - gravacao: gravação dos clientes e consumos em um banco sqlite temporário
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_leitor
+    python -m benchmarks.bench_leitor --escalas 100,1000 --repeticoes 3 --saida bench.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+import contextlib
+import pandas as pd
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from benchmarks import faturas_sinteticas
+from scripts.classes.Fatura import Fatura
+from scripts.classes.Sessao import Sessao
+from scripts.classes.Documento import Documento
+from scripts.funcoes.f_esquema import migra_banco
+from scripts.funcoes.f_distribuidoras import get_classe, suportada
+from scripts.classes.Identificador import Identificador
+from scripts.classes.ResultadoFatura import ResultadoFatura
+from scripts.funcoes.f_database import adiciona_novo_id_clientes, get_clientes_existentes, salva_novos_clientes
+
+def cronometra(funcao: Callable[[], Any], repeticoes: int) -> Tuple[float, Any]:
+    """
+    Executa a função algumas vezes e retorna o menor tempo (s) e o resultado da ultima execução
+    """
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def identifica(caminhos: List[Tuple[str, str]]) -> int:
+    """
+    Identifica todas as faturas em pdf, retorna quantas foram identificadas corretamente
+    """
+    acertos = 0
+    for distribuidora, caminho in caminhos:
+        classe = Identificador(infos={distribuidora: caminho}).main()
+        acertos += classe is not None and classe.__name__ == distribuidora
+    return acertos
+
+
+def le(faturas: List[Tuple[str, str, List[str]]]) -> Dict[str, List[ResultadoFatura]]:
+    """
+    Executa a leitura (main) das faturas suportadas a partir do texto ja extraído, mantendo apenas os dados extraídos (como em main)
+    """
+    DISTRIBUIDORAS: Dict[str, List[ResultadoFatura]] = {}
+    for distribuidora, arquivo, paginas in faturas:
+        if suportada(distribuidora):
+            fatura: Fatura = get_classe(distribuidora)(arquivo, Documento.de_textos(paginas, arquivo))
+            fatura.main()
+            DISTRIBUIDORAS.setdefault(distribuidora, []).append(ResultadoFatura.de_fatura(fatura))
+    return DISTRIBUIDORAS
+
+
+def monta_dataframe(DISTRIBUIDORAS: Dict[str, List[ResultadoFatura]]) -> pd.DataFrame:
+    """
+    Monta a tabela final de consumos e demandas (como em grava_distribuidoras)
+    """
+    return pd.concat(main.set_consumos_e_demandas(DISTRIBUIDORAS), axis=1).drop_duplicates().fillna(-1).reset_index()
+
+
+def grava(infos: pd.DataFrame, db_path: str) -> None:
+    """
+    Grava os clientes e os consumos de cada distribuidora em um banco novo (como em main)
+    """
+    with contextlib.suppress(FileNotFoundError):
+        os.remove(db_path)
+    with Sessao(db_path) as sessao:
+        migra_banco(sessao)
+        salva_novos_clientes(adiciona_novo_id_clientes(infos.copy()), sessao)
+        clientes_existentes = get_clientes_existentes(sessao, nomes=infos.nome)
+        for distribuidora in infos.distribuidora.unique():
+            consumos = infos.loc[infos.distribuidora == distribuidora]
+            main.distribuidora_db(sessao, consumos, clientes_existentes, distribuidora)
+
+
+def executa_escala(quantidade: int, repeticoes: int, pasta: str) -> List[Dict[str, Any]]:
+    """
+    Executa todas as etapas para uma escala (quantidade de faturas)
+
+    Returns:
+        - List[Dict[str, Any]]: resultado de cada etapa (etapa, distribuidora, faturas, tempo_s, faturas_por_s)
+    """
+    resultados: List[Dict[str, Any]] = []
+    registra = lambda etapa, faturas, tempo, distribuidora="todas": resultados.append({
+        "escala": quantidade, "etapa": etapa, "distribuidora": distribuidora, "faturas": faturas,
+        "tempo_s": tempo, "faturas_por_s": faturas / tempo if tempo else None,
+    })
+    faturas = faturas_sinteticas.faturas(quantidade)
+
+    caminhos = faturas_sinteticas.salva_pdfs(os.path.join(pasta, f"pdfs_{quantidade}"), quantidade)
+    tempo, acertos = cronometra(lambda: identifica(caminhos), repeticoes)
+    assert acertos == quantidade, f"{quantidade - acertos} faturas sintéticas não identificadas"
+    registra("identificacao", quantidade, tempo)
+
+    tempo, DISTRIBUIDORAS = cronometra(lambda: le(faturas), repeticoes)
+    registra("leitura", sum(map(len, DISTRIBUIDORAS.values())), tempo)
+    for distribuidora in DISTRIBUIDORAS:
+        da_distribuidora = [fatura for fatura in faturas if fatura[0] == distribuidora]
+        tempo, _ = cronometra(lambda: le(da_distribuidora), repeticoes)
+        registra("leitura", len(da_distribuidora), tempo, distribuidora)
+
+    tempo, infos = cronometra(lambda: monta_dataframe(DISTRIBUIDORAS), repeticoes)
+    registra("dataframe", sum(map(len, DISTRIBUIDORAS.values())), tempo)
+
+    tempo, _ = cronometra(lambda: grava(infos, os.path.join(pasta, f"bench_{quantidade}.db")), repeticoes)
+    registra("gravacao", sum(map(len, DISTRIBUIDORAS.values())), tempo)
+    return resultados
+
+
+def ambiente() -> Dict[str, Any]:
+    """
+    Informações para comparar resultados entre commits e maquinas
+    """
+    commit = None
+    with contextlib.suppress(Exception):
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    import PyPDF2
+    return {
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "pandas": pd.__version__,
+        "PyPDF2": PyPDF2.__version__,
+    }
+
+
+def main_bench(escalas: List[int], repeticoes: int, saida: str = None) -> Dict[str, Any]:
+    resultados: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="bench_leitor_") as pasta:
+        for quantidade in escalas:
+            resultados += executa_escala(quantidade, repeticoes, pasta)
+
+    print(f"{'escala':>7} {'etapa':<14} {'distribuidora':<14} {'faturas':>8} {'tempo (s)':>10} {'faturas/s':>10}")
+    for r in resultados:
+        print(f"{r['escala']:>7} {r['etapa']:<14} {r['distribuidora']:<14} {r['faturas']:>8} {r['tempo_s']:>10.3f} {r['faturas_por_s'] or 0:>10.1f}")
+
+    relatorio = {"ambiente": ambiente(), "repeticoes": repeticoes, "resultados": resultados}
+    if saida is not None:
+        with open(saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    return relatorio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark do leitor de faturas com faturas sintéticas")
+    parser.add_argument("--escalas", default="100,1000,10000", help="quantidades de faturas, separadas por virgula")
+    parser.add_argument("--repeticoes", type=int, default=1, help="repetições de cada medição (vale o menor tempo)")
+    parser.add_argument("--saida", default=None, help="arquivo json para salvar os resultados")
+    args = parser.parse_args()
+    main_bench([int(x) for x in args.escalas.split(",")], args.repeticoes, args.saida)
@@ -0,0 +1,111 @@
+"""
+Micro-benchmark dos padrões de regex das distribuidoras (scripts/funcoes/f_regex.py) com o pacote regex e com o re da biblioteca padrão
+
+Para cada padrão, mede a operação usada pela distribuidora (search, sub ou split) sobre o texto das faturas sintéticas:
+    - compilado: padrão compilado uma unica vez (REGEX), como nas distribuidoras
+    - por_chamada: motor.search(padrao, texto) a cada chamada, como antes do registro de padrões (busca no cache do motor)
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_regex
+    python -m benchmarks.bench_regex --faturas 600 --repeticoes 5 --saida bench_regex.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import faturas_sinteticas
+from benchmarks.bench_leitor import ambiente
+from scripts.funcoes.f_regex import MOTORES, PADROES, compila_padroes, get_motor
+
+# operação de cada padrão nas distribuidoras (os demais usam search)
+OPERACOES: Dict[str, str] = {
+    "espacos": "split",
+    "nome_separador": "split",
+    "historico_colunas": "split",
+    "demanda_fim": "sub",
+    "datas_fim": "sub",
+    "espaco": "sub",
+}
+
+
+def operacao(alvo: Any, nome: str, padrao: Any = None) -> Callable[[str], Any]:
+    """
+    Função que executa a operação do padrão sobre um texto
+
+    Args:
+        - alvo (Any): padrão compilado, ou o modulo do motor (com o padrão em texto em padrao)
+        - nome (str): nome do padrão em PADROES
+        - padrao (str | None): padrão em texto, quando alvo é o modulo do motor
+
+    Returns:
+        - Callable[[str], Any]: função que recebe o texto
+    """
+    tipo = OPERACOES.get(nome, "search")
+    args = () if padrao is None else (padrao,)
+    if tipo == "sub":
+        return lambda texto: getattr(alvo, "sub")(*args, "", texto)
+    return lambda texto: getattr(alvo, tipo)(*args, texto)
+
+
+def cronometra(funcao: Callable[[str], Any], textos: List[str], repeticoes: int) -> float:
+    """
+    Executa a função em todos os textos algumas vezes e retorna o menor tempo (s)
+    """
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for texto in textos:
+            funcao(texto)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+
+def main_bench(quantidade: int, repeticoes: int, saida: str = None) -> Dict[str, Any]:
+    textos: Dict[str, List[str]] = {}
+    for distribuidora, _, paginas in faturas_sinteticas.faturas(quantidade):
+        textos.setdefault(distribuidora, []).extend(paginas)
+
+    motores = {nome: get_motor(nome) for nome in MOTORES}
+    compilados = {nome: compila_padroes(motor) for nome, motor in motores.items()}
+    resultados: List[Dict[str, Any]] = []
+    for distribuidora, padroes in PADROES.items():
+        for nome, padrao in padroes.items():
+            for motor in MOTORES:
+                resultados.append({
+                    "distribuidora": distribuidora,
+                    "padrao": nome,
+                    "motor": motor,
+                    "chamadas": len(textos[distribuidora]),
+                    "compilado_s": cronometra(operacao(compilados[motor][distribuidora][nome], nome), textos[distribuidora], repeticoes),
+                    "por_chamada_s": cronometra(operacao(motores[motor], nome, padrao), textos[distribuidora], repeticoes),
+                })
+
+    print(f"{'distribuidora':<14} {'padrao':<20} {'motor':<6} {'chamadas':>8} {'compilado (us)':>15} {'por chamada (us)':>17}")
+    for r in resultados:
+        print(
+            f"{r['distribuidora']:<14} {r['padrao']:<20} {r['motor']:<6} {r['chamadas']:>8} "
+            f"{r['compilado_s'] / r['chamadas'] * 1e6:>15.2f} {r['por_chamada_s'] / r['chamadas'] * 1e6:>17.2f}"
+        )
+    totais = {motor: sum(r["compilado_s"] for r in resultados if r["motor"] == motor) for motor in MOTORES}
+    print("total compilado (s): " + ", ".join(f"{motor}={tempo:.4f}" for motor, tempo in totais.items()))
+    print(f"motor mais rapido: {min(totais, key=totais.get)}")
+
+    relatorio = {"ambiente": ambiente(), "repeticoes": repeticoes, "totais_s": totais, "resultados": resultados}
+    if saida is not None:
+        with open(saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    return relatorio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Micro-benchmark dos padrões de regex das distribuidoras (regex x re)")
+    parser.add_argument("--faturas", type=int, default=600, help="quantidade de faturas sintéticas")
+    parser.add_argument("--repeticoes", type=int, default=5, help="repetições de cada medição (vale o menor tempo)")
+    parser.add_argument("--saida", default=None, help="arquivo json para salvar os resultados")
+    args = parser.parse_args()
+    main_bench(args.faturas, args.repeticoes, args.saida)
@@ -0,0 +1,179 @@
+"""
+Conformidade e velocidade dos extratores de texto (PyPDF2, pypdf, pdfminer, pypdfium2)
+
+Lê as mesmas faturas com cada extrator disponivel, passando pelos leitores de todas as distribuidoras (processa_fatura_compacta),
+e compara o resultado de cada fatura com o do extrator de referência (PyPDF2):
+    - iguais: faturas com a mesma distribuidora, nome, medidas, ths e o mesmo histórico de consumo e demanda
+    - extracao_s: tempo de extração do texto (Documento.paginas), total_s: abertura + extração + identificação + leitura
+    - bruto_divergentes: faturas em que a identificação rapida (conteudo bruto da primeira página) encontra uma distribuidora
+    diferente da identificação pelo texto extraído (vazio nos extratores sem acesso ao conteudo bruto)
+Um extrator só deve ser usado em produção (--extrator) se todas as faturas forem iguais as da referência
+e nenhuma identificação pelo conteudo bruto divergir do texto extraído
+
+Uso (na raiz do repositório):
+    python -m benchmarks.conformidade_extratores
+    python -m benchmarks.conformidade_extratores --pasta "caminho\\das\\faturas" --saida conformidade.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+from benchmarks import faturas_sinteticas
+from benchmarks.bench_leitor import ambiente
+from scripts.classes import CacheTextos, Extrator
+from scripts.classes.Identificador import Identificador
+from scripts.classes.ResultadoFatura import ResultadoFatura
+
+
+def carrega_pdfs(pasta: str) -> List[Tuple[str, bytes]]:
+    """
+    Lê antecipadamente os pdfs da pasta, para que a leitura do disco não entre no tempo dos extratores
+
+    Returns:
+        - List[Tuple[str, bytes]]: (caminho, conteudo) de cada pdf
+    """
+    caminhos = sorted(
+        os.path.join(pasta, arquivo) for arquivo in os.listdir(pasta) if arquivo.lower().endswith(".pdf")
+    )
+    pdfs = []
+    for caminho in caminhos:
+        with open(caminho, "rb") as pdf:
+            pdfs.append((caminho, pdf.read()))
+    return pdfs
+
+
+def le_com_extrator(nome: str, pdfs: List[Tuple[str, bytes]]) -> Tuple[List[Optional[ResultadoFatura]], float]:
+    """
+    Lê as faturas com o extrator informado, sem o cache de textos
+
+    Returns:
+        - Tuple[List[ResultadoFatura | None], float]: resultado de cada fatura e tempo total (s)
+    """
+    os.environ[Extrator.VARIAVEL_AMBIENTE] = nome
+    os.environ[CacheTextos.VARIAVEL_AMBIENTE] = ""
+    inicio = time.perf_counter()
+    resultados = [
+        main.processa_fatura_compacta({main.filename(caminho, ".pdf"): caminho}, conteudo) for caminho, conteudo in pdfs
+    ]
+    return resultados, time.perf_counter() - inicio
+
+
+def identificacoes_divergentes(nome: str, pdfs: List[Tuple[str, bytes]]) -> Optional[int]:
+    """
+    Identifica cada fatura pelo conteudo bruto da primeira página e pelo texto extraído, com o extrator informado
+
+    Returns:
+        - int | None: faturas em que o conteudo bruto identifica uma distribuidora diferente da do texto extraído
+        (sem distribuidora no conteudo bruto não é divergencia, a identificação usa o texto), None sem acesso ao conteudo bruto
+    """
+    os.environ[Extrator.VARIAVEL_AMBIENTE] = nome
+    os.environ[CacheTextos.VARIAVEL_AMBIENTE] = ""
+    divergentes = 0
+    for caminho, conteudo in pdfs:
+        try:
+            identificador = Identificador({main.filename(caminho, ".pdf"): caminho}, conteudo=conteudo)
+            with identificador.documento:
+                bruto = identificador.encontra_distribuidora(identificador.documento.conteudo_bruto())
+                texto = identificador.encontra_distribuidora(identificador.fatura)
+        except NotImplementedError:
+            return None
+        except Extrator.EXTRATORES[nome].erros():
+            continue
+        divergentes += bruto is not None and bruto != texto
+    return divergentes
+
+
+def tabelas_iguais(a: Optional[pd.DataFrame], b: Optional[pd.DataFrame]) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return a.reset_index(drop=True).equals(b.reset_index(drop=True))
+
+
+def iguais(a: Optional[ResultadoFatura], b: Optional[ResultadoFatura]) -> bool:
+    """
+    Compara os dados extraídos de uma fatura por dois extratores (faturas não lidas só são iguais a outras não lidas)
+    """
+    if a is None or b is None:
+        return a is None and b is None
+    campos = ("distribuidora", "nome", "medida_consumo", "medida_demanda", "ths", "erro")
+    return (
+        all(getattr(a, campo) == getattr(b, campo) for campo in campos)
+        and tabelas_iguais(a.consumo, b.consumo)
+        and tabelas_iguais(a.demanda, b.demanda)
+    )
+
+
+def main_bench(pasta: Optional[str], quantidade: int, extratores: List[str], saida: str = None) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="conformidade_") as temporaria:
+        if pasta is None:
+            pasta = temporaria
+            faturas_sinteticas.salva_pdfs(pasta, quantidade)
+        pdfs = carrega_pdfs(pasta)
+
+    referencia: Optional[List[Optional[ResultadoFatura]]] = None
+    resultados: List[Dict[str, Any]] = []
+    for nome in extratores:
+        lidas, total = le_com_extrator(nome, pdfs)
+        referencia = referencia if referencia is not None else lidas
+        # a distribuidora vem da referência, assim as faturas não identificadas pelo extrator também entram na comparação
+        por_distribuidora: Dict[str, Dict[str, Any]] = {}
+        for lida, esperada in zip(lidas, referencia):
+            distribuidora = getattr(esperada, "distribuidora", None) or "(não identificada)"
+            linha = por_distribuidora.setdefault(distribuidora, {"faturas": 0, "iguais": 0, "extracao_s": 0.0})
+            linha["faturas"] += 1
+            linha["iguais"] += iguais(lida, esperada)
+            linha["extracao_s"] += lida.tempos.get("extracao_texto", 0.0) if lida is not None else 0.0
+        for distribuidora, linha in sorted(por_distribuidora.items()):
+            resultados.append({"extrator": nome, "versao": Extrator.EXTRATORES[nome].versao(), "distribuidora": distribuidora, **linha})
+        resultados.append({
+            "extrator": nome,
+            "versao": Extrator.EXTRATORES[nome].versao(),
+            "distribuidora": "TOTAL",
+            "faturas": len(pdfs),
+            "iguais": sum(linha["iguais"] for linha in por_distribuidora.values()),
+            "extracao_s": sum(linha["extracao_s"] for linha in por_distribuidora.values()),
+            "total_s": total,
+            "faturas_por_s": len(pdfs) / total if total else None,
+            "bruto_divergentes": identificacoes_divergentes(nome, pdfs),
+        })
+
+    print(
+        f"{'extrator':<22} {'distribuidora':<18} {'faturas':>8} {'iguais':>7} {'extração (s)':>13} {'total (s)':>10} {'faturas/s':>10}"
+        f" {'bruto div.':>10}"
+    )
+    for r in resultados:
+        # o tempo total, a vazão e a identificação pelo conteudo bruto são medidos apenas para o conjunto das faturas
+        total = f"{r['total_s']:>10.3f} {r['faturas_por_s'] or 0:>10.1f}" if "total_s" in r else ""
+        if "bruto_divergentes" in r:
+            total += f" {'' if r['bruto_divergentes'] is None else r['bruto_divergentes']:>10}"
+        print(f"{r['versao']:<22} {r['distribuidora']:<18} {r['faturas']:>8} {r['iguais']:>7} {r['extracao_s']:>13.3f} {total}".rstrip())
+    conformes = [
+        r["extrator"] for r in resultados
+        if r["distribuidora"] == "TOTAL" and r["iguais"] == r["faturas"] and not r["bruto_divergentes"]
+    ]
+    print(f"extratores conformes com {extratores[0]}: {', '.join(conformes)}")
+
+    relatorio = {"ambiente": ambiente(), "referencia": extratores[0], "conformes": conformes, "resultados": resultados}
+    if saida is not None:
+        with open(saida, "w", encoding="utf-8") as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+    return relatorio
+
+
+if __name__ == "__main__":
+    disponiveis = [nome for nome, extrator in Extrator.EXTRATORES.items() if extrator.disponivel()]
+    parser = argparse.ArgumentParser(description="Conformidade e velocidade dos extratores de texto dos pdfs")
+    parser.add_argument("--pasta", default=None, help="pasta com faturas reais em pdf (padrão: faturas sintéticas em uma pasta temporária)")
+    parser.add_argument("--faturas", type=int, default=300, help="quantidade de faturas sintéticas (sem --pasta)")
+    parser.add_argument("--extratores", default=",".join(disponiveis), help="extratores separados por virgula, o primeiro é a referência (padrão: todos os instalados)")
+    parser.add_argument("--saida", default=None, help="arquivo json para salvar os resultados")
+    args = parser.parse_args()
+    main_bench(args.pasta, args.faturas, args.extratores.split(","), args.saida)
@@ -0,0 +1,226 @@
+"""
+Faturas sintéticas para os benchmarks: texto das páginas no layout que cada leitor de distribuidora espera
+e um gerador mínimo de PDF (fonte Helvetica / WinAnsiEncoding, ou uma fonte CID com o texto em hexadecimal, como nas faturas
+geradas por alguns sistemas) para medir também a abertura e a extração de texto
+"""
+import os
+import zlib
+from typing import Callable, Dict, List, Tuple
+
+MESES: List[str] = ["jan", "fev", "mar", "abr", "mai", "jun", "jul", "ago", "set", "out", "nov", "dez"]
+
+
+def historico(n: int = 12, ano: int = 2023, mes: int = 9) -> List[Tuple[int, int]]:
+    """
+    Meses do histórico, do mais recente para o mais antigo
+
+    Returns:
+        - List[Tuple[int, int]]: (mes, ano) de cada linha do histórico
+    """
+    meses = []
+    for _ in range(n):
+        meses.append((mes, ano))
+        mes, ano = (mes - 1, ano) if mes > 1 else (12, ano - 1)
+    return meses
+
+
+def numero_br(valor: float, casas: int = 2) -> str:
+    """
+    Formata o numero no padrão brasileiro (1.234,56)
+    """
+    texto = f"{valor:,.{casas}f}"
+    return texto.replace(",", "X").replace(".", ",").replace("X", ".")
+
+
+def cpfl(i: int = 0) -> List[str]:
+    anos: Dict[int, List[str]] = {}
+    for mes, ano in historico():
+        anos.setdefault(ano, []).append(MESES[mes - 1])
+    datas = [f"{ano} " + " ".join(meses) for ano, meses in anos.items()]
+    consumo_p = [numero_br(100 + i + k) for k in range(12)]
+    consumo_fp = [numero_br(1000 + 10 * i + k) for k in range(12)]
+    demanda = [numero_br(50 + k, 1) for k in range(12)]
+    pagina_1 = [f"EMPRESA CPFL {i} LTDA", "cpflempresas", "modalidade verde", "dados do cliente"]
+    pagina_2 = (
+        ["historico", "consumo ponta [kwh]", "kwh"] + consumo_p[:-1] + [consumo_p[-1] + " dias"]
+        + ["consumo fora de ponta [kwh]"] + datas + ["ll", "kwh"] + consumo_fp[:-1] + [consumo_fp[-1] + " dias"]
+        + ["demanda - [kw]"] + demanda + ["dias", "fim"]
+    )
+    return ["\n".join(pagina_1), "\n".join(pagina_2)]
+
+
+def copel(i: int = 0) -> List[str]:
+    linhas = [
+        f"{mes:02d}/{ano} 1000,00 10/{mes:02d}/{ano} 12/{mes:02d}/{ano} {200 + k + i} {2000 + k} {80 + k} {90 + k}"
+        for k, (mes, ano) in enumerate(historico())
+    ]
+    pagina_1 = ["copel distribuição s.a", "fatura de energia"]
+    pagina_2 = [
+        "fatura", "segunda via", "dados", f"EMPRESA COPEL {i}", "consumo (kwh) demanda (kw)",
+        "mês/ano faturavencimento pagamento pontafora pta. pontafora pta. pontafora pta. pontafora pta."
+    ] + linhas
+    return ["\n".join(pagina_1), "\n".join(pagina_2)]
+
+
+def cemig(i: int = 0) -> List[str]:
+    linhas = [
+        f"{MESES[mes - 1]}/{ano % 100:02d} {40 + k} {50 + k} {numero_br(1200 + k + i, 0)} {3000 + k} 30"
+        for k, (mes, ano) in enumerate(historico())
+    ]
+    linhas[-1] = linhas[-1][:-3] + " reservado ao fisco"
+    pagina_1 = ["fale com cemig", "ths verde ", "energia(kwh) demanda(kw)", "hp hfp hp hfp hr"] + linhas
+    pagina_2 = [f"cliente: EMPRESA CEMIG {i} unidade: 123"]
+    return ["\n".join(pagina_1), "\n".join(pagina_2)]
+
+
+def edp(i: int = 0) -> List[str]:
+    linhas = [
+        f"{mes:02d}/{ano % 100:02d} {100 + k + i}.0 {900 + k}.0 {10 + k}.0 {60 + k}.0"
+        for k, (mes, ano) in enumerate(historico(13))
+    ]
+    pagina_1 = [
+        "edp são paulo distribuição de energia s.a.", "cliente / endereço de entrega", f"EMPRESA EDP {i} ",
+        "modalidade tarifária", "verde a4"
+    ]
+    pagina_2 = ["consumo kwh", "leituras", "medidor", "demanda kw"]
+    pagina_3 = linhas + ["histórico de consumo"]
+    return ["\n".join(pagina_1), "\n".join(pagina_2), "\n".join(pagina_3)]
+
+
+def enel(i: int = 0) -> List[str]:
+    linhas = [
+        f"{MESES[mes - 1]}/{ano % 100:02d} {numero_br(40 + k, 1)} {numero_br(50 + k, 1)} "
+        f"{numero_br(1100 + k + i, 0)} {numero_br(4100 + k, 0)} 30"
+        for k, (mes, ano) in enumerate(historico())
+    ]
+    linhas[-1] = linhas[-1] + " fim"
+    pagina_1 = [
+        "eletropaulo metropolitana eletricidade de são paulo s.a", "nome do pagador/cpf/cnpj/endereço",
+        f"EMPRESA ENEL {i}  - cnpj 000", "subgrupo - a4 - verde - x", "quant. faturada (kw/kwh)",
+        "mês/ano dem p", "unidades"
+    ] + linhas
+    return ["\n".join(pagina_1)]
+
+
+def elektro(i: int = 0) -> List[str]:
+    pagina_1 = [
+        "elektro redes s.a.", f"EMPRESA ELEKTRO {i}", "tarifa horária verde /", "consumo ponta te kwh",
+        "demanda tusd kw", "leitura atual: 10/09/2023"
+    ]
+    return ["\n".join(pagina_1)]
+
+
+LAYOUTS: Dict[str, Callable[[int], List[str]]] = {
+    "CPFL": cpfl,
+    "COPEL": copel,
+    "CEMIG": cemig,
+    "EDP": edp,
+    "ENEL": enel,
+    "ELEKTRO": elektro,
+}
+
+
+def faturas(quantidade: int) -> List[Tuple[str, str, List[str]]]:
+    """
+    Gera as faturas sintéticas alternando as distribuidoras
+
+    Args:
+        - quantidade (int): quantidade de faturas
+
+    Returns:
+        - List[Tuple[str, str, List[str]]]: (distribuidora, nome do arquivo, texto das páginas) de cada fatura
+    """
+    nomes = list(LAYOUTS)
+    resultado = []
+    for n in range(quantidade):
+        distribuidora, i = nomes[n % len(nomes)], n // len(nomes)
+        resultado.append((distribuidora, f"{distribuidora}_{i}.pdf", LAYOUTS[distribuidora](i)))
+    return resultado
+
+
+def _escapa(linha: str) -> str:
+    return linha.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+# fonte CID (Type0 / Identity-H): cada caractere é um código de 2 bytes (o próprio code point, latin-1), mapeado pelo ToUnicode
+CMAP_IDENTIDADE: bytes = b"""/CIDInit /ProcSet findresource begin 12 dict begin begincmap
+/CIDSystemInfo << /Registry (Adobe) /Ordering (UCS) /Supplement 0 >> def /CMapName /Adobe-Identity-UCS def /CMapType 2 def
+1 begincodespacerange <0000> <FFFF> endcodespacerange
+1 beginbfrange <0000> <00FF> <0000> endbfrange
+endcmap CMapName currentdict /CMap defineresource pop end end"""
+
+
+def _texto_cid(linha: str) -> str:
+    return "<" + "".join(f"{ord(caractere):04X}" for caractere in linha) + ">"
+
+
+def gera_pdf(paginas: List[str], cid: bool = False) -> bytes:
+    """
+    Gera um PDF simples com uma linha de texto por linha das páginas (Tj + T*)
+
+    Args:
+        - paginas (List[str]): texto de cada página
+        - cid (bool): se True, usa uma fonte CID com o texto em hexadecimal (o conteudo bruto não contém o texto literal)
+
+    Returns:
+        - bytes: conteúdo do arquivo pdf
+    """
+    objetos = [b"<< /Type /Catalog /Pages 2 0 R >>"]
+    filhos = " ".join(f"{4 + 2 * n} 0 R" for n in range(len(paginas)))
+    objetos.append(f"<< /Type /Pages /Kids [{filhos}] /Count {len(paginas)} >>".encode())
+    fonte = len(paginas) * 2 + 4
+    if cid:
+        objetos.append(
+            f"<< /Type /Font /Subtype /Type0 /BaseFont /ABCDEF+Arial /Encoding /Identity-H "
+            f"/DescendantFonts [{fonte} 0 R] /ToUnicode {fonte + 1} 0 R >>".encode()
+        )
+    else:
+        objetos.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    for n, texto in enumerate(paginas):
+        escreve = _texto_cid if cid else lambda linha: f"({_escapa(linha)})"
+        linhas = " T*\n".join(f"{escreve(linha)} Tj" if linha else "" for linha in texto.split("\n"))
+        conteudo = zlib.compress(f"BT /F1 9 Tf 11 TL 30 800 Td\n{linhas}\nET".encode("cp1252"))
+        objetos.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * n} 0 R >>".encode()
+        )
+        objetos.append(f"<< /Length {len(conteudo)} /Filter /FlateDecode >>\nstream\n".encode() + conteudo + b"\nendstream")
+    if cid:
+        objetos.append(
+            b"<< /Type /Font /Subtype /CIDFontType2 /BaseFont /ABCDEF+Arial "
+            b"/CIDSystemInfo << /Registry (Adobe) /Ordering (Identity) /Supplement 0 >> /DW 500 >>"
+        )
+        objetos.append(f"<< /Length {len(CMAP_IDENTIDADE)} >>\nstream\n".encode() + CMAP_IDENTIDADE + b"\nendstream")
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    posicoes = []
+    for n, objeto in enumerate(objetos, 1):
+        posicoes.append(len(pdf))
+        pdf += f"{n} 0 obj\n".encode() + objeto + b"\nendobj\n"
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objetos) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{posicao:010d} 00000 n \n".encode() for posicao in posicoes)
+    pdf += f"trailer\n<< /Size {len(objetos) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(pdf)
+
+
+def salva_pdfs(pasta: str, quantidade: int, cid: bool = False) -> List[Tuple[str, str]]:
+    """
+    Salva as faturas sintéticas como pdf na pasta
+
+    Args:
+        - pasta (str): pasta de destino (criada se não existir)
+        - quantidade (int): quantidade de faturas
+        - cid (bool): se True, gera os pdfs com uma fonte CID (ver gera_pdf)
+
+    Returns:
+        - List[Tuple[str, str]]: (distribuidora, caminho do pdf) de cada fatura
+    """
+    os.makedirs(pasta, exist_ok=True)
+    caminhos = []
+    for distribuidora, arquivo, paginas in faturas(quantidade):
+        caminho = os.path.join(pasta, arquivo)
+        with open(caminho, "wb") as pdf:
+            pdf.write(gera_pdf(paginas, cid))
+        caminhos.append((distribuidora, caminho))
+    return caminhos
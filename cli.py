@@ -0,0 +1,159 @@
+"""
+Linha de comando do leitor de faturas, um subcomando por tarefa:
+    - ingest: lê as faturas da pasta, grava os consumos no banco e exporta os clientes com consumos novos (o mesmo que main.py)
+    - export: apenas exporta os consumos ja gravados no banco
+    - identify: apenas identifica a distribuidora de cada pdf (em paralelo), sem ler o histórico e sem gravar no banco,
+    com a contagem por distribuidora, os não identificados e a vazão (arquivos/s)
+    - stats: resumo do banco (consumos por distribuidora, diário da ultima execução e exportações)
+
+Cada subcomando importa apenas o que usa: identify e stats não importam o pandas nem os leitores das distribuidoras
+(ver benchmarks/bench_inicializacao.py)
+
+Uso (na raiz do repositório):
+    python cli.py ingest PASTA_DAS_FATURAS --lote 500
+    python cli.py export --formato parquet --saida PASTA_DE_DESTINO
+    python cli.py identify PASTA_DAS_FATURAS --saida identificacao.csv
+    python cli.py stats
+"""
+import os
+import sys
+import time
+import argparse
+import importlib.util
+from typing import Callable, Dict, List, Optional
+from scripts.funcoes.f_configuracao import CAMINHO_BANCO, FORMATOS_EXPORTACAO, PASTA_CACHE_TEXTOS, PASTA_EXPORTACAO, TAMANHO_LOTE
+from scripts.funcoes.f_arquivos import THREADS_PRE_CARGA
+from scripts.classes import Extrator
+from scripts.classes.Extrator import EXTRATOR_PADRAO, EXTRATORES
+
+
+def ingest(args: argparse.Namespace) -> None:
+    import main
+    main.main(
+        args.path, processos=args.processos, cache=not args.sem_cache, relatorio=args.relatorio,
+        exportar_tudo=args.exportar_tudo, formato=args.formato, saida=args.saida, tamanho_lote=args.lote,
+        retomar=args.retomar, pre_carga=args.pre_carga, cache_textos=args.cache_textos, extrator=args.extrator,
+        exportar=not args.sem_exportacao, banco=args.banco
+    )
+
+
+def export(args: argparse.Namespace) -> None:
+    import main
+    from scripts.classes.Sessao import Sessao
+    from scripts.classes.Metricas import Metricas
+    from scripts.funcoes.f_esquema import migra_banco
+    if args.formato == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise ImportError("A exportação em parquet precisa do pyarrow (pip install pyarrow)")
+    metricas = Metricas(ativo=args.relatorio is not None)
+    with Sessao(args.banco) as sessao:
+        migra_banco(sessao)
+        exportados = main.exporta_consumos(
+            sessao, formato=args.formato, path_base=args.saida, exportar_tudo=args.exportar_tudo, metricas=metricas
+        )
+    print(f"Clientes exportados ({args.formato}): {exportados}")
+    if args.relatorio is not None:
+        metricas.salva(args.relatorio, contadores={"clientes_exportados": exportados})
+
+
+def identify(args: argparse.Namespace) -> None:
+    from scripts.funcoes.f_identificacao import identifica_pasta, resume_identificacao, salva_identificacao
+    # valida o extrator antes de iniciar os processos, os processos de identificação herdam a variavel de ambiente
+    Extrator.get_extrator(args.extrator)
+    os.environ[Extrator.VARIAVEL_AMBIENTE] = args.extrator
+    inicio = time.perf_counter()
+    registros = identifica_pasta(args.path, processos=args.processos, tamanho_maximo_mb=args.tamanho_maximo_mb)
+    resumo = resume_identificacao(registros, time.perf_counter() - inicio)
+    if args.saida is not None:
+        salva_identificacao(registros, resumo, args.saida)
+    else:
+        for registro in registros:
+            print(f"{registro['arquivo']}: {registro['distribuidora'] or registro['status']}")
+    for distribuidora, quantidade in resumo["distribuidoras"].items():
+        print(f"{distribuidora}: {quantidade}")
+    print(", ".join(f"{status}={quantidade}" for status, quantidade in resumo["status"].items()))
+    print(f"Arquivos: {resumo['arquivos']} em {resumo['tempo_s']:.2f} s ({resumo['arquivos_por_s'] or 0:.1f} arquivos/s)")
+
+
+def stats(args: argparse.Namespace) -> None:
+    from scripts.classes.Sessao import Sessao
+    from scripts.funcoes.f_estatisticas import get_estatisticas
+    if not os.path.exists(args.banco):
+        print(f"Banco de dados não encontrado: {args.banco}")
+        return
+    sessao = Sessao(args.banco)
+    try:
+        estatisticas = get_estatisticas(sessao)
+    finally:
+        sessao.fechar()
+    print(f"Versão do esquema: {estatisticas['versao_esquema']} (atual: {estatisticas['versao_esquema_atual']})")
+    print(f"{'distribuidora':<14} {'clientes':>9} {'consumos':>9} {'primeira':>11} {'ultima':>11}")
+    for linha in estatisticas["distribuidoras"]:
+        print(
+            f"{linha['distribuidora']:<14} {linha['clientes']:>9} {linha['consumos']:>9} "
+            f"{(linha['primeira_competencia'] or '-')[:10]:>11} {(linha['ultima_competencia'] or '-')[:10]:>11}"
+        )
+    print(f"Diário da ultima execução: {', '.join(f'{s}={q}' for s, q in estatisticas['diario'].items()) or '-'}")
+    print(f"Clientes exportados: {', '.join(f'{f}={q}' for f, q in estatisticas['exportados'].items()) or '-'}")
+
+
+SUBCOMANDOS: Dict[str, Callable[[argparse.Namespace], None]] = {
+    "ingest": ingest,
+    "export": export,
+    "identify": identify,
+    "stats": stats,
+}
+
+
+def cria_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Lê as faturas de energia (PDF) e salva os consumos e demandas no banco de dados")
+    subparsers = parser.add_subparsers(dest="subcomando", required=True)
+
+    banco = argparse.ArgumentParser(add_help=False)
+    banco.add_argument("--banco", default=CAMINHO_BANCO, help=f"banco de dados (padrão: {CAMINHO_BANCO})")
+    exportacao = argparse.ArgumentParser(add_help=False)
+    exportacao.add_argument("--relatorio", default=None, help="salva um relatório (json) com os tempos e memória de cada etapa e de cada fatura")
+    exportacao.add_argument("--exportar-tudo", action="store_true", help="exporta novamente todos os clientes, mesmo os sem consumos novos")
+    exportacao.add_argument("--formato", choices=FORMATOS_EXPORTACAO, default="csv", help="formato da exportação: um csv por cliente ou um dataset parquet particionado por distribuidora (precisa do pyarrow)")
+    exportacao.add_argument("--saida", default=PASTA_EXPORTACAO, help="pasta de destino da exportação (ao trocar de pasta, use --exportar-tudo)")
+    extrator = argparse.ArgumentParser(add_help=False)
+    extrator.add_argument("--extrator", choices=list(EXTRATORES), default=EXTRATOR_PADRAO, help=f"biblioteca de extração do texto dos pdfs (padrão: {EXTRATOR_PADRAO}, ver benchmarks/conformidade_extratores.py)")
+
+    parser_ingest = subparsers.add_parser("ingest", parents=[banco, exportacao, extrator], help="lê as faturas, grava os consumos e exporta")
+    parser_ingest.add_argument("path", help="pasta com as faturas em pdf")
+    parser_ingest.add_argument("--processos", type=int, default=None, help="quantidade de processos para ler as faturas (padrão: quantidade de CPUs, 1 = em série)")
+    parser_ingest.add_argument("--sem-cache", action="store_true", help="lê novamente todos os pdfs, mesmo os ja lidos em execuções anteriores")
+    parser_ingest.add_argument("--lote", type=int, default=TAMANHO_LOTE, help=f"faturas gravadas e confirmadas no banco por vez (padrão: {TAMANHO_LOTE}, 0 = todas em uma unica transação)")
+    parser_ingest.add_argument("--retomar", "--resume", action="store_true", help="retoma a execução anterior: pula os arquivos ja gravados (segundo o diário) e lê novamente os com falha")
+    parser_ingest.add_argument("--pre-carga", type=int, default=THREADS_PRE_CARGA, help=f"threads que leem os pdfs antecipadamente, em paralelo com a leitura das faturas (padrão: {THREADS_PRE_CARGA}, 0 = desativado)")
+    parser_ingest.add_argument("--cache-textos", default=PASTA_CACHE_TEXTOS, help="pasta do cache de textos extraídos dos pdfs, reaproveitado após correções nos leitores (\"\" = desativado)")
+    parser_ingest.add_argument("--sem-exportacao", action="store_true", help="apenas grava os consumos no banco, sem exportar (ver export)")
+
+    subparsers.add_parser("export", parents=[banco, exportacao], help="exporta os consumos ja gravados no banco")
+
+    parser_identify = subparsers.add_parser("identify", parents=[extrator], help="identifica a distribuidora de cada pdf, sem ler o histórico e sem gravar no banco")
+    parser_identify.add_argument("path", help="pasta com as faturas em pdf")
+    parser_identify.add_argument("--processos", type=int, default=None, help="quantidade de processos para identificar os pdfs (padrão: quantidade de CPUs, 1 = em série)")
+    parser_identify.add_argument("--saida", default=None, help="salva a classificação de cada arquivo em csv (;) ou json (com o resumo), pela extensão")
+    parser_identify.add_argument("--tamanho-maximo-mb", type=float, default=None, help="arquivos maiores são pulados sem abrir (padrão: abre todos)")
+
+    subparsers.add_parser("stats", parents=[banco], help="resumo do banco: consumos por distribuidora, diário e exportações")
+    return parser
+
+
+def executa(argv: Optional[List[str]] = None, padrao: Optional[str] = None) -> None:
+    """
+    Executa o subcomando
+
+    Args:
+        - argv (List[str] | None): argumentos da linha de comando, se None usa sys.argv
+        - padrao (str | None): subcomando usado quando o primeiro argumento não é um subcomando (ex.: "ingest" para main.py PASTA)
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if padrao is not None and argv and argv[0] not in SUBCOMANDOS and argv[0] not in ("-h", "--help"):
+        argv.insert(0, padrao)
+    args = cria_parser().parse_args(argv)
+    SUBCOMANDOS[args.subcomando](args)
+
+
+if __name__ == "__main__":
+    executa()
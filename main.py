@@ -1,17 +1,59 @@
 import os
 import sys
+import copy
+import time
+import itertools
 import contextlib
+import importlib.util
 import pandas as pd
-from typing import Dict, List, Tuple
-from PyPDF2.errors import PdfReadError
-from sqlite3 import Connection, Cursor
-from scripts.funcoes.f_database import *
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import Executor, ProcessPoolExecutor
+from sqlite3 import Cursor
+from pandas import DataFrame
+from scripts.funcoes.f_database import (
+    adiciona_novo_id_clientes, criar_consumos, get_clientes_existentes, remove_outliers, salva_novos_clientes, salva_novos_consumos
+)
+from scripts.funcoes.f_configuracao import (
+    CAMINHO_BANCO, FORMATOS_EXPORTACAO, IDADE_MAXIMA_CACHE_TEXTOS_DIAS, PASTA_CACHE_TEXTOS, PASTA_EXPORTACAO, TAMANHO_LOTE,
+    TAMANHO_MAXIMO_CACHE_TEXTOS_MB
+)
+from scripts.funcoes.f_esquema import migra_banco
+from scripts.funcoes.f_exportacao import get_marcas_exportacao, registra_exportacao
+from scripts.funcoes.f_diario import FALHA, GRAVADA, LIDA, PENDENTE, chave_arquivo, inicia_diario, registra_status, resumo_diario
+from scripts.funcoes.f_cache import get_resultados_em_cache, salva_resultados_em_cache
+from scripts.funcoes.f_hash import hash_arquivo, hash_conteudo
+from scripts.funcoes.f_arquivos import THREADS_PRE_CARGA, pre_carrega, varre_pasta
 from scripts.classes.Fatura import Fatura
+from scripts.funcoes.f_distribuidoras import suportada
+from scripts.classes.Sessao import Sessao
+from scripts.classes.Documento import Documento
+from scripts.classes.CacheTextos import VARIAVEL_AMBIENTE, CacheTextos
+from scripts.classes import Extrator
+from scripts.classes.Extrator import EXTRATOR_PADRAO, EXTRATORES, get_extrator
+from scripts.classes.Metricas import Metricas, mede_memoria
 from scripts.classes.Identificador import Identificador
+from scripts.classes.ResultadoFatura import ResultadoFatura
+
+# contadores da execução (ex.: faturas lidas no modo de arquivo grande)
+NOMES_CONTADORES: Tuple[str, ...] = ("faturas", "faturas_puladas", "arquivos_grandes", "clientes_exportados", "lotes_com_falha")
+CONTADORES: Dict[str, int] = dict.fromkeys(NOMES_CONTADORES, 0)
+# motivo gravado no diário para as faturas que não puderam ser lidas ou identificadas (sem erro inesperado)
+MOTIVO_NAO_IDENTIFICADA: str = "pdf não pode ser lido ou distribuidora não identificada"
+# motivo gravado no diário para os arquivos que não puderam ser abertos para o hash do cache (ex.: removidos ou sem permissão)
+MOTIVO_ARQUIVO_INACESSIVEL: str = "arquivo não pode ser aberto"
 
 join_path = lambda y, x: os.path.join(y, x)
 filename = lambda path, filetype: path.split("\\")[-1].split(filetype)[0]
 
+def reinicia_contadores() -> None:
+    """
+    Zera os contadores da execução (CONTADORES), no inicio de cada main(), para que execuções seguidas no mesmo processo
+    não somem os contadores das anteriores (o dicionario é mantido, apenas os valores mudam)
+    """
+    CONTADORES.clear()
+    CONTADORES.update(dict.fromkeys(NOMES_CONTADORES, 0))
+
+
 def adiciona_data_para_forecast(df: DataFrame) -> DataFrame:
     """
     Adiciona nova linha ao dataframe com a data a ser realizada a previsão
@@ -22,37 +64,205 @@ def adiciona_data_para_forecast(df: DataFrame) -> DataFrame:
     return df
 
 
-def set_distribuidoras(paths: List[Dict[str, str]]) -> Dict[str, Fatura]:
+def processa_fatura(
+        info: Dict[str, str], conteudo: Optional[bytes] = None, chave: Optional[str] = None, tamanho: Optional[int] = None
+        ) -> Union[Fatura, None]:
     """
-    Identifica as Distribuidoras pelas Faturas e retorna uma relação Distribuidora <-> Faturas
+    Identifica a Distribuidora da Fatura e, se a distribuidora for suportada, obtem os dados de consumo e demanda
+    Os tempos de abertura, extração de texto, identificação e leitura ficam em Fatura.tempos, com o pico de memória
+    alocada pelo Python na leitura (pico_tracemalloc_mb, apenas com as métricas ativas, ver Metricas.mede_memoria)
 
     Args:
-        - paths (List[Dict[str, str]]): Relação UC <-> Caminho para a Fatura
-    
+        - info (Dict[str, str]): Relação UC <-> Caminho para a Fatura
+        - conteudo (bytes | None): conteudo do pdf ja lido (pre_carrega), se None o pdf é lido do disco
+        - chave (str | None): hash do pdf ja calculado para o cache de faturas (usado no cache de textos, sem calcular novamente)
+        - tamanho (int | None): tamanho do pdf (bytes) ja obtido na listagem da pasta, se None é consultado no disco
+
     Returns:
-        - Dict[str, Fatura]: relações Distribuidora <-> Faturas
-    """
-    DISTRIBUIDORAS: Dict[str, Fatura] = {}
-    for info in paths:
-        with contextlib.suppress(IndexError,TypeError, PdfReadError):
-            path: str = info.get(*info.keys())
-            DISTRIBUIDORA: Fatura = Identificador(infos=info).main()(path)
-            name: str = DISTRIBUIDORA.distribuidora
-            if name not in DISTRIBUIDORAS.keys():
-                DISTRIBUIDORAS[name]: Fatura = []
-            if name != None:
-                if name in ["CPFL", "EDP", "COPEL", "CEMIG", "ENEL"]:
+        - Fatura | None: Fatura da distribuidora, ou None se o pdf não pode ser lido ou a distribuidora não foi identificada
+    """
+    with contextlib.suppress(IndexError, TypeError, *get_extrator().erros()):
+        path: str = info.get(*info.keys())
+        tempos: Dict[str, float] = {}
+        with mede_memoria(tempos):
+            inicio, inicio_cpu = time.perf_counter(), time.process_time()
+            identificador = Identificador(infos=info, conteudo=conteudo, chave=chave, tamanho=tamanho)
+            paginas = identificador.documento.paginas
+            tempos["abertura"] = time.perf_counter() - inicio
+            with identificador.documento:
+                inicio, extracao = time.perf_counter(), paginas.tempo_extracao
+                DISTRIBUIDORA: Fatura = identificador.main()(path, identificador.documento)
+                tempos["identificacao"] = time.perf_counter() - inicio - (paginas.tempo_extracao - extracao)
+                inicio, extracao = time.perf_counter(), paginas.tempo_extracao
+                if suportada(DISTRIBUIDORA.distribuidora):
                     DISTRIBUIDORA.main()
-                DISTRIBUIDORAS[name].append(DISTRIBUIDORA)
+                tempos["leitura"] = time.perf_counter() - inicio - (paginas.tempo_extracao - extracao)
+            tempos["extracao_texto"] = paginas.tempo_extracao
+            tempos["cpu"] = time.process_time() - inicio_cpu
+        DISTRIBUIDORA.tempos = tempos
+        return DISTRIBUIDORA
+    return None
+
+
+def processa_fatura_compacta(
+        info: Dict[str, str], conteudo: Optional[bytes] = None, chave: Optional[str] = None, tamanho: Optional[int] = None
+        ) -> Union[ResultadoFatura, None]:
+    """
+    Mesmo que processa_fatura(), mas retorna apenas os dados extraídos (sem o texto do pdf),
+    a Fatura (e o texto de suas páginas) é descartada logo após a leitura
+    Um erro inesperado na leitura (ex.: arquivo inacessivel na rede, layout diferente) não interrompe a execução,
+    o erro volta no resultado (ResultadoFatura.erro)
+
+    Args:
+        - info (Dict[str, str]): Relação UC <-> Caminho para a Fatura
+        - conteudo (bytes | None): conteudo do pdf ja lido (pre_carrega), se None o pdf é lido do disco
+        - chave (str | None): hash do pdf ja calculado para o cache de faturas
+        - tamanho (int | None): tamanho do pdf (bytes) ja obtido na listagem da pasta
+
+    Returns:
+        - ResultadoFatura | None: dados extraídos da fatura, ou None se não foi possível ler/identificar
+    """
+    try:
+        DISTRIBUIDORA = processa_fatura(info, conteudo, chave, tamanho)
+    except Exception as erro:
+        return ResultadoFatura.de_erro(info.get(*info.keys()), erro)
+    if DISTRIBUIDORA is None:
+        return None
+    return ResultadoFatura.de_fatura(DISTRIBUIDORA)
+
+
+def le_faturas(
+        paths: List[Dict[str, str]],
+        processos: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        conteudos: Optional[List[Optional[bytes]]] = None,
+        hashes: Optional[List[Optional[str]]] = None,
+        tamanhos: Optional[List[Optional[int]]] = None
+        ) -> List[Union[ResultadoFatura, None]]:
+    """
+    Le as faturas, em série ou em paralelo, mantendo a ordem dos caminhos
+    Em ambos os casos cada fatura vira um ResultadoFatura logo após a leitura, sem manter o texto das páginas em memória
+
+    Args:
+        - paths (List[Dict[str, str]]): Relação UC <-> Caminho para a Fatura
+        - processos (int | None): quantidade de processos para ler as faturas, None usa a quantidade de CPUs e 1 lê em série
+        - executor (Executor | None): processos de leitura ja iniciados (ex.: reaproveitados entre os lotes), None cria os processos
+        - conteudos (List[bytes | None] | None): conteudo ja lido de cada pdf (mesma ordem dos caminhos), None lê os pdfs do disco
+        - hashes (List[str | None] | None): hash ja calculado de cada pdf (cache de faturas), para o cache de textos não ler
+        o pdf novamente só para calcular o hash
+        - tamanhos (List[int | None] | None): tamanho de cada pdf (bytes) ja obtido na listagem da pasta, None consulta o disco
+
+    Returns:
+        - List[ResultadoFatura | None]: resultado de cada fatura (None se não foi possível ler/identificar, com erro se a leitura falhou)
+    """
+    conteudos = conteudos or [None] * len(paths)
+    hashes = hashes or [None] * len(paths)
+    tamanhos = tamanhos or [None] * len(paths)
+    CONTADORES["arquivos_grandes"] += sum(
+        conteudo is None and Documento.eh_grande(info.get(*info.keys()), tamanho)
+        for info, conteudo, tamanho in zip(paths, conteudos, tamanhos)
+    )
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(paths) <= 1:
+        return list(map(processa_fatura_compacta, paths, conteudos, hashes, tamanhos))
+    chunksize = max(1, len(paths) // (processos * 4))
+    if executor is not None:
+        return list(executor.map(processa_fatura_compacta, paths, conteudos, hashes, tamanhos, chunksize=chunksize))
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(processa_fatura_compacta, paths, conteudos, hashes, tamanhos, chunksize=chunksize))
+
+
+def set_distribuidoras(
+        paths: List[Dict[str, str]],
+        processos: Optional[int] = None,
+        sessao: Optional[Sessao] = None,
+        metricas: Optional[Metricas] = None,
+        executor: Optional[Executor] = None,
+        falhas: Optional[Dict[str, str]] = None,
+        conteudos: Optional[List[Optional[bytes]]] = None,
+        tamanhos: Optional[List[Optional[int]]] = None
+        ) -> Dict[str, List[ResultadoFatura]]:
+    """
+    Identifica as Distribuidoras pelas Faturas e retorna uma relação Distribuidora <-> Faturas (dados extraídos, ResultadoFatura)
+    Com mais de um processo, as faturas são lidas em paralelo e cada processo devolve apenas os dados extraídos
+    Com o banco de dados informado, as faturas ja lidas anteriormente (mesmo conteudo e mesma versão dos leitores)
+    não são lidas novamente, os dados extraídos vem do cache
+
+    Args:
+        - paths (List[Dict[str, str]]): Relação UC <-> Caminho para a Fatura
+        - processos (int | None): quantidade de processos para ler as faturas, None usa a quantidade de CPUs e 1 lê em série
+        - sessao (Sessao | None): Conexão com o banco de dados com o cache de faturas, None não usa o cache
+        - metricas (Metricas | None): onde registrar os tempos de cada fatura lida
+        - executor (Executor | None): processos de leitura ja iniciados, None cria os processos (se processos != 1)
+        - falhas (Dict[str, str] | None): se informado, recebe a relação caminho <-> motivo das faturas não lidas
+        (as faturas com erro inesperado não são gravadas no cache, e são lidas novamente na proxima execução)
+        Um arquivo que não pode ser aberto (OSError) vai para as falhas sem interromper as demais faturas
+        - conteudos (List[bytes | None] | None): conteudo ja lido de cada pdf (mesma ordem dos caminhos), usado na leitura
+        e no hash do cache sem ler o arquivo novamente; None lê os pdfs do disco
+        - tamanhos (List[int | None] | None): tamanho de cada pdf (bytes) ja obtido na listagem da pasta (os.scandir),
+        para não consultar o disco novamente; None consulta o tamanho no disco
+
+    Returns:
+        - Dict[str, List[ResultadoFatura]]: relações Distribuidora <-> Faturas
+    """
+    metricas = metricas or Metricas(ativo=False)
+    caminhos: List[str] = [info.get(*info.keys()) for info in paths]
+    conteudos = conteudos or [None] * len(paths)
+    tamanhos = tamanhos or [None] * len(paths)
+    if sessao is None:
+        resultados = list(zip(caminhos, le_faturas(
+            paths, processos=processos, executor=executor, conteudos=conteudos, tamanhos=tamanhos
+        )))
+    else:
+        hashes: List[Optional[str]] = []
+        for caminho, conteudo in zip(caminhos, conteudos):
+            try:
+                hashes.append(hash_arquivo(caminho) if conteudo is None else hash_conteudo(conteudo))
+            except OSError as erro:
+                hashes.append(None)
+                if falhas is not None:
+                    falhas[caminho] = f"{MOTIVO_ARQUIVO_INACESSIVEL}: {type(erro).__name__}: {erro}"
+        cache = get_resultados_em_cache(sessao, [_hash for _hash in hashes if _hash is not None])
+        pendentes = [
+            (info, caminho, _hash, conteudo, tamanho)
+            for info, caminho, _hash, conteudo, tamanho in zip(paths, caminhos, hashes, conteudos, tamanhos)
+            if _hash is not None and _hash not in cache
+        ]
+        novos = le_faturas(
+            [info for info, *_ in pendentes], processos=processos, executor=executor,
+            conteudos=[conteudo for _, _, _, conteudo, _ in pendentes], hashes=[_hash for _, _, _hash, _, _ in pendentes],
+            tamanhos=[tamanho for *_, tamanho in pendentes]
+        )
+        salva_resultados_em_cache(sessao, {
+            _hash: resultado for (_, _, _hash, _, _), resultado in zip(pendentes, novos) if resultado is None or resultado.erro is None
+        })
+        resultados = [(caminho, resultado) for (_, caminho, *_), resultado in zip(pendentes, novos)]
+        for caminho, _hash in zip(caminhos, hashes):
+            if _hash in cache:
+                resultado: ResultadoFatura = cache[_hash]
+                if resultado is not None:
+                    resultado = copy.copy(resultado)
+                    resultado.caminho = caminho
+                resultados.append((caminho, resultado))
+
+    DISTRIBUIDORAS: Dict[str, List[ResultadoFatura]] = {}
+    for caminho, DISTRIBUIDORA in resultados:
+        if DISTRIBUIDORA is None or DISTRIBUIDORA.erro is not None:
+            if falhas is not None:
+                falhas[caminho] = MOTIVO_NAO_IDENTIFICADA if DISTRIBUIDORA is None else DISTRIBUIDORA.erro
+            continue
+        DISTRIBUIDORAS.setdefault(DISTRIBUIDORA.distribuidora, []).append(DISTRIBUIDORA)
+        if DISTRIBUIDORA.tempos:
+            metricas.registra_fatura(DISTRIBUIDORA.caminho, DISTRIBUIDORA.distribuidora, DISTRIBUIDORA.tempos)
     return DISTRIBUIDORAS
 
 
-def set_consumos_e_demandas(DISTRIBUIDORAS: Dict[str, Fatura]) -> Tuple[DataFrame, DataFrame]:
+def set_consumos_e_demandas(DISTRIBUIDORAS: Dict[str, List[ResultadoFatura]]) -> Tuple[DataFrame, DataFrame]:
     """
     Obtem os dados de consumo e demanda de cada UC e DISTRIBUIDORA e transforma em um DataFrame/Tabela com essas informções
 
     Args:
-        - DISTRIBUIDORAS (Dict[str, Fatura]): relações Distribuidora <-> Faturas 
+        - DISTRIBUIDORAS (Dict[str, List[ResultadoFatura]]): relações Distribuidora <-> Faturas 
 
     Returns:
         - Tuple[DataFrame, DataFrame]: DataFrames de Consumos e Demandas
@@ -60,7 +270,7 @@ def set_consumos_e_demandas(DISTRIBUIDORAS: Dict[str, Fatura]) -> Tuple[DataFram
     CONSUMOS = []
     DEMANDAS = []
     for key in DISTRIBUIDORAS:
-        if key in ["CPFL", "EDP", "COPEL", "CEMIG", "ENEL"]:
+        if suportada(key):
             for dis in DISTRIBUIDORAS[key]:
                 consumo = set_consumo_df(dis)
                 DEMANDAS.append(dis.demanda)
@@ -71,13 +281,13 @@ def set_consumos_e_demandas(DISTRIBUIDORAS: Dict[str, Fatura]) -> Tuple[DataFram
     )
 
 
-def set_consumo_df(dis: Fatura) -> DataFrame:
+def set_consumo_df(dis: ResultadoFatura) -> DataFrame:
     """
-    Monta o dataframe de consumo com os valores da classe original (Fatura)
+    Monta o dataframe de consumo com os valores extraídos da fatura (ResultadoFatura)
     """
     consumo = dis.consumo
     consumo['nome'] = dis.nome.replace(" ", "_")
-    consumo['uc'] = dis._caminho.split("\\")[-1][:-4]
+    consumo['uc'] = dis.uc
     consumo['distribuidora'] = dis.distribuidora
     consumo['medida_consumo'] = dis.medida_consumo
     consumo['medida_demanda'] = dis.medida_demanda
@@ -104,68 +314,181 @@ def set_infos(consumos: DataFrame, demandas: DataFrame) -> DataFrame:
     return remove_outliers(infos, "consumo_ponta", 0.9)
 
 
-def clientes_db(db_path: str, PATH: str) -> Tuple[DataFrame, DataFrame, bool]:
+def em_lotes(itens: Iterable[Any], tamanho: Optional[int] = TAMANHO_LOTE) -> Iterator[List[Any]]:
     """
-    Obtem as informações dos pdfs e transforma em um dataframe com as informações uteis (infos), adiciona um uuid aos clientes
-    compara os clientes obtidos com os existentes e salva os novos clientes na tabela clientes do banco de dados
-    Retorna as informações uteis obtidas, os clientes ja existentes, e o status da tentativa de gravar os novos clientes ao banco
+    Agrupa os itens em lotes de até tamanho itens, consumindo o iteravel aos poucos
 
     Args:
-        - db_path (str): caminho para o banco de dados
-        - PATH (str): caminho para os pdfs
+        - itens (Iterable[Any]): itens a agrupar (ex.: gerador de caminhos)
+        - tamanho (int | None): itens por lote, None (ou 0) = todos os itens em um unico lote
+    """
+    iterador = iter(itens)
+    while lote := list(itertools.islice(iterador, tamanho or None)):
+        yield lote
+
+
+def grava_distribuidoras(sessao: Sessao, DISTRIBUIDORAS: Dict[str, List[ResultadoFatura]], metricas: Optional[Metricas] = None) -> int:
+    """
+    Monta as tabelas de consumo e demanda das faturas lidas e grava os novos clientes e os novos consumos de cada distribuidora
+    (na transação da sessão, sem confirmar)
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+        - DISTRIBUIDORAS (Dict[str, List[ResultadoFatura]]): relações Distribuidora <-> Faturas, de set_distribuidoras
+        - metricas (Metricas | None): onde registrar os tempos das etapas
 
     Returns:
-        - Tuple[DataFrame, DataFrame, bool]: informações uteis obtidas, 
-                                             clientes ja existentes, 
-                                             status
-    """
-    FOLDERS: List[str] = os.listdir(PATH)
-    PATHS: List[Dict[str, str]] = [{filename(x, ".pdf"): join_path(PATH, x)} for x in FOLDERS]
-    DISTRIBUIDORAS: Dict[str, Fatura] = set_distribuidoras(PATHS)
-    infos: DataFrame = pd.concat(
-        set_consumos_e_demandas(DISTRIBUIDORAS), axis=1
-    ).drop_duplicates().fillna(-1).reset_index()
+        - int: quantidade de linhas de consumo obtidas das faturas
+    """
+    metricas = metricas or Metricas(ativo=False)
+    if not any(suportada(key) for key in DISTRIBUIDORAS):
+        return 0
+    with metricas.etapa("set_consumos_e_demandas"):
+        infos: DataFrame = pd.concat(
+            set_consumos_e_demandas(DISTRIBUIDORAS), axis=1
+        ).drop_duplicates().fillna(-1).reset_index()
     clientes: DataFrame = adiciona_novo_id_clientes(infos.copy())
-    clientes_existentes: DataFrame = get_clientes_existentes(db_path)
-    return infos, clientes_existentes, salva_novos_clientes(mantem_novos_clientes(clientes, clientes_existentes, col="nome"), db_path)
+    salva_novos_clientes(clientes, sessao)
+    clientes_existentes: DataFrame = get_clientes_existentes(sessao, nomes=clientes.nome)
+    for distribuidora in infos.distribuidora.unique():
+        with metricas.etapa("distribuidora_db", detalhe=distribuidora):
+            consumos_df_filtrado = infos.loc[infos.distribuidora == distribuidora]
+            distribuidora_db(sessao=sessao, consumos_df=consumos_df_filtrado, clientes_existentes=clientes_existentes, distribuidora=distribuidora)
+    return len(infos)
+
+
+def ingere_faturas(
+        sessao: Sessao,
+        PATH: str,
+        tamanho_lote: Optional[int] = TAMANHO_LOTE,
+        processos: Optional[int] = None,
+        cache: bool = True,
+        metricas: Optional[Metricas] = None,
+        retomar: bool = False,
+        pre_carga: int = THREADS_PRE_CARGA
+        ) -> Iterator[int]:
+    """
+    Pipeline em streaming da pasta ao banco de dados: caminhos -> identificação e leitura -> tabelas -> gravação, em lotes
+    Cada lote é confirmado (commit) assim que gravado, então a memória fica limitada ao lote
+    e um erro no meio da execução desfaz apenas o lote atual (os lotes anteriores e o cache das faturas lidas continuam gravados)
+    Os processos de leitura são iniciados uma unica vez e reaproveitados em todos os lotes
+    O status de cada arquivo fica no diário (tabela diario): pendente ao iniciar o lote, lida ou falha (com o motivo) após a leitura
+    e gravada após a gravação dos consumos. Um erro ao gravar um lote desfaz apenas a gravação do lote, e os arquivos do lote
+    ficam com falha (com o erro como motivo), para serem lidos novamente ao retomar. Com retomar, os arquivos ja gravados (mesmo caminho, data de modificação e tamanho)
+    são pulados e os demais (inclusive os com falha) são lidos novamente
+    Os arquivos são listados com os.scandir (tamanho e data de modificação sem consultas extras ao disco) e lidos antecipadamente
+    por algumas threads (pre_carrega), até um lote a frente, para que a leitura da rede ocorra junto da extração de texto
 
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+        - PATH (str): caminho para os pdfs
+        - tamanho_lote (int | None): faturas por lote, None = todas as faturas em um unico lote (uma unica transação)
+        - processos (int | None): quantidade de processos para ler os pdfs (None = quantidade de CPUs)
+        - cache (bool): se True, não lê novamente os pdfs ja lidos em execuções anteriores (cache no banco de dados)
+        - metricas (Metricas | None): onde registrar os tempos das etapas e de cada fatura
+        - retomar (bool): se True, pula os arquivos ja gravados segundo o diário da execução anterior
+        - pre_carga (int): quantidade de threads que leem os arquivos antecipadamente, 0 lê cada arquivo apenas na leitura da fatura
 
-def dados_por_tabela(db_path: str) -> Dict[str, List[str]]:
+    Returns:
+        - Iterator[int]: quantidade de faturas de cada lote gravado
+    """
+    metricas = metricas or Metricas(ativo=False)
+    processos = processos or os.cpu_count() or 1
+    concluidos = inicia_diario(sessao, retomar=retomar)
+
+    def pendente(entrada: os.DirEntry) -> bool:
+        if chave_arquivo(entrada.path, entrada.stat()) in concluidos:
+            CONTADORES["faturas_puladas"] += 1
+            return False
+        return True
+
+    entradas = filter(pendente, varre_pasta(PATH)) if concluidos else varre_pasta(PATH)
+    arquivos = pre_carrega(entradas, threads=pre_carga, adiantados=tamanho_lote or TAMANHO_LOTE)
+    with contextlib.ExitStack() as pilha:
+        executor = pilha.enter_context(ProcessPoolExecutor(max_workers=processos)) if processos > 1 else None
+        for numero, lote in enumerate(em_lotes(arquivos, tamanho_lote)):
+            with metricas.etapa("lote", detalhe=str(numero)):
+                chaves = {entrada.path: chave_arquivo(entrada.path, entrada.stat()) for entrada, _ in lote}
+                registra_status(sessao, chaves.values(), PENDENTE)
+                sessao.commit()
+                falhas: Dict[str, str] = {}
+                with metricas.etapa("set_distribuidoras"):
+                    DISTRIBUIDORAS = set_distribuidoras(
+                        [{filename(entrada.name, ".pdf"): entrada.path} for entrada, _ in lote],
+                        processos=processos, sessao=sessao if cache else None, metricas=metricas, executor=executor,
+                        falhas=falhas, conteudos=[conteudo for _, conteudo in lote],
+                        tamanhos=[entrada.stat().st_size for entrada, _ in lote]
+                    )
+                lidas = [chaves[caminho] for caminho in chaves if caminho not in falhas]
+                registra_status(sessao, lidas, LIDA)
+                registra_status(sessao, [chaves[caminho] for caminho in falhas], FALHA, motivos=falhas)
+                sessao.commit()
+                try:
+                    grava_distribuidoras(sessao, DISTRIBUIDORAS, metricas=metricas)
+                except Exception as erro:
+                    sessao.rollback()
+                    CONTADORES["lotes_com_falha"] += 1
+                    motivo = f"erro ao gravar o lote: {type(erro).__name__}: {erro}"
+                    registra_status(sessao, lidas, FALHA, motivos={caminho: motivo for caminho, _, _ in lidas})
+                    sessao.commit()
+                    print(f"Lote {numero} não gravado ({len(lidas)} arquivos com falha no diário): {motivo}", file=sys.stderr)
+                else:
+                    # só marca como gravada depois da gravação do lote inteiro
+                    nao_suportadas = {
+                        DISTRIBUIDORA.caminho: f"distribuidora não suportada: {key}"
+                        for key in DISTRIBUIDORAS if not suportada(key) for DISTRIBUIDORA in DISTRIBUIDORAS[key]
+                    }
+                    registra_status(sessao, lidas, GRAVADA, motivos=nao_suportadas)
+                    sessao.commit()
+            yield len(lote)
+
+
+def dados_por_tabela(sessao: Sessao, clientes: Optional[Iterable[int]] = None) -> Dict[str, List[str]]:
     """
     Para cada distribuidora:
         - Lê o banco de dados e obtem informações da tabela clientes como nome, unidade consumidora (uc);
-        consumo total (consumo ponta + consumo fora ponta) e data da tabela da distribuidora, e une os dados com base no id do cliente
+        consumo total (consumo ponta + consumo fora ponta) e data (MMAAAA) da tabela consumos, e une os dados com base no id do cliente
+        (busca pelo indice distribuidora/competencia e pela chave inteira dos clientes)
     Agrega os dados obtidos em um dicionario (Dict[str, List[str]])
         Args:
-            - 
+            - sessao (Sessao): Conexão com o banco de dados
+            - clientes (Iterable[int] | None): se informado, obtem apenas os consumos destes clientes (cliente_id)
     """
     resultados: Dict[str, List[str]] = {}
-    conn: Connection = sqlite3.connect(db_path)
-    cursor: Cursor = conn.cursor()
-    tabelas = tabelas_db(db_path)
+    cursor: Cursor = sessao.conn.cursor()
+    tabelas = tabelas_db(sessao)
+    lotes: List[List[int]] = [[]]
+    if clientes is not None:
+        clientes = [int(cliente_id) for cliente_id in clientes]
+        lotes = [clientes[i: i + 500] for i in range(0, len(clientes), 500)]
     for distribuidora in tabelas:
-        cursor.execute(
-            f"""SELECT nome, uc, (consumo_ponta+consumo_fora_de_ponta) AS consumo_total, SUBSTR(id_datas, -6) AS data FROM {distribuidora} INNER JOIN
-            clientes ON id = SUBSTR(id_datas, 1, LENGTH(id_datas) - 7)
-            """
-        )
-        result: List[str] = cursor.fetchall()
-        resultados |= {distribuidora: result}
-    conn.close()
+        result: List[str] = []
+        for lote in lotes:
+            filtro = f"AND consumos.cliente_id IN ({', '.join('?' * len(lote))})" if clientes is not None else ""
+            cursor.execute(
+                f"""SELECT nome, uc, (consumo_ponta+consumo_fora_de_ponta) AS consumo_total, STRFTIME('%m%Y', competencia) AS data FROM consumos
+                INNER JOIN clientes ON clientes.cliente_id = consumos.cliente_id WHERE consumos.distribuidora = ? {filtro}
+                """,
+                (distribuidora, *lote)
+            )
+            result += cursor.fetchall()
+        if result:
+            resultados |= {distribuidora: result}
     return resultados
 
 
 def distribuidora_db(
-        db_path: str, 
+        sessao: Sessao, 
         consumos_df: DataFrame, 
         clientes_existentes: DataFrame, 
         distribuidora: str
         ) -> bool:
         """
         Salva os consumos ainda não adicionados ao banco, para a distribuidora especificada
+        (os consumos ja gravados são ignorados pelo banco, pela chave unica id_datas)
 
         Args:
-            - db_path (str): caminho para o banco de dados,
+            - sessao (Sessao): Conexão com o banco de dados,
             - consumos_df (DataFrame): tabela de consumos obtidos da leitura dos pdfs,
             - clientes_existentes (DataFrame): tabela com os clientes do banco de dados,
             - distribuidora (str): Nome da tabela que os valores serão adicionados
@@ -173,65 +496,179 @@ def distribuidora_db(
         Returns:
             - bool: status da realização da gravação dos dados (true = dados salvos, false = dados não foram salvos)
         """
-        temp: DataFrame = criar_id_consumos(df_id=clientes_existentes, df_consumo=consumos_df.drop_duplicates(subset=["nome", "datas"]))
-        consumos_db: DataFrame = get_consumos_existentes(db_path, distribuidora=distribuidora)
-        novos_consumos: DataFrame = mantem_novos_consumos(novos_consumos=temp, 
-                                                          consumos_existentes=consumos_db)
+        novos_consumos: DataFrame = criar_consumos(df_clientes=clientes_existentes, df_consumo=consumos_df.drop_duplicates(subset=["nome", "datas"]))
         return salva_novos_consumos(novos_consumos, 
-                                    db_path, 
+                                    sessao, 
                                     distribuidora)
 
 
-def tabelas_db(db_path: str) -> List[str]:
+def tabelas_db(sessao: Sessao) -> List[str]:
     """
-    Obtem todas as tabelas do banco de dados exceto a tabela clientes e retorna uma lista com o nome delas
+    Obtem as distribuidoras com consumos gravados no banco de dados (pelo indice distribuidora/competencia da tabela consumos)
 
     Args:
-        - db_path (str): Caminho para o banco de dados
+        - sessao (Sessao): Conexão com o banco de dados
     
     Returns:
-        - List[str]: lista das tabelas(distribuidoras) obtidas
+        - List[str]: lista das distribuidoras obtidas
     """
-    conn: Connection = sqlite3.connect(db_path)
-    cursor: Cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' and name != 'clientes';")
+    cursor: Cursor = sessao.conn.cursor()
+    cursor.execute("SELECT DISTINCT distribuidora FROM consumos")
     tabelas: List[str] = list(map(lambda x: x[0], cursor.fetchall()))
-    conn.close()
     return tabelas
 
 
-def salva_consumos_csv(resultados: Dict[str, List[str]]) -> None:
+def salva_consumos_csv(resultados: Dict[str, List[str]], path_base: str = PASTA_EXPORTACAO) -> None:
     """
     Lê os resultados e transforma em DataFrame, transforma os dados do tipo string para datetime quando necessario,
     arruma os valores da coluna nome como 'nome - uc'
-    para cada 'nome - uc' => salva um arquivo csv no caminho especificado
+    para cada 'nome - uc' => salva um arquivo csv no caminho especificado (os dados de cada distribuidora são agrupados uma unica vez)
 
     Args:
         - resultados (Dict[str, List[str]]): valores obtidos da função dados_por_tabela()
+        - path_base (str): pasta de destino dos csvs
     """
-    path_base = r"q:\0. PASTAS PESSOAIS\MATEUS COLAÇO\MODELOS\ARIMA\previsao_consumo_arima\distribuidoras"
     for key in resultados:
         path_key: str = os.path.join(path_base, key)
         os.makedirs(path_key, exist_ok=True)
         df: DataFrame = pd.DataFrame(resultados[key], columns=["nome", "uc", "consumo_total", "datas"])
         df.nome = df.nome.str.rstrip().str.lstrip() + "-" + df.uc.str.rstrip().str.lstrip()
         df.datas = pd.to_datetime(df.datas, format="%m%Y")
-        for nome in df.nome.unique():
+        for nome, consumos in df.sort_values("datas", ascending=True).groupby("nome", sort=False):
             path_csv: str = os.path.join(path_key, str(nome))
             os.makedirs(path_csv, exist_ok=True)
-            adiciona_data_para_forecast(df.loc[df.nome == nome][["datas", "consumo_total"]].sort_values("datas", ascending=True)).to_csv(f"{path_csv}\\consumo_{nome}.csv", index=False, sep=';')
+            adiciona_data_para_forecast(consumos[["datas", "consumo_total"]]).to_csv(os.path.join(path_csv, f"consumo_{nome}.csv"), index=False, sep=';')
+
+
+def salva_consumos_parquet(resultados: Dict[str, List[str]], path_base: str = PASTA_EXPORTACAO) -> None:
+    """
+    Salva os resultados em um unico dataset parquet particionado por distribuidora (path_base/distribuidora=CPFL/consumos.parquet),
+    com as colunas nome, uc, datas e consumo_total e, para cada cliente (nome, uc), a linha da data a ser realizada a previsão
+    (mês seguinte ao ultimo, consumo_total vazio, como em adiciona_data_para_forecast).
+    Todas as series podem ser lidas de uma vez com pd.read_parquet(path_base). Precisa do pyarrow
+
+    Args:
+        - resultados (Dict[str, List[str]]): valores obtidos da função dados_por_tabela(), com todos os clientes de cada distribuidora
+        (a partição de cada distribuidora é substituida)
+        - path_base (str): pasta de destino do dataset
+    """
+    if not resultados:
+        return
+    df: DataFrame = pd.concat(
+        [pd.DataFrame(resultados[key], columns=["nome", "uc", "consumo_total", "datas"]).assign(distribuidora=key) for key in resultados],
+        ignore_index=True
+    )
+    df.nome = df.nome.str.strip()
+    df.uc = df.uc.str.strip()
+    df.datas = pd.to_datetime(df.datas, format="%m%Y")
+    previsoes: DataFrame = df.groupby(["distribuidora", "nome", "uc"], as_index=False).datas.max()
+    previsoes.datas = previsoes.datas + pd.DateOffset(months=1)
+    df = pd.concat([df, previsoes], ignore_index=True).sort_values(["distribuidora", "nome", "uc", "datas"])
+    for distribuidora, dados in df.groupby("distribuidora"):
+        path_particao: str = os.path.join(path_base, f"distribuidora={distribuidora}")
+        os.makedirs(path_particao, exist_ok=True)
+        path_parquet: str = os.path.join(path_particao, "consumos.parquet")
+        # grava em um arquivo temporario e substitui o anterior, para que a leitura nunca encontre um arquivo pela metade
+        dados[["nome", "uc", "datas", "consumo_total"]].to_parquet(f"{path_parquet}.tmp", index=False)
+        os.replace(f"{path_parquet}.tmp", path_parquet)
+
+
+def exporta_consumos(
+        sessao: Sessao,
+        formato: str = "csv",
+        path_base: str = PASTA_EXPORTACAO,
+        exportar_tudo: bool = False,
+        metricas: Optional[Metricas] = None
+        ) -> int:
+    """
+    Exporta os consumos dos clientes com consumos novos desde a ultima exportação no formato (ou de todos, com exportar_tudo)
+    e grava as marcas de exportação na transação da sessão
+    No formato parquet, a partição inteira de cada distribuidora com clientes alterados é exportada novamente
 
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+        - formato (str): "csv" (um arquivo por cliente) ou "parquet" (dataset particionado por distribuidora)
+        - path_base (str): pasta de destino
+        - exportar_tudo (bool): se True, exporta todos os clientes
+        - metricas (Metricas | None): onde registrar os tempos das etapas
 
-def main(path: str):
+    Returns:
+        - int: quantidade de clientes exportados
+    """
+    metricas = metricas or Metricas(ativo=False)
+    with metricas.etapa("dados_por_tabela"):
+        marcas: DataFrame = get_marcas_exportacao(sessao, formato, apenas_alteradas=not exportar_tudo)
+        if formato == "parquet" and not exportar_tudo:
+            todas: DataFrame = get_marcas_exportacao(sessao, formato, apenas_alteradas=False)
+            marcas = todas.loc[todas.distribuidora.isin(marcas.distribuidora)]
+        resultados = dados_por_tabela(sessao, clientes=marcas.cliente_id)
+    with metricas.etapa(f"salva_consumos_{formato}"):
+        if formato == "parquet":
+            salva_consumos_parquet(resultados, path_base)
+        else:
+            salva_consumos_csv(resultados, path_base)
+    registra_exportacao(sessao, marcas, formato)
+    return len(marcas)
+
+
+def main(
+        path: str,
+        processos: Optional[int] = None,
+        cache: bool = True,
+        relatorio: Optional[str] = None,
+        exportar_tudo: bool = False,
+        formato: str = "csv",
+        saida: str = PASTA_EXPORTACAO,
+        tamanho_lote: Optional[int] = TAMANHO_LOTE,
+        retomar: bool = False,
+        pre_carga: int = THREADS_PRE_CARGA,
+        cache_textos: Optional[str] = PASTA_CACHE_TEXTOS,
+        extrator: str = EXTRATOR_PADRAO,
+        exportar: bool = True,
+        banco: str = CAMINHO_BANCO
+        ):
+    if formato == "parquet" and importlib.util.find_spec("pyarrow") is None:
+        raise ImportError("A exportação em parquet precisa do pyarrow (pip install pyarrow)")
+    # valida o extrator antes de ler as faturas, os processos de leitura herdam a variavel de ambiente
+    get_extrator(extrator)
+    os.environ[Extrator.VARIAVEL_AMBIENTE] = extrator
     PATH = path
-    db_path = r'.\leitor_pdf\banco_de_dados\distribuidoras.db'
-    consumos_df, clientes_existentes, _ = clientes_db(db_path=db_path, PATH=PATH)
-    for distribuidora in consumos_df.distribuidora.unique():
-        consumos_df_filtrado = consumos_df.loc[consumos_df.distribuidora == distribuidora]
-        distribuidora_db(db_path=db_path, consumos_df=consumos_df_filtrado, clientes_existentes=clientes_existentes, distribuidora=distribuidora)
-    resultados = dados_por_tabela(db_path)
-    salva_consumos_csv(resultados)
+    reinicia_contadores()
+    metricas = Metricas(ativo=relatorio is not None)
+    # os processos de leitura herdam a variavel de ambiente e usam o mesmo cache de textos
+    os.environ[VARIAVEL_AMBIENTE] = cache_textos or ""
+    # o relatório é salvo (com as etapas concluidas) e a medição de memória encerrada mesmo se a execução falhar
+    try:
+        # uma única conexão, com uma transação por lote de faturas gravado
+        with Sessao(banco) as sessao:
+            migra_banco(sessao)
+            with metricas.etapa("ingere_faturas"):
+                CONTADORES["faturas"] = sum(ingere_faturas(
+                    sessao, PATH, tamanho_lote=tamanho_lote, processos=processos, cache=cache, metricas=metricas, retomar=retomar,
+                    pre_carga=pre_carga
+                ))
+            diario = resumo_diario(sessao)
+            # os consumos ja estão confirmados antes de exportar, um erro na exportação desfaz apenas as marcas de exportação
+            if exportar:
+                CONTADORES["clientes_exportados"] = exporta_consumos(
+                    sessao, formato=formato, path_base=saida, exportar_tudo=exportar_tudo, metricas=metricas
+                )
+        if cache_textos:
+            CONTADORES["textos_removidos_cache"] = CacheTextos(cache_textos).limpa(
+                idade_maxima_dias=IDADE_MAXIMA_CACHE_TEXTOS_DIAS, tamanho_maximo_mb=TAMANHO_MAXIMO_CACHE_TEXTOS_MB
+            )
+    finally:
+        if relatorio is not None:
+            metricas.salva(relatorio, contadores=CONTADORES)
+        else:
+            metricas.encerra()
+    print(f"Faturas grandes lidas sob demanda (mmap): {CONTADORES['arquivos_grandes']}")
+    print(f"Clientes exportados ({formato}): {CONTADORES['clientes_exportados']}")
+    print(f"Faturas puladas (ja gravadas): {CONTADORES['faturas_puladas']}")
+    print(f"Lotes não gravados (arquivos com falha no diário): {CONTADORES['lotes_com_falha']}")
+    print(f"Diário da execução: {', '.join(f'{status}={quantidade}' for status, quantidade in diario.items())}")
 
 if __name__ == "__main__":
-    path = sys.argv[1]
-    main(path)
+    # compatibilidade: python main.py PASTA [opções] é o mesmo que python cli.py ingest PASTA [opções]
+    from cli import executa
+    executa(sys.argv[1:], padrao="ingest")
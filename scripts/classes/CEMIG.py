@@ -1,13 +1,14 @@
-import regex as re
 from scripts.classes.Fatura import Fatura
-from typing import Any, List, Tuple
+from scripts.classes.Documento import Documento
+from scripts.funcoes.f_conversoes import converte_datas, converte_numeros
+from scripts.funcoes.f_regex import REGEX
+from typing import Any, List, Pattern, Tuple
 from pandas import DataFrame, Series
 
 
 class CEMIG(Fatura):
-    def __init__(self, path: str):
-        super().__init__(path)
-        self.split_str = lambda x: re.split("\s+", x)[:-1]
+    def __init__(self, path: str, documento: Documento = None):
+        super().__init__(path, documento)
     
     @Fatura.distribuidora.getter
     def distribuidora(self) -> str:
@@ -27,44 +28,48 @@ class CEMIG(Fatura):
 
     @Fatura.medida_consumo.setter
     def medida_consumo(self, indice: int):
-        self._medida_consumo = re.search("energia\((\w*)\)", self._primeira_pagina).group(1)
+        self._medida_consumo = REGEX["CEMIG"]["medida_consumo"].search(self.primeira_pagina).group(1)
     
     @Fatura.medida_demanda.setter
     def medida_demanda(self, indice: int):
-        self._medida_demanda = re.search("demanda\((\w*)\)", self._primeira_pagina).group(1)
+        self._medida_demanda = REGEX["CEMIG"]["medida_demanda"].search(self.primeira_pagina).group(1)
 
     @Fatura.nome.setter
     def nome(self, flag: Any):
-        self._nome = re.search("cliente: (\w.*) unidade:", self._ultima_pagina).group(1)
+        self._nome = REGEX["CEMIG"]["nome"].search(self.ultima_pagina).group(1)
 
     @Fatura.ths.setter
-    def ths(self, texto_a_encontrar: str):
-        self._ths = re.search(texto_a_encontrar, self._primeira_pagina).group(1)
+    def ths(self, padrao: Pattern):
+        self._ths = padrao.search(self.primeira_pagina).group(1)
            
     def main(self):
         idx_0, idx_1 = self.indices()
         dados_lista = list(map(self.split_str, self.dados_lista(idx_0, idx_1)))
         cols = ["datas", "demanda_ponta", "demanda_fora_de_ponta", "consumo_ponta", "consumo_fora_de_ponta"]
         df = DataFrame(dados_lista, columns=cols)
-        df.consumo_ponta = df.consumo_ponta.astype(str).str.replace(".", "", regex=False).astype(int)
-        df.consumo_fora_de_ponta = df.consumo_fora_de_ponta.astype(str).str.replace(".", "", regex=False).astype(int)
-        df.datas = df.datas.apply(self.transforma_data)
+        # consumos e demandas em float64 (até a versão 1 dos leitores, VERSAO_PARSER, as demandas ficavam em texto)
+        for col in cols[1:]:
+            df[col] = converte_numeros(df[col])
+        df.datas = converte_datas(df.datas)
         
         self.consumo = df[["datas", "consumo_ponta", "consumo_fora_de_ponta"]]
         self.demanda = df[["datas", "demanda_ponta", "demanda_fora_de_ponta"]]
         self.data = df["datas"]
-        self.ths = "ths (\w+)\s"
+        self.ths = REGEX["CEMIG"]["ths"]
         
         self.nome = None
         self.medida_demanda = None
         self.medida_consumo = None
 
+    def split_str(self, linha: str) -> List[str]:
+        return REGEX["CEMIG"]["espacos"].split(linha)[:-1]
+
     def dados_lista(self, idx_0: int, idx_1: int) -> List[str]:
-        return self._primeira_pagina[idx_0: idx_1].split("\n")
+        return self.primeira_pagina[idx_0: idx_1].split("\n")
 
     def indices(self) -> Tuple[int, int]:
         encontrar = "hp hfp hp hfp hr"
-        idx_0 = self._primeira_pagina.find(encontrar) + len(encontrar) + 1
-        idx_1 = self._primeira_pagina.find("reservado ao fisco")
+        idx_0 = self.primeira_pagina.find(encontrar) + len(encontrar) + 1
+        idx_1 = self.primeira_pagina.find("reservado ao fisco")
         return idx_0, idx_1
     
\ No newline at end of file
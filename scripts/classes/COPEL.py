@@ -1,13 +1,18 @@
-import regex as re
 import pandas as pd
 from typing import Any, List, Tuple
 from pandas import DataFrame, Series
 from scripts.classes.Fatura import Fatura
+from scripts.classes.Documento import Documento
+from scripts.funcoes.f_conversoes import converte_datas, converte_numeros
+from scripts.funcoes.f_regex import REGEX
 
 
 class COPEL(Fatura):
-    def __init__(self, path: str):
-        super().__init__(path)
+    # o histórico da COPEL usa ponto como separador decimal (o mesmo do pd.to_numeric e do astype(float) usados antes)
+    DECIMAL: str = "."
+
+    def __init__(self, path: str, documento: Documento = None):
+        super().__init__(path, documento)
     
     def _consumo_posicao(self, energia_descricao: str) -> int:
         """
@@ -20,7 +25,7 @@ class COPEL(Fatura):
             int: O índice de início da descrição de energia.
         """
 
-        indice = self._ultima_pagina.find(energia_descricao)
+        indice = self.ultima_pagina.find(energia_descricao)
         assert (
             indice != -1
         ), f"Tipo de energia não encontrado, esperado: 'consumo ponta' ou 'consumo fora de ponta' || Obtido {energia_descricao} - Cliente {self._nome}"
@@ -34,7 +39,7 @@ class COPEL(Fatura):
     @Fatura.consumo.setter
     def consumo(self, flag: Any):
         cols = {0: "datas", 1:"valor", 2:"data_venc", 3: "data_pgto", 4: "consumo_ponta", 5:"consumo_fora_de_ponta", 6: "demanda_ponta", 7: "demanda_fora_de_ponta"}       
-        index = self._ultima_pagina.find('mês/ano faturavencimento pagamento pontafora pta. pontafora pta. pontafora pta. pontafora pta.')
+        index = self.ultima_pagina.find('mês/ano faturavencimento pagamento pontafora pta. pontafora pta. pontafora pta. pontafora pta.')
         ultima_pagina_lista = self.ultima_pagina[index:].split("\n")[1:]
         df = self.dataframe(ultima_pagina_lista)
         df = df[df.columns[:8]].rename(columns=cols)
@@ -55,18 +60,18 @@ class COPEL(Fatura):
 
     @Fatura.medida_consumo.setter
     def medida_consumo(self, flag: Any) -> None:
-        self._medida_consumo = re.search("consumo \((\wwh)", self.ultima_pagina).group(1)
+        self._medida_consumo = REGEX["COPEL"]["medida_consumo"].search(self.ultima_pagina).group(1)
 
     @Fatura.medida_demanda.setter
     def medida_demanda(self, flag: Any) -> None:
-        self._medida_demanda = re.search("demanda \((\ww)", self.ultima_pagina).group(1)
+        self._medida_demanda = REGEX["COPEL"]["medida_demanda"].search(self.ultima_pagina).group(1)
 
     @Fatura.nome.setter
     def nome(self, flag: Any):
-        if self._ultima_pagina.split("\n")[1] != "segunda via":
-            self._nome = self._ultima_pagina.split("\n")[1]
+        if self.ultima_pagina.split("\n")[1] != "segunda via":
+            self._nome = self.ultima_pagina.split("\n")[1]
         else:
-            self._nome = self._ultima_pagina.split("\n")[3]
+            self._nome = self.ultima_pagina.split("\n")[3]
     
     def dataframe(self, pagina_lista: List[str]):
         return DataFrame(
@@ -123,14 +128,13 @@ class COPEL(Fatura):
         return df
 
     def checa_diferenca(self, df: DataFrame, lim: float) -> float:
-        return df["consumo_ponta"].astype(float).iloc[0] / df["consumo_ponta"].astype(float).iloc[1] > lim
+        consumo_ponta = converte_numeros(df["consumo_ponta"].iloc[:2], decimal=self.DECIMAL)
+        return consumo_ponta.iloc[0] / consumo_ponta.iloc[1] > lim
 
     def muda_tipo(self, df: DataFrame) -> DataFrame:
-        df.demanda_ponta = pd.to_numeric(df.demanda_ponta, errors='coerce')
-        df.demanda_fora_de_ponta = pd.to_numeric(df.demanda_fora_de_ponta, errors='coerce')
-        df.consumo_ponta = pd.to_numeric(df.consumo_ponta, errors='coerce')
-        df.consumo_fora_de_ponta = pd.to_numeric(df.consumo_fora_de_ponta, errors='coerce')
-        df.datas = pd.to_datetime(df.datas, format="%m/%Y")
+        for col in ["demanda_ponta", "demanda_fora_de_ponta", "consumo_ponta", "consumo_fora_de_ponta"]:
+            df[col] = converte_numeros(df[col], decimal=self.DECIMAL)
+        df.datas = converte_datas(df.datas)
         return df
             
     def remove_outliers(self, df: DataFrame) -> DataFrame:
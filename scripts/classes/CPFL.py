@@ -1,13 +1,14 @@
-import regex as re
 import pandas as pd
 from typing import Any, List, Tuple
 from scripts.classes.Fatura import Fatura
-from scripts.funcoes.f_database import arruma_decimal
+from scripts.classes.Documento import Documento
+from scripts.funcoes.f_conversoes import converte_datas, converte_numeros
+from scripts.funcoes.f_regex import REGEX
 
 
 class CPFL(Fatura):
-    def __init__(self, path: str) -> None:
-        super().__init__(path)
+    def __init__(self, path: str, documento: Documento = None) -> None:
+        super().__init__(path, documento)
     
     def _texto_posicao(self, energia_descricao: str) -> int:
         """
@@ -20,7 +21,7 @@ class CPFL(Fatura):
             int: O índice de início da descrição de energia.
         """
 
-        indice = self._ultima_pagina.find(energia_descricao)
+        indice = self.ultima_pagina.find(energia_descricao)
         assert (
             indice != -1
         ), f"Tipo de energia não encontrado, esperado: 'consumo ponta' ou 'consumo fora de ponta' || Obtido {energia_descricao} - Cliente {self._nome}"
@@ -52,14 +53,14 @@ class CPFL(Fatura):
         self.medida_consumo = indice
         lista_consumo = self._lista_consumo(indice)
         energia_ind, dias_ind = self._get_indices(lista_consumo)
-        return arruma_decimal(pd.Series(lista_consumo[energia_ind+1: dias_ind]))
+        return converte_numeros(pd.Series(lista_consumo[energia_ind+1: dias_ind]))
 
     def _get_indices(self, lista: List[str]) -> Tuple[int, int]:
         return lista.index("energia_wh"), lista.index("dias")
 
     def _lista_consumo(self, indice: int) -> List[str]:
         return (
-            self._ultima_pagina[indice:]
+            self.ultima_pagina[indice:]
             .replace("kwh", "\nenergia_wh")
             .replace("mwh", "\nenergia_wh")
             .replace(" ", "")
@@ -70,7 +71,7 @@ class CPFL(Fatura):
     def _lista_demanda(self, indice: int) -> List[str]:
         ultimo_index = indice + self.ultima_pagina[indice:].find("dias")
         texto = self.ultima_pagina[indice:ultimo_index]
-        info = re.sub("ll.*", "", texto.replace("dias", "\ndias")).split("\n")
+        info = REGEX["CPFL"]["demanda_fim"].sub("", texto.replace("dias", "\ndias")).split("\n")
         return list(filter(lambda x: x != '', info))
 
     def main(self) -> None:
@@ -81,7 +82,7 @@ class CPFL(Fatura):
         self.demanda = None
 
     def datas_lista_sem_filtro(self, indice: int) -> List[str]:
-        return re.sub("(jul)?ll.*", r"\1", self.ultima_pagina[indice:]).split("\n")
+        return REGEX["CPFL"]["datas_fim"].sub(r"\1", self.ultima_pagina[indice:]).split("\n")
 
     def datas_lista_filtro(self, indice: int) -> List[str]:
         datas = self.datas_lista_sem_filtro(indice)
@@ -89,7 +90,7 @@ class CPFL(Fatura):
             ultimo_index = datas.index("")
         except Exception:
             datas = "\n".join(datas)
-            ultimo_index = re.search("\n\w.*dias", datas).span()[0] 
+            ultimo_index = REGEX["CPFL"]["datas_dias"].search(datas).span()[0] 
             datas = datas[:ultimo_index].split("\n")
         return self.datas_texto(datas[1:ultimo_index])
 
@@ -117,12 +118,13 @@ class CPFL(Fatura):
         indice = self._texto_posicao(energia_desc)
         indice_fim = self.ultima_pagina[indice + len(energia_desc):].find("]") + (indice + len(energia_desc))
         self.medida_demanda = self.ultima_pagina[indice + len(energia_desc):indice_fim]
-        lista_demanda = list(filter(lambda x: x != '', self._lista_demanda(indice)))
-        return pd.Series([float(valor.replace(',', '.')) for valor in lista_demanda if valor.replace(',', '.').replace('.', '', 1).isdigit()], name="demanda")
+        demandas = pd.Series(self._lista_demanda(indice), name="demanda", dtype=object)
+        # a lista inclui os textos em volta dos valores (ex.: "demanda - [kw]"), apenas os textos com digitos são convertidos
+        return converte_numeros(demandas[demandas.str.contains(r"\d", na=False)]).dropna().reset_index(drop=True)
 
     def set_ano_anterior(self, datas: str, ano_anterior: int) -> List[str]:
         sep = datas.find(str(ano_anterior))
-        ano_anterior_lista = re.sub("\s", "\n", datas[sep:]).split("\n")
+        ano_anterior_lista = REGEX["CPFL"]["espaco"].sub("\n", datas[sep:]).split("\n")
         ano_anterior_lista = list(filter(lambda x: x != "", ano_anterior_lista))[1:]
         return [f"{x[:3]}/{ano_anterior}" for x in ano_anterior_lista]
 
@@ -130,9 +132,9 @@ class CPFL(Fatura):
         sep = datas.find(str(ano_anterior))
 
         if sep != -1:
-            ano_atual_lista = re.sub("\s", "\n", datas[:sep]).split("\n")
+            ano_atual_lista = REGEX["CPFL"]["espaco"].sub("\n", datas[:sep]).split("\n")
         else:
-            ano_atual_lista = re.sub("\s", "\n", datas[:]).split("\n")
+            ano_atual_lista = REGEX["CPFL"]["espaco"].sub("\n", datas[:]).split("\n")
 
         ano_atual_lista = list(filter(lambda x: x != "", ano_atual_lista))[1:]
         return [f"{x[:3]}/{str(ano_anterior+1)}" for x in ano_atual_lista]
@@ -161,7 +163,7 @@ class CPFL(Fatura):
         if not self._data:
             datas_lista = self.datas_lista_filtro(primeiro_indice)
             datas_series = pd.Series(datas_lista, name="datas")
-            self._data = datas_series.apply(self.transforma_data)
+            self._data = converte_datas(datas_series)
 
     @Fatura.demanda.setter
     def demanda(self, flag: Any):
@@ -195,7 +197,7 @@ class CPFL(Fatura):
     @Fatura.ths.setter
     def ths(self, flag: Any):
         THSs = {"Cliente Livre-A4".lower(): "azul", "verde": "verde", "Tarifa Azul-A4".lower(): "azul"}
-        ths = [x in self._primeira_pagina for x in THSs]
+        ths = [x in self.primeira_pagina for x in THSs]
         if sum(ths) != 0:
             assert sum(ths) == 1, f"Mais de uma THS encontrada {self.nome}"
             key = list(THSs.keys())[ths.index(True)]
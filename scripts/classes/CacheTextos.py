@@ -0,0 +1,126 @@
+import os
+import json
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+from scripts.classes.Extrator import get_extrator
+
+# variavel de ambiente com a pasta do cache de textos (herdada pelos processos de leitura), vazia ou ausente = cache desativado
+VARIAVEL_AMBIENTE: str = "LEITOR_CACHE_TEXTOS"
+
+
+class CacheTextos:
+    """
+    Cache persistente do texto extraído das páginas dos PDFs, separado da leitura das distribuidoras:
+    após uma correção em um leitor, as faturas são lidas novamente a partir do texto, sem extrair o texto do PDF outra vez.
+    Cada PDF é um arquivo comprimido (zlib) com o texto das páginas ja extraídas, na pasta do extrator de texto e da sua versão
+    (pasta/PyPDF2-3.0.1/ab/abcdef....json.z), a chave é o hash do conteudo do PDF (f_hash, o mesmo do cache de faturas).
+    Os arquivos são gravados de forma atômica, então varios processos de leitura podem usar a mesma pasta
+
+    Args:
+        pasta (str): pasta do cache
+        versao (str | None): extrator e versão (Extrator.versao()), se None usa o extrator da execução (get_extrator)
+
+    Exemplo:
+        cache = CacheTextos(pasta)
+        cache.salva(chave, quantidade=2, textos={"pagina_0": "..."})
+        cache.limpa(idade_maxima_dias=180, tamanho_maximo_mb=1024)
+    """
+
+    EXTENSAO: str = ".json.z"
+    _instancias: Dict[Tuple[str, str], "CacheTextos"] = {}
+
+    def __init__(self, pasta: str, versao: Optional[str] = None) -> None:
+        self.pasta = pasta
+        self.versao = versao or get_extrator().versao()
+
+    @classmethod
+    def do_ambiente(cls) -> Optional["CacheTextos"]:
+        """
+        Cache configurado pela variavel de ambiente LEITOR_CACHE_TEXTOS (uma instancia por pasta, extrator e processo)
+
+        Returns:
+            CacheTextos | None: cache de textos, ou None se estiver desativado
+        """
+        pasta = os.environ.get(VARIAVEL_AMBIENTE, "")
+        if not pasta:
+            return None
+        versao = get_extrator().versao()
+        if (pasta, versao) not in cls._instancias:
+            cls._instancias[pasta, versao] = cls(pasta, versao)
+        return cls._instancias[pasta, versao]
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.pasta, self.versao, chave[:2], f"{chave}{self.EXTENSAO}")
+
+    def le(self, chave: str) -> Optional[Tuple[int, Dict[str, str]]]:
+        """
+        Obtem o texto das páginas do PDF, se estiver no cache (a data de modificação do arquivo é atualizada,
+        para que a limpeza por idade remova primeiro os textos não usados)
+
+        Args:
+            chave (str): hash do PDF
+
+        Returns:
+            Tuple[int, Dict[str, str]] | None: quantidade de páginas do PDF e texto das páginas ja extraídas ({"pagina_0": ...})
+        """
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, "rb") as arquivo:
+                dados = json.loads(zlib.decompress(arquivo.read()).decode("utf-8"))
+            os.utime(caminho)
+        except (OSError, ValueError, zlib.error):
+            return None
+        return dados["quantidade"], dados["paginas"]
+
+    def salva(self, chave: str, quantidade: int, textos: Dict[str, str]) -> None:
+        """
+        Grava o texto das páginas extraídas do PDF (substitui o anterior)
+
+        Args:
+            chave (str): hash do PDF
+            quantidade (int): quantidade de páginas do PDF
+            textos (Dict[str, str]): texto das páginas ja extraídas ({"pagina_0": ...})
+        """
+        caminho = self._caminho(chave)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        dados = zlib.compress(json.dumps({"quantidade": quantidade, "paginas": textos}, ensure_ascii=False).encode("utf-8"))
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(dados)
+        os.replace(temporario, caminho)
+
+    def limpa(self, idade_maxima_dias: Optional[float] = None, tamanho_maximo_mb: Optional[float] = None) -> int:
+        """
+        Remove os textos não usados a mais de idade_maxima_dias e, se o cache ainda passar de tamanho_maximo_mb,
+        os menos usados recentemente até ficar dentro do limite (inclusive os de outros extratores e versões)
+
+        Args:
+            idade_maxima_dias (float | None): idade maxima (dias desde o ultimo uso), None não limita
+            tamanho_maximo_mb (float | None): tamanho maximo do cache em MB, None não limita
+
+        Returns:
+            int: quantidade de arquivos removidos
+        """
+        arquivos = []
+        for raiz, _, nomes in os.walk(self.pasta):
+            for nome in nomes:
+                if nome.endswith(self.EXTENSAO):
+                    info = os.stat(os.path.join(raiz, nome))
+                    arquivos.append((info.st_mtime, info.st_size, os.path.join(raiz, nome)))
+        arquivos.sort()
+        limite_idade = time.time() - idade_maxima_dias * 86400 if idade_maxima_dias is not None else None
+        tamanho_total = sum(tamanho for _, tamanho, _ in arquivos)
+        removidos = 0
+        for modificado, tamanho, caminho in arquivos:
+            antigo = limite_idade is not None and modificado < limite_idade
+            excedente = tamanho_maximo_mb is not None and tamanho_total > tamanho_maximo_mb * 1024 * 1024
+            if not (antigo or excedente):
+                continue
+            try:
+                os.remove(caminho)
+            except OSError:
+                continue
+            tamanho_total -= tamanho
+            removidos += 1
+        return removidos
@@ -0,0 +1,250 @@
+import os
+import mmap
+import time
+from typing import Callable, Dict, Iterator, List, Mapping, Optional
+from scripts.classes.CacheTextos import CacheTextos
+from scripts.funcoes.f_hash import hash_arquivo, hash_conteudo
+from scripts.classes.Extrator import Extrator, get_extrator
+
+# a partir deste tamanho (bytes) o pdf não é carregado na memória, é lido diretamente do disco (memory-mapped)
+LIMITE_ARQUIVO_GRANDE: int = 3000000
+
+
+class Paginas(Mapping):
+    """
+    Relação nome da página <-> texto da página em letras minúsculas ({"pagina_0": ..., "pagina_1": ...}),
+    o texto de cada página só é extraído no primeiro acesso e fica guardado para os acessos seguintes
+
+    Args:
+        leitor (Extrator | None): extrator de texto do PDF da fatura, None para abrir o PDF apenas se alguma página precisar ser extraída
+        abre (Callable[[], Extrator] | None): função que abre o PDF, quando o leitor não é informado
+
+    Attributes:
+        tempo_extracao (float): tempo total (s) gasto extraindo o texto das páginas
+    """
+
+    def __init__(self, leitor: Optional[Extrator], abre: Optional[Callable[[], Extrator]] = None) -> None:
+        self._leitor, self._abre = leitor, abre
+        self._indices = {f"pagina_{n}": n for n in range(len(leitor))} if leitor is not None else {}
+        self._textos: Dict[str, str] = {}
+        self.tempo_extracao: float = 0.0
+
+    @classmethod
+    def de_cache(cls, quantidade: int, textos: Dict[str, str], abre: Callable[[], Extrator]) -> "Paginas":
+        """
+        Cria as páginas a partir dos textos do cache de textos, o PDF só é aberto se uma página fora do cache for acessada
+
+        Args:
+            quantidade (int): quantidade de páginas do PDF
+            textos (Dict[str, str]): texto das páginas ja extraídas, em letras minúsculas
+            abre (Callable[[], Extrator]): função que abre o PDF
+
+        Returns:
+            Paginas: páginas com os textos do cache ja disponiveis
+        """
+        paginas = cls(None, abre)
+        paginas._indices = {f"pagina_{n}": n for n in range(quantidade)}
+        paginas._textos = dict(textos)
+        return paginas
+
+    @classmethod
+    def de_textos(cls, textos: List[str]) -> "Paginas":
+        """
+        Cria as páginas a partir de textos ja extraídos (sem PDF)
+
+        Args:
+            textos (List[str]): texto de cada página
+
+        Returns:
+            Paginas: páginas com todos os textos ja disponiveis, em letras minúsculas
+        """
+        paginas = cls(None)
+        paginas._indices = {f"pagina_{n}": n for n in range(len(textos))}
+        paginas._textos = {f"pagina_{n}": texto.lower() for n, texto in enumerate(textos)}
+        return paginas
+
+    def __getitem__(self, chave: str) -> str:
+        if chave not in self._textos:
+            indice = self._indices[chave]
+            if self._leitor is None:
+                self._leitor = self._abre()
+            inicio = time.perf_counter()
+            self._textos[chave] = self._leitor.texto(indice).lower()
+            self.tempo_extracao += time.perf_counter() - inicio
+        return self._textos[chave]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._indices)
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    @property
+    def extraidas(self) -> int:
+        """
+        Quantidade de páginas que já tiveram o texto extraído
+        """
+        return len(self._textos)
+
+    @property
+    def textos(self) -> Dict[str, str]:
+        """
+        Texto das páginas ja extraídas
+        """
+        return dict(self._textos)
+
+
+class Documento:
+    """
+    Representa o conteúdo de texto de uma fatura em PDF, lido uma única vez e compartilhado
+    entre o Identificador e a classe da Distribuidora
+
+    Arquivos a partir de LIMITE_ARQUIVO_GRANDE não são carregados na memória: o leitor acessa o arquivo mapeado em memória
+    (mmap) e, como o texto é extraído sob demanda, apenas as páginas usadas (normalmente a primeira e a ultima) são lidas,
+    mantendo o uso de memória estável mesmo para faturas digitalizadas ou com muitos meses
+
+    O texto é extraído pelo extrator da execução (get_extrator: PyPDF2, pypdf, pdfminer ou pypdfium2, ver Extrator)
+
+    Com o cache de textos ativo (CacheTextos.do_ambiente), o texto das páginas ja extraído em execuções anteriores vem do cache
+    e o PDF só é aberto pelo extrator se alguma página fora do cache for acessada. Ao fechar o documento (with Documento(...)),
+    as páginas extraídas são gravadas no cache, mesmo se a leitura da distribuidora gerar um erro
+
+    Args:
+        caminho (str): O caminho para o arquivo PDF da fatura.
+        conteudo (bytes | None): Conteudo do arquivo ja lido (ex.: lido antecipadamente da rede), se None o arquivo é lido do disco
+        chave (str | None): hash do conteudo do arquivo ja calculado (ex.: para o cache de faturas), chave do cache de textos;
+        se None e o cache de textos estiver ativo, o hash é calculado aqui
+        tamanho (int | None): tamanho do arquivo (bytes) ja obtido na listagem da pasta (os.scandir), se None é consultado no disco
+
+    Attributes:
+        caminho (str): O caminho para o arquivo PDF da fatura.
+        grande (bool): Se o arquivo foi aberto no modo de arquivo grande (mmap).
+        paginas (Paginas): Texto de cada página do PDF em letras minúsculas, extraído sob demanda.
+        em_cache (bool): Se o texto das páginas veio do cache de textos.
+        primeira_pagina e ultima_pagina (str): Texto da (primeira | ultima) página do PDF em letras minúsculas.
+    """
+
+    def __init__(
+            self, caminho: str, conteudo: Optional[bytes] = None, chave: Optional[str] = None, tamanho: Optional[int] = None
+            ) -> None:
+        self.caminho = caminho
+        self.grande = conteudo is None and Documento.eh_grande(caminho, tamanho)
+        self._arquivo, self._mapa, self._leitor = None, None, None
+        self._cache, self._chave, self._extraidas_cache = CacheTextos.do_ambiente(), None, 0
+        cacheado = None
+        if self._cache is not None:
+            self._chave = chave or (hash_arquivo(caminho) if conteudo is None else hash_conteudo(conteudo))
+            cacheado = self._cache.le(self._chave)
+        self.em_cache = cacheado is not None
+        if self.em_cache:
+            quantidade, textos = cacheado
+            self.paginas = Paginas.de_cache(quantidade, textos, lambda: self._abre(conteudo))
+            self._extraidas_cache = self.paginas.extraidas
+        else:
+            self._leitor = self._abre(conteudo)
+            self.paginas = Paginas(self._leitor)
+
+    @classmethod
+    def de_textos(cls, textos: List[str], caminho: str = "") -> "Documento":
+        """
+        Cria o documento a partir dos textos das páginas ja extraídos, sem abrir nenhum PDF
+        (ex.: faturas sintéticas dos benchmarks)
+
+        Args:
+            textos (List[str]): texto de cada página
+            caminho (str): caminho (ou nome) do arquivo que o texto representa
+
+        Returns:
+            Documento: documento com todas as páginas ja extraídas
+        """
+        documento = cls.__new__(cls)
+        documento.caminho, documento.grande, documento.em_cache = caminho, False, False
+        documento._arquivo, documento._mapa, documento._leitor = None, None, None
+        documento._cache, documento._chave, documento._extraidas_cache = None, None, 0
+        documento.paginas = Paginas.de_textos(textos)
+        return documento
+
+    @staticmethod
+    def eh_grande(caminho: str, tamanho: Optional[int] = None) -> bool:
+        """
+        Indica se o arquivo deve ser lido no modo de arquivo grande (sem carregar o arquivo inteiro na memória)
+        Com o tamanho ja conhecido (listagem da pasta) o disco não é consultado
+        Um arquivo inacessivel não é grande: o erro aparece ao abrir o arquivo, na leitura da fatura
+        """
+        if tamanho is not None:
+            return tamanho >= LIMITE_ARQUIVO_GRANDE
+        try:
+            return os.path.getsize(caminho) >= LIMITE_ARQUIVO_GRANDE
+        except OSError:
+            return False
+
+    def _abre(self, conteudo: Optional[bytes] = None) -> Extrator:
+        """
+        Lê o arquivo PDF para a memória (ou o mapeia em memória, se for grande) e prepara a extração do texto das páginas
+
+        Args:
+            conteudo (bytes | None): conteudo do arquivo ja lido, se None o arquivo é lido do disco
+
+        Returns:
+            Extrator: extrator de texto do PDF
+        """
+        extrator = get_extrator()
+        if self.grande:
+            self._arquivo = open(self.caminho, "rb")
+            self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+            self._leitor = extrator(self._mapa)
+            return self._leitor
+        if conteudo is None:
+            with open(self.caminho, "rb") as pdf:
+                conteudo = pdf.read()
+        self._leitor = extrator(conteudo)
+        return self._leitor
+
+    def fechar(self) -> None:
+        """
+        Fecha o arquivo mapeado em memória (arquivos grandes), as páginas ja extraídas continuam disponiveis
+        """
+        if self._mapa is not None:
+            self._leitor.fechar()
+            self._mapa.close()
+            self._arquivo.close()
+            self._mapa, self._arquivo = None, None
+
+    def salva_cache(self) -> None:
+        """
+        Grava no cache de textos as páginas extraídas, se alguma página foi extraída além das que ja estavam no cache
+        """
+        if self._cache is not None and self.paginas.extraidas > self._extraidas_cache:
+            self._cache.salva(self._chave, len(self.paginas), self.paginas.textos)
+            self._extraidas_cache = self.paginas.extraidas
+
+    def __enter__(self) -> "Documento":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.fechar()
+        self.salva_cache()
+
+    def conteudo_bruto(self, n: int = 0) -> str:
+        """
+        Conteúdo descomprimido dos content streams da página, em letras minúsculas, sem passar pela extração de texto.
+        Os textos escritos com operadores simples (ex.: "(texto) Tj") aparecem literalmente, o que é suficiente para
+        procurar marcadores de forma rápida, mas não substitui o texto extraído
+
+        Args:
+            n (int): número da página
+
+        Returns:
+            str: conteúdo da página decodificado como latin-1 ("" se a página não tiver conteúdo ou usar fontes que não são
+            simples, ex.: CID com o texto em hexadecimal, ver Extrator.conteudo_bruto)
+            (NotImplementedError nos extratores sem acesso aos content streams)
+        """
+        return self._leitor.conteudo_bruto(n).lower()
+
+    @property
+    def primeira_pagina(self) -> str:
+        return self.paginas["pagina_0"]
+
+    @property
+    def ultima_pagina(self) -> str:
+        return self.paginas[f"pagina_{len(self.paginas) - 1}"]
@@ -1,12 +1,14 @@
 import pandas as pd
 from scripts.classes.Fatura import Fatura
+from scripts.classes.Documento import Documento
+from scripts.funcoes.f_conversoes import converte_datas, converte_numeros
 from typing import Any, List, Tuple
 
 
 
 class EDP(Fatura):
-    def __init__(self, path: str):
-        super().__init__(path)
+    def __init__(self, path: str, documento: Documento = None):
+        super().__init__(path, documento)
     
     def _consumo_posicao(self, energia_descricao: str) -> int:
         """
@@ -19,7 +21,7 @@ class EDP(Fatura):
             int: O índice de início da descrição de energia.
         """
 
-        indice = self._ultima_pagina.find(energia_descricao)
+        indice = self.ultima_pagina.find(energia_descricao)
         assert (
             indice != -1
         ), f"Tipo de energia não encontrado, esperado: 'consumo ponta' ou 'consumo fora de ponta' || Obtido {energia_descricao} - Cliente {self._nome}"
@@ -59,7 +61,7 @@ class EDP(Fatura):
 
     def _lista_consumo(self, indice) -> List[str]:
         return (
-            self._ultima_pagina[indice:]
+            self.ultima_pagina[indice:]
             .replace("kwh", "\nenergia_wh")
             .replace("mwh", "\nenergia_wh")
             .replace(" ", "")
@@ -91,10 +93,13 @@ class EDP(Fatura):
 
     def dados_ths_verde(self, array):
         df = pd.DataFrame(array, columns=['datas', 'consumo_ponta', 'consumo_fora_de_ponta_ind', 'consumo_fora_de_ponta_cap', 'demanda_fora_de_ponta'])
-        df['consumo_fora_de_ponta'] = df['consumo_fora_de_ponta_ind'].astype(float) + df['consumo_fora_de_ponta_cap'].astype(float)
+        # a EDP usa ponto como separador decimal
+        for col in df.columns[1:]:
+            df[col] = converte_numeros(df[col], decimal=".")
+        df['consumo_fora_de_ponta'] = df['consumo_fora_de_ponta_ind'] + df['consumo_fora_de_ponta_cap']
         
         df.drop(['consumo_fora_de_ponta_cap', 'consumo_fora_de_ponta_ind'], axis=1, inplace=True)
-        df.datas = pd.to_datetime(df.datas, format="%m/%y")
+        df.datas = converte_datas(df.datas)
         return df
     
     def organiza_array(self, array):
@@ -132,5 +137,5 @@ class EDP(Fatura):
     
     @Fatura.ths.setter
     def ths(self, flag: Any):
-        index = self._primeira_pagina.find("modalidade tarifária")
-        self._ths = "verde" if "verde" in self._primeira_pagina[index:].split("\n")[1] else "azul"
+        index = self.primeira_pagina.find("modalidade tarifária")
+        self._ths = "verde" if "verde" in self.primeira_pagina[index:].split("\n")[1] else "azul"
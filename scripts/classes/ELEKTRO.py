@@ -1,12 +1,14 @@
 import pandas as pd
-import regex as re
 from scripts.classes.Fatura import Fatura
+from scripts.classes.Documento import Documento
+from scripts.funcoes.f_conversoes import converte_datas
+from scripts.funcoes.f_regex import REGEX
 from typing import Any, List, Tuple
 
 
 class ELEKTRO(Fatura):
-    def __init__(self, path: str):
-        super().__init__(path)
+    def __init__(self, path: str, documento: Documento = None):
+        super().__init__(path, documento)
     
     def _consumo_posicao(self, energia_descricao: str) -> int:
         """
@@ -19,7 +21,7 @@ class ELEKTRO(Fatura):
             int: O índice de início da descrição de energia.
         """
 
-        indice = self._ultima_pagina.find(energia_descricao)
+        indice = self.ultima_pagina.find(energia_descricao)
         assert (
             indice != -1
         ), f"Tipo de energia não encontrado, esperado: 'consumo ponta' ou 'consumo fora de ponta' || Obtido {energia_descricao} - Cliente {self._nome}"
@@ -59,7 +61,7 @@ class ELEKTRO(Fatura):
 
     def _lista_consumo(self, indice) -> List[str]:
         return (
-            self._ultima_pagina[indice:]
+            self.ultima_pagina[indice:]
             .replace("kwh", "\nenergia_wh")
             .replace("mwh", "\nenergia_wh")
             .replace(" ", "")
@@ -84,8 +86,7 @@ class ELEKTRO(Fatura):
     def data(self, flag: Any):
         if not self._data:
             dt_str = self.data_string()
-            dt_datetime = pd.to_datetime(dt_str, format="%m/%Y")
-            self._data = pd.Series(dt_datetime, name="datas")
+            self._data = converte_datas(pd.Series([dt_str], name="datas"))
 
     @Fatura.demanda.setter
     def demanda(self, flag: Any):
@@ -94,22 +95,22 @@ class ELEKTRO(Fatura):
 
     @Fatura.medida_consumo.setter
     def medida_consumo(self, flag: Any):
-        self._medida_consumo = re.search('consumo ponta te (\wwh)', self.primeira_pagina).group(1)
+        self._medida_consumo = REGEX["ELEKTRO"]["medida_consumo"].search(self.primeira_pagina).group(1)
 
     @Fatura.medida_demanda.setter
     def medida_demanda(self, flag: Any):
-        self._medida_demanda = re.search('demanda tusd (\ww)', self.primeira_pagina).group(1)
+        self._medida_demanda = REGEX["ELEKTRO"]["medida_demanda"].search(self.primeira_pagina).group(1)
 
     @Fatura.nome.setter
     def nome(self, flag: Any):
-        if "segunda via" in self._primeira_pagina:
-            self._nome = self._primeira_pagina.split("\n")[3]
+        if "segunda via" in self.primeira_pagina:
+            self._nome = self.primeira_pagina.split("\n")[3]
         else:
-            self._nome = self._primeira_pagina.split("\n")[1]
+            self._nome = self.primeira_pagina.split("\n")[1]
 
     @Fatura.ths.setter
     def ths(self, flag: Any):
-        self._ths = re.search("horária (\w*)\s/", self._primeira_pagina).group(1)
+        self._ths = REGEX["ELEKTRO"]["ths"].search(self.primeira_pagina).group(1)
 
     def main(self):
         self.ths, self.nome = None, None
@@ -117,4 +118,4 @@ class ELEKTRO(Fatura):
         self.data = None
 
     def data_string(self) -> str:
-        return re.search("leitura atual: \d.*/(\d*/\d*)", self.primeira_pagina).group(1)
+        return REGEX["ELEKTRO"]["data"].search(self.primeira_pagina).group(1)
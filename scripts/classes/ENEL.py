@@ -1,17 +1,18 @@
 import warnings
-import regex as re
 import pandas as pd
 from scripts.classes.Fatura import Fatura
+from scripts.classes.Documento import Documento
+from scripts.funcoes.f_conversoes import converte_datas, converte_numeros
+from scripts.funcoes.f_regex import REGEX
 from typing import Any, List, Tuple
 from pandas import DataFrame, Series
 warnings.filterwarnings('ignore')
 
-arruma_string_df: str = lambda x: x.rstrip().replace(".", "").replace(",", ".")
-arruma_string_nome: str = lambda x: re.split("\s{2,}|\s\-\s", x)[0].lstrip().replace(" ", "_")
+arruma_string_nome: str = lambda x: REGEX["ENEL"]["nome_separador"].split(x)[0].lstrip().replace(" ", "_")
 
 class ENEL(Fatura):
-    def __init__(self, path: str):
-        super().__init__(path)
+    def __init__(self, path: str, documento: Documento = None):
+        super().__init__(path, documento)
            
     def main(self):
         """
@@ -26,8 +27,9 @@ class ENEL(Fatura):
         self.medida_demanda, self.medida_consumo = self.encontra_medidas()
 
     def arruma_tipos(self, df: DataFrame) -> DataFrame:
-        df.datas = df.datas.apply(self.transforma_data)
-        df.loc[:, df.columns[1:]] = df.loc[:, df.columns[1:]].apply(pd.to_numeric)
+        df.datas = converte_datas(df.datas)
+        for col in df.columns[1:]:
+            df[col] = converte_numeros(df[col])
         return df
     
     def encontra_medidas(self) -> Tuple[str, str]:
@@ -37,11 +39,9 @@ class ENEL(Fatura):
         Returns:
             - Tuple[str, str]: medida de demanda, medida de consumo
         """
-        padrao1 = "quant\.\n?.*\((\ww)\/\s?\n?(\wwh)"
-        resultado = re.search(padrao1, self.primeira_pagina)
+        resultado = REGEX["ENEL"]["medidas"].search(self.primeira_pagina)
         if not resultado:
-            padrao2 = "\((\ww)\/(\wwh)\/"
-            resultado = re.search(padrao2,self.primeira_pagina)
+            resultado = REGEX["ENEL"]["medidas_alternativo"].search(self.primeira_pagina)
         return resultado.groups()
 
     def historico_lista(self) -> List[str]:
@@ -51,9 +51,8 @@ class ENEL(Fatura):
         Returns:
             - str: o histórico como lista em que cada elemento representa uma linha 
         """
-        pattern = "\d\s(28|30|31)( \w+|\w+)"
         indice0 = self.primeira_pagina.find("mês/ano")
-        indice1 = re.search(pattern, self.primeira_pagina[indice0:]).span(2)[0] + indice0
+        indice1 = REGEX["ENEL"]["historico_fim"].search(self.primeira_pagina[indice0:]).span(2)[0] + indice0
         return self.primeira_pagina[indice0:indice1].split("\n")[2:]
     
     def historico_dataframe(self, historico_lista: List[str]) -> DataFrame:
@@ -67,7 +66,7 @@ class ENEL(Fatura):
             - DataFrame: o Histórico encontrado, formatado como uma tabela/dataframe
         """
         df = DataFrame(
-            [re.split("\s+|\t", arruma_string_df(x)) for x in historico_lista]
+            [REGEX["ENEL"]["historico_colunas"].split(x.rstrip()) for x in historico_lista]
         )
         if len(df.columns) == 6:
             cols = ["datas", "demanda_ponta", "demanda_fora_de_ponta", "consumo_ponta", "consumo_fora_de_ponta", "dias"]
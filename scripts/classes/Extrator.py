@@ -0,0 +1,243 @@
+import io
+import os
+import importlib
+import importlib.util
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+# variavel de ambiente com o extrator de texto da execução (herdada pelos processos de leitura)
+VARIAVEL_AMBIENTE: str = "LEITOR_EXTRATOR"
+EXTRATOR_PADRAO: str = "PyPDF2"
+
+Fonte = Union[bytes, io.BufferedIOBase]
+
+# fontes e codificações em que o texto aparece literalmente no content stream ("(texto) Tj" em latin-1)
+FONTES_SIMPLES: Tuple[str, ...] = ("/Type1", "/TrueType", "/MMType1")
+CODIFICACOES_SIMPLES: Tuple[str, ...] = ("/WinAnsiEncoding", "/StandardEncoding", "/MacRomanEncoding", "/PDFDocEncoding")
+
+
+class Extrator:
+    """
+    Extrator de texto de um PDF (backend), usado pelo Documento no lugar de chamar o PyPDF2 diretamente.
+    Cada subclasse implementa uma biblioteca de extração, a biblioteca só é importada ao abrir o primeiro PDF
+
+    Args:
+        fonte (bytes | arquivo): conteudo do PDF ou arquivo aberto (ex.: mmap dos arquivos grandes)
+
+    Attributes:
+        nome (str): nome do extrator (ex.: "PyPDF2"), usado em LEITOR_EXTRATOR e --extrator
+        pacote (str): pacote a instalar (pip install ...)
+        modulo (str): modulo importado
+    """
+
+    nome: str = ""
+    pacote: str = ""
+    modulo: str = ""
+
+    def __init__(self, fonte: Fonte) -> None:
+        raise NotImplementedError
+
+    @classmethod
+    def disponivel(cls) -> bool:
+        return importlib.util.find_spec(cls.modulo) is not None
+
+    @classmethod
+    def versao(cls) -> str:
+        """
+        Nome e versão da biblioteca (ex.: "PyPDF2-3.0.1"), o texto extraído pode mudar entre versões (ver CacheTextos)
+        """
+        # importado apenas aqui, o importlib.metadata é lento para importar (ver benchmarks/bench_inicializacao.py)
+        import importlib.metadata
+        return f"{cls.nome}-{importlib.metadata.version(cls.pacote)}"
+
+    @classmethod
+    def erros(cls) -> Tuple[Type[Exception], ...]:
+        """
+        Exceções da biblioteca para PDFs corrompidos ou que não podem ser lidos
+        """
+        return ()
+
+    @staticmethod
+    def _arquivo(fonte: Fonte) -> io.BufferedIOBase:
+        return io.BytesIO(fonte) if isinstance(fonte, bytes) else fonte
+
+    def __len__(self) -> int:
+        """
+        Quantidade de páginas do PDF
+        """
+        raise NotImplementedError
+
+    def texto(self, n: int) -> str:
+        """
+        Texto extraído da página n
+        """
+        raise NotImplementedError
+
+    def conteudo_bruto(self, n: int) -> str:
+        """
+        Conteudo descomprimido dos content streams da página n, decodificado como latin-1
+        (apenas nos extratores que dão acesso aos streams, os demais geram NotImplementedError)
+        Vazio se alguma fonte da página não for simples (ex.: fontes CID / Type0 com o texto em hexadecimal,
+        ou com uma codificação própria), nessas páginas o texto não aparece literalmente e os streams nem são descomprimidos
+        """
+        raise NotImplementedError
+
+    def fechar(self) -> None:
+        pass
+
+
+class ExtratorPyPDF2(Extrator):
+    """
+    PyPDF2.PdfReader(...).pages[n].extract_text(), o extrator original do leitor
+    """
+
+    nome, pacote, modulo = "PyPDF2", "PyPDF2", "PyPDF2"
+
+    @classmethod
+    def erros(cls) -> Tuple[Type[Exception], ...]:
+        return (importlib.import_module(f"{cls.modulo}.errors").PdfReadError,)
+
+    def __init__(self, fonte: Fonte) -> None:
+        self._biblioteca = importlib.import_module(self.modulo)
+        self._leitor = self._biblioteca.PdfReader(self._arquivo(fonte))
+
+    def __len__(self) -> int:
+        return len(self._leitor.pages)
+
+    def texto(self, n: int) -> str:
+        return self._leitor.pages[n].extract_text()
+
+    def conteudo_bruto(self, n: int) -> str:
+        pagina = self._leitor.pages[n]
+        conteudo = pagina.get("/Contents")
+        if conteudo is None or not self._fontes_simples(pagina):
+            return ""
+        conteudo = conteudo.get_object()
+        streams = [c.get_object() for c in conteudo] if isinstance(conteudo, self._biblioteca.generic.ArrayObject) else [conteudo]
+        return b"\n".join(stream.get_data() for stream in streams).decode("latin-1")
+
+
+    @staticmethod
+    def _fontes_simples(pagina: Any) -> bool:
+        """
+        Se todas as fontes da página são simples (FONTES_SIMPLES, sem codificação ou com uma das CODIFICACOES_SIMPLES)
+        """
+        recursos = pagina.get("/Resources")
+        fontes = recursos.get_object().get("/Font") if recursos is not None else None
+        if fontes is None:
+            return True
+        for fonte in fontes.get_object().values():
+            fonte = fonte.get_object()
+            codificacao = fonte.get("/Encoding")
+            if fonte.get("/Subtype") not in FONTES_SIMPLES:
+                return False
+            if codificacao is not None and not (isinstance(codificacao, str) and codificacao in CODIFICACOES_SIMPLES):
+                return False
+        return True
+
+
+class ExtratorPypdf(ExtratorPyPDF2):
+    """
+    pypdf, sucessor do PyPDF2 (mesma interface, extração de texto reescrita)
+    """
+
+    nome, pacote, modulo = "pypdf", "pypdf", "pypdf"
+
+
+class ExtratorPdfminer(Extrator):
+    """
+    pdfminer.six em modo layout (LAParams), reconstroi as linhas pela posição dos caracteres
+    O pdf é interpretado uma unica vez: no primeiro texto pedido todas as páginas são extraídas (mesmo resultado do
+    pdfminer.high_level.extract_text de cada página) e ficam guardadas no extrator, as demais páginas vem da memória
+    """
+
+    nome, pacote, modulo = "pdfminer", "pdfminer.six", "pdfminer"
+
+    @classmethod
+    def erros(cls) -> Tuple[Type[Exception], ...]:
+        return (importlib.import_module("pdfminer.psexceptions").PSException,)
+
+    def __init__(self, fonte: Fonte) -> None:
+        parser = importlib.import_module("pdfminer.pdfparser")
+        documento = importlib.import_module("pdfminer.pdfdocument")
+        pdfpage = importlib.import_module("pdfminer.pdfpage")
+        self._paginas = list(pdfpage.PDFPage.create_pages(documento.PDFDocument(parser.PDFParser(self._arquivo(fonte)))))
+        self._textos: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._paginas)
+
+    def texto(self, n: int) -> str:
+        if self._textos is None:
+            self._textos = self._extrai_paginas()
+        return self._textos[n]
+
+    def _extrai_paginas(self) -> List[str]:
+        """
+        Extrai o texto de todas as páginas com um unico interpretador (recursos e fontes carregados uma vez)
+        """
+        conversor = importlib.import_module("pdfminer.converter")
+        interpretacao = importlib.import_module("pdfminer.pdfinterp")
+        layout = importlib.import_module("pdfminer.layout")
+        recursos = interpretacao.PDFResourceManager(caching=True)
+        textos: List[str] = []
+        with io.StringIO() as saida:
+            dispositivo = conversor.TextConverter(recursos, saida, laparams=layout.LAParams())
+            interpretador = interpretacao.PDFPageInterpreter(recursos, dispositivo)
+            for pagina in self._paginas:
+                interpretador.process_page(pagina)
+                textos.append(saida.getvalue())
+                saida.seek(0)
+                saida.truncate()
+            dispositivo.close()
+        return textos
+
+
+class ExtratorPdfium(Extrator):
+    """
+    pypdfium2 (PDFium, o motor do Chrome), extração nativa em C++
+    """
+
+    nome, pacote, modulo = "pypdfium2", "pypdfium2", "pypdfium2"
+
+    @classmethod
+    def erros(cls) -> Tuple[Type[Exception], ...]:
+        return (importlib.import_module(cls.modulo).PdfiumError,)
+
+    def __init__(self, fonte: Fonte) -> None:
+        self._documento = importlib.import_module(self.modulo).PdfDocument(self._arquivo(fonte))
+
+    def __len__(self) -> int:
+        return len(self._documento)
+
+    def texto(self, n: int) -> str:
+        pagina = self._documento[n]
+        texto = pagina.get_textpage().get_text_range()
+        pagina.close()
+        return texto.replace("\r\n", "\n")
+
+    def fechar(self) -> None:
+        self._documento.close()
+
+
+EXTRATORES: Dict[str, Type[Extrator]] = {
+    extrator.nome: extrator for extrator in (ExtratorPyPDF2, ExtratorPypdf, ExtratorPdfminer, ExtratorPdfium)
+}
+
+
+def get_extrator(nome: str = None) -> Type[Extrator]:
+    """
+    Obtem o extrator de texto
+
+    Args:
+        nome (str | None): nome do extrator, se None usa a variavel de ambiente LEITOR_EXTRATOR ou o EXTRATOR_PADRAO
+
+    Returns:
+        Type[Extrator]: classe do extrator
+    """
+    nome = nome or os.environ.get(VARIAVEL_AMBIENTE) or EXTRATOR_PADRAO
+    if nome not in EXTRATORES:
+        raise ValueError(f"Extrator de texto desconhecido: {nome} (opções: {', '.join(EXTRATORES)})")
+    extrator = EXTRATORES[nome]
+    if not extrator.disponivel():
+        raise ImportError(f"O extrator {nome} precisa do pacote {extrator.pacote} (pip install {extrator.pacote})")
+    return extrator
@@ -1,7 +1,14 @@
 from datetime import datetime
-import PyPDF2
-from typing import Dict, List
+from typing import Dict, List, Mapping
 import pandas as pd
+from scripts.classes.Documento import Documento
+from scripts.funcoes.f_conversoes import converte_datas
+
+# Versão dos leitores das distribuidoras, deve ser incrementada sempre que a leitura de alguma fatura mudar
+# (invalida o cache de faturas ja lidas)
+# versão 2: consumos e demandas de todas as distribuidoras em float64 (ex.: as demandas da CEMIG eram texto)
+# versão 3: histórico da COPEL com ponto como separador decimal
+VERSAO_PARSER: int = 3
 
 
 class Fatura:
@@ -10,44 +17,47 @@ class Fatura:
 
     Args:
         caminho (str): O caminho para o arquivo PDF da fatura.
+        documento (Documento | None): Texto do PDF ja extraído (ex.: pelo Identificador), se None o PDF é lido
 
     Attributes:
         caminho (str): O caminho para o arquivo PDF da fatura.
-        pdf (PyPDF2.PdfReader): Um objeto PyPDF2.PdfReader para ler o PDF.
+        pdf (Mapping[str, str]): Texto de cada página do PDF em letras minúsculas, extraído no primeiro acesso.
         primeira_pagina e ultima_pagina (str): Texto extraído da (primeira | ultima) página do PDF em letras minúsculas.
         nome (str): Nome do cliente
         consumo e demanda (List[float]): Lista de (consumos | demandas) registrados no histórico
         data (List[str]): Lista de datas registradas no histórico
         medida_demanda e medida_consumo (str): Descricao da unidade de medida da (consumo | demanda)
         ths (str): Descricao da tarifa horosazonal do cliente 
+        tempos (Dict[str, float]): Tempos (s) de abertura, extração de texto, identificação e leitura da fatura
+
+    Cada distribuidora é uma subclasse em scripts/classes/<DISTRIBUIDORA>.py, declarada em f_distribuidoras.CATALOGO
+    (marcadores, prioridade e se é suportada) e importada apenas quando a primeira fatura dela é lida
     """
 
-    def __init__(self, path: str) -> None:
+    def __init__(self, path: str, documento: Documento = None) -> None:
         self._caminho = path
-        self._pdf, self._primeira_pagina, self._ultima_pagina = None, None, None
-        self._le_fatura()
+        self._pdf = None
+        self._le_fatura(documento)
         self._nome, self._consumo, self._demanda = None, None, None
         self._ths, self._medida_consumo, self._medida_demanda = None, None, None
         self._data = None
+        self.tempos: Dict[str, float] = {}
 
-    def _le_fatura(self) -> None:
+    def _le_fatura(self, documento: Documento = None) -> None:
         """
-        Lê o arquivo PDF da fatura e extrai informações relevantes e define as variaveis pdf (contem o conteúdo de cada pagina),
-        a primeira pagina e a ultima pagina
+        Define a variavel pdf (contem o conteúdo de cada pagina, extraído sob demanda) a partir do documento já lido,
+        o arquivo PDF só é lido quando nenhum documento é fornecido
 
-        Returns:
-            Tuple[PyPDF2.PdfReader, str, str]: Uma tupla contendo o objeto PdfReader,
-            o texto da primeira página em letras minúsculas e o texto da última página em letras minúsculas.
+        Args:
+            documento (Documento | None): Texto do PDF ja extraído
         """
-        with open(self._caminho, "rb") as pdf:
-            conteudo = PyPDF2.PdfReader(pdf)
-            conteudo = {
-                f"pagina_{n}": conteudo.pages[n].extract_text().lower()
-                for n in range(len(conteudo.pages))
-            }
-        self.pdf = conteudo
-        self.primeira_pagina = list(conteudo.values())[0]
-        self.ultima_pagina = list(conteudo.values())[-1]
+        if documento is None:
+            documento = Documento(self._caminho)
+        self.pdf = documento.paginas
+
+    @property
+    def caminho(self) -> str:
+        return self._caminho
 
     @property
     def distribuidora(self) -> None:
@@ -107,16 +117,12 @@ class Fatura:
         return self._pdf
 
     @pdf.setter
-    def pdf(self, pdf: Dict[str, str]):
+    def pdf(self, pdf: Mapping[str, str]):
         self._pdf = pdf
 
     @property
     def primeira_pagina(self) -> str:
-        return self._primeira_pagina
-
-    @primeira_pagina.setter
-    def primeira_pagina(self, pagina: str) -> None:
-        self._primeira_pagina = pagina
+        return self._pdf["pagina_0"]
 
     @property
     def ths(self) -> str:
@@ -128,28 +134,10 @@ class Fatura:
 
     @property
     def ultima_pagina(self) -> str:
-        return self._ultima_pagina
-
-    @ultima_pagina.setter
-    def ultima_pagina(self, pagina: str) -> None:
-        self._ultima_pagina = pagina
+        return self._pdf[f"pagina_{len(self._pdf) - 1}"]
 
     def transforma_data(self, x: str) -> datetime:
-        relacao_mes_val = {
-            "jan": "01-01",
-            "fev": "01-02",
-            "mar": "01-03",
-            "abr": "01-04",
-            "mai": "01-05",
-            "jun": "01-06",
-            "jul": "01-07",
-            "ago": "01-08",
-            "set": "01-09",
-            "out": "01-10",
-            "nov": "01-11",
-            "dez": "01-12",
-        }
-        try:
-            return pd.to_datetime(relacao_mes_val[x[:3]] + "-" + x[-4:], format="%d-%m-%Y")
-        except ValueError:
-            return pd.to_datetime(relacao_mes_val[x[:3]] + "-" + x[-2:], format="%d-%m-%y")
+        """
+        Converte uma unica data ('jan/2023' ou 'jan/23'), para uma Series inteira use converte_datas
+        """
+        return converte_datas(pd.Series([x])).iloc[0]
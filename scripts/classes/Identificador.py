@@ -1,7 +1,16 @@
-import os
-from typing import Any, Dict, Union
-from scripts.classes.Fatura import Fatura
-from scripts.classes import CEMIG, COPEL, CPFL, EDP, ELEKTRO, ENEL
+import contextlib
+from typing import Any, Dict, List, Optional, Union
+from scripts.classes.Documento import Documento
+from scripts.classes.Extrator import get_extrator
+from scripts.funcoes.f_regex import MOTOR
+from scripts.funcoes.f_distribuidoras import CATALOGO, get_classe
+
+# marcador => nome da distribuidora, a partir dos marcadores declarados no catalogo (sem importar os leitores)
+TEXTOS_A_ENCONTRAR: Dict[str, str] = {
+    marcador: nome for nome, declaracao in CATALOGO.items() for marcador in declaracao.marcadores
+}
+# todos os textos compilados em um unico padrao, o texto da fatura é percorrido uma unica vez
+PADRAO_TEXTOS = MOTOR.compile("|".join(map(MOTOR.escape, TEXTOS_A_ENCONTRAR)))
 
 class Identificador:
     """
@@ -9,46 +18,69 @@ class Identificador:
     
     Args:
         - infos (Dict): Dicionario com informacao de nome do arquivo e caminho para o pdf
+        - rapido (bool): se True, procura os textos primeiro no conteudo bruto da primeira pagina (sem extrair o texto)
+        e só extrai o texto se nenhum ou mais de um texto for encontrado; nas páginas com fontes que não são simples
+        (ex.: fontes CID, texto em hexadecimal) o conteudo bruto é vazio e o texto é sempre extraído
+        - conteudo (bytes | None): conteudo do pdf ja lido (ex.: lido antecipadamente da rede), se None o pdf é lido do disco
+        - chave (str | None): hash do conteudo do pdf ja calculado (cache de faturas), repassado ao Documento
+        - tamanho (int | None): tamanho do pdf (bytes) ja obtido na listagem da pasta, repassado ao Documento
+
+    Attributes:
+        - documento (Documento): Texto extraído do pdf, repassado a classe da Distribuidora para não ler o pdf novamente
+        - candidatas (List[str]): distribuidoras com marcadores encontrados na ultima busca (nenhuma ou mais de uma = não identificada)
 
     Returns:
-        - str | None: Nome da Distribuidora, ou None se não identificado
+        - type | None: classe da Distribuidora (main, importada sob demanda), ou None se não identificado
     """
-    def __init__(self, infos: Dict[str, str]) -> None:
+    def __init__(
+            self, infos: Dict[str, str], rapido: bool = True, conteudo: Optional[bytes] = None, chave: Optional[str] = None,
+            tamanho: Optional[int] = None
+            ) -> None:
         caminho = list(infos.values())[0]
-        if os.path.getsize(caminho) < 3000000:
-            self.fatura = Fatura(caminho).primeira_pagina.lower()
-        else:
-            self.fatura = ""
+        self.rapido = rapido
+        self.documento = Documento(caminho, conteudo, chave, tamanho)
+        self.candidatas: List[str] = []
+
+    @property
+    def fatura(self) -> str:
+        """
+        Texto da primeira pagina da fatura, extraído apenas quando acessado
+        """
+        return self.documento.primeira_pagina
 
     def get_distribuidora(self) -> Union[str,None]:
+        # com o texto no cache de textos, a primeira página ja está disponivel sem abrir o PDF
+        # sem acesso ao conteudo bruto (NotImplementedError) ou com um content stream corrompido, usa o texto extraído
+        if self.rapido and not self.documento.em_cache:
+            with contextlib.suppress(NotImplementedError, *get_extrator().erros()):
+                if distribuidora := self.encontra_distribuidora(self.documento.conteudo_bruto()):
+                    return distribuidora
+        return self.encontra_distribuidora(self.fatura)
+
+    def encontra_distribuidora(self, texto: str) -> Union[str,None]:
+        """
+        Procura os marcadores de todas as distribuidoras no texto, a distribuidora só é identificada se apenas os marcadores dela
+        forem encontrados, ou se ela tiver a maior prioridade entre as distribuidoras encontradas
+
+        Args:
+            - texto (str): texto (em letras minusculas) onde procurar
+
+        Returns:
+            - str | None: Nome da Distribuidora (chave do CATALOGO), ou None se não identificado
+        """
         _dict = self.get_textos_a_encontrar()
-        try:
-            texto = list(filter(lambda x: x in self.fatura, _dict.keys()))
-            assert len(texto) == 1, f"textos encontrados: {texto}"
-            return _dict[texto[0]]
-        
-        except AssertionError:
-            return None
+        encontradas = {_dict[marcador] for marcador in PADRAO_TEXTOS.findall(texto)}
+        self.candidatas = sorted(encontradas)
+        if len(encontradas) > 1:
+            maior = max(CATALOGO[nome].prioridade for nome in encontradas)
+            encontradas = {nome for nome in encontradas if CATALOGO[nome].prioridade == maior}
+        return encontradas.pop() if len(encontradas) == 1 else None
 
     def get_textos_a_encontrar(self) -> Dict[str, str]:
         """
-        Configura e relaciona os textos e distribuidoras para pesquisar
+        Relaciona os marcadores e as distribuidoras para pesquisar
         """
-        textos = ["eletropaulo metropolitana eletricidade de são paulo s.a", "elektro redes s.a.", "cpflempresas", "copel distribuição s.a", "fale com cemig", "edp são paulo distribuição de energia s.a."]
-        distribuidoras = ["enel sp", "elektro", "cpfl", "copel", "cemig", "edp"]
-        return dict(zip(textos, distribuidoras))
+        return TEXTOS_A_ENCONTRAR
     
-    def main(self) -> Union[CEMIG.CEMIG, COPEL.COPEL, CPFL.CPFL, EDP.EDP, ENEL.ENEL, ELEKTRO.ELEKTRO, None]:
-        distr = self.get_distribuidora()
-        if distr == "cemig":
-            return CEMIG.CEMIG
-        elif distr == "copel":
-            return COPEL.COPEL
-        elif distr == "cpfl":
-            return CPFL.CPFL
-        elif distr == "edp":
-            return EDP.EDP
-        elif distr == "elektro":
-            return ELEKTRO.ELEKTRO
-        elif distr == "enel sp":
-            return ENEL.ENEL
\ No newline at end of file
+    def main(self) -> Union[type, None]:
+        return get_classe(self.get_distribuidora())
\ No newline at end of file
@@ -0,0 +1,222 @@
+import os
+import sys
+import json
+import time
+import contextlib
+import tracemalloc
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Union
+
+try:
+    import resource
+except ImportError:  # windows
+    resource = None
+
+ETAPAS_FATURA: List[str] = ["abertura", "extracao_texto", "identificacao", "leitura"]
+
+# variavel de ambiente que ativa a medição de memória (tracemalloc) nos processos de leitura, definida pelas Metricas ativas
+VARIAVEL_AMBIENTE: str = "LEITOR_MEDE_MEMORIA"
+
+# medições de memória em andamento no processo, da mais externa para a mais interna (ex.: lote > set_distribuidoras > fatura)
+_MEDICOES: List[Dict[str, int]] = []
+
+
+@contextlib.contextmanager
+def mede_memoria(resultado: Dict[str, Any], chave: str = "pico_tracemalloc_mb") -> Iterator[None]:
+    """
+    Mede o pico de memória alocada pelo Python durante o bloco (tracemalloc, acima da memória ja alocada no inicio do bloco)
+    e grava o valor em MB em resultado[chave]. Não é a memória residente (RSS) do processo: não inclui a memória alocada
+    fora do Python (ex.: bibliotecas em C) nem a do proprio interpretador, ver pico_memoria_mb. Nada é medido se o tracemalloc não estiver ativo no processo
+    (ver Metricas, os processos de leitura ativam o tracemalloc pela variavel de ambiente LEITOR_MEDE_MEMORIA)
+    As medições podem ser aninhadas: o tracemalloc.reset_peak de um bloco interno não perde o pico do bloco externo
+
+    Args:
+        resultado (Dict[str, Any]): onde gravar o pico medido (ex.: tempos da fatura, dados da etapa)
+        chave (str): chave do pico em resultado
+    """
+    if not tracemalloc.is_tracing() and os.environ.get(VARIAVEL_AMBIENTE):
+        tracemalloc.start()
+    if not tracemalloc.is_tracing():
+        yield
+        return
+    if _MEDICOES:
+        _MEDICOES[-1]["pico"] = max(_MEDICOES[-1]["pico"], tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+    medicao = {"inicio": tracemalloc.get_traced_memory()[0], "pico": 0}
+    _MEDICOES.append(medicao)
+    try:
+        yield
+    finally:
+        _MEDICOES.pop()
+        pico = max(tracemalloc.get_traced_memory()[1], medicao["pico"])
+        if _MEDICOES:
+            _MEDICOES[-1]["pico"] = max(_MEDICOES[-1]["pico"], pico)
+        resultado[chave] = (pico - medicao["inicio"]) / (1024 * 1024)
+
+
+def pico_memoria_mb(filhos: bool = False) -> Union[float, None]:
+    """
+    Pico de memória residente (RSS) desde o inicio do processo, ou dos processos filhos ja finalizados
+    (ex.: processos de leitura das faturas). É o pico de toda a execução até o momento, não de uma etapa (ver mede_memoria)
+
+    Args:
+        - filhos (bool): se True, retorna o pico dos processos filhos
+
+    Returns:
+        - float | None: pico de memória em MB, ou None se não for possível medir nesta plataforma
+    """
+    if resource is not None:
+        pico = resource.getrusage(resource.RUSAGE_CHILDREN if filhos else resource.RUSAGE_SELF).ru_maxrss
+        return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+    if not filhos:
+        with contextlib.suppress(ImportError, AttributeError):
+            import psutil
+            return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    return None
+
+
+def _resumo(valores: List[float]) -> Dict[str, float]:
+    """
+    Total, média, percentil 95 e máximo de uma lista de tempos (ou de picos de memória)
+    """
+    if not valores:
+        return {"total": 0.0, "media": 0.0, "p95": 0.0, "max": 0.0}
+    ordenados = sorted(valores)
+    return {
+        "total": sum(ordenados),
+        "media": sum(ordenados) / len(ordenados),
+        "p95": ordenados[round(0.95 * (len(ordenados) - 1))],
+        "max": ordenados[-1],
+    }
+
+
+class Metricas:
+    """
+    Registra o tempo (relógio e CPU) e o pico de memória de cada etapa da execução e os tempos e o pico de memória de cada fatura
+    (abertura / extração de texto / identificação / leitura), para gerar um relatório em JSON.
+    Com ativo=True a memória das etapas e das faturas é medida pelo tracemalloc (pico_tracemalloc_mb, memória alocada pelo Python,
+    neste processo e nos processos de leitura iniciados depois), o que deixa a execução mais lenta; o pico de memória residente (RSS)
+    aparece apenas para a execução inteira (pico_rss_execucao_mb). A medição termina ao salvar o relatório (salva) ou ao encerrar (encerra)
+    Com ativo=False nada é registrado, e as chamadas não têm custo relevante
+
+    Args:
+        ativo (bool): se as métricas devem ser registradas
+
+    Attributes:
+        etapas (List[Dict]): tempos de cada etapa, na ordem em que foram executadas
+        faturas (List[Dict]): tempos de cada fatura lida
+    """
+
+    def __init__(self, ativo: bool = True) -> None:
+        self.ativo = ativo
+        self.inicio = datetime.now()
+        self._inicio = time.perf_counter()
+        self.etapas: List[Dict[str, Any]] = []
+        self.faturas: List[Dict[str, Any]] = []
+        if ativo:
+            os.environ[VARIAVEL_AMBIENTE] = "1"
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+
+    @contextlib.contextmanager
+    def etapa(self, nome: str, detalhe: str = None) -> Iterator[None]:
+        """
+        Mede o tempo de relógio, o tempo de CPU e o pico de memória (mede_memoria) do bloco executado
+
+        Args:
+            nome (str): nome da etapa (ex.: "set_distribuidoras")
+            detalhe (str | None): informação adicional (ex.: nome da distribuidora)
+        """
+        if not self.ativo:
+            yield
+            return
+        memoria: Dict[str, float] = {}
+        inicio, inicio_cpu = time.perf_counter(), time.process_time()
+        try:
+            with mede_memoria(memoria):
+                yield
+        finally:
+            self.etapas.append({
+                "nome": nome,
+                "detalhe": detalhe,
+                "tempo_s": time.perf_counter() - inicio,
+                "cpu_s": time.process_time() - inicio_cpu,
+                "pico_tracemalloc_mb": memoria.get("pico_tracemalloc_mb"),
+            })
+
+    def registra_fatura(self, caminho: str, distribuidora: Union[str, None], tempos: Dict[str, float]) -> None:
+        """
+        Registra os tempos e o pico de memória da leitura de uma fatura
+
+        Args:
+            caminho (str): caminho para a fatura
+            distribuidora (str | None): distribuidora identificada
+            tempos (Dict[str, float]): tempos de cada etapa da fatura (abertura, extracao_texto, identificacao, leitura, cpu)
+            e pico_tracemalloc_mb, medido no processo que leu a fatura
+        """
+        if self.ativo:
+            self.faturas.append({"caminho": caminho, "distribuidora": distribuidora, **tempos})
+
+    def relatorio(self, contadores: Dict[str, int] = None, mais_lentas: int = 20) -> Dict[str, Any]:
+        """
+        Monta o relatório com as etapas, o resumo dos tempos das faturas por distribuidora e as faturas mais lentas
+
+        Args:
+            contadores (Dict[str, int] | None): contadores da execução a incluir no relatório
+            mais_lentas (int): quantidade de faturas mais lentas a listar
+
+        Returns:
+            Dict[str, Any]: relatório serializavel em JSON
+        """
+        grupos: Dict[str, List[Dict[str, Any]]] = {}
+        for fatura in self.faturas:
+            grupos.setdefault(str(fatura["distribuidora"]), []).append(fatura)
+        por_distribuidora = {
+            distribuidora: {
+                "quantidade": len(faturas),
+                **{
+                    etapa: _resumo([f[etapa] for f in faturas if etapa in f])
+                    for etapa in ETAPAS_FATURA + ["cpu", "pico_tracemalloc_mb"]
+                },
+            }
+            for distribuidora, faturas in grupos.items()
+        }
+
+        total = lambda f: sum(f.get(etapa, 0.0) for etapa in ETAPAS_FATURA)
+        return {
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "duracao_s": time.perf_counter() - self._inicio,
+            "pico_rss_execucao_mb": pico_memoria_mb(),
+            "pico_rss_execucao_processos_filhos_mb": pico_memoria_mb(filhos=True),
+            "contadores": contadores or {},
+            "etapas": self.etapas,
+            "faturas_por_distribuidora": por_distribuidora,
+            "faturas_mais_lentas": [
+                {"caminho": f["caminho"], "distribuidora": f["distribuidora"], "tempo_s": total(f)}
+                for f in sorted(self.faturas, key=total, reverse=True)[:mais_lentas]
+            ],
+            "faturas": self.faturas,
+        }
+
+    def salva(self, caminho: str, contadores: Dict[str, int] = None) -> None:
+        """
+        Salva o relatório em um arquivo JSON e encerra a medição de memória (encerra), mesmo se a gravação falhar
+
+        Args:
+            caminho (str): caminho para o arquivo json
+            contadores (Dict[str, int] | None): contadores da execução a incluir no relatório
+        """
+        try:
+            with open(caminho, "w", encoding="utf-8") as arquivo:
+                json.dump(self.relatorio(contadores), arquivo, ensure_ascii=False, indent=2, default=str)
+        finally:
+            self.encerra()
+
+    def encerra(self) -> None:
+        """
+        Encerra a medição de memória (tracemalloc) e remove a variavel de ambiente dos processos de leitura
+        """
+        if self.ativo:
+            os.environ.pop(VARIAVEL_AMBIENTE, None)
+            if tracemalloc.is_tracing():
+                tracemalloc.stop()
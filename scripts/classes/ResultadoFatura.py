@@ -0,0 +1,133 @@
+import numpy as np
+from typing import Dict, Optional
+from pandas import DataFrame
+from scripts.classes.Fatura import Fatura
+
+
+class ResultadoFatura:
+    """
+    Dados extraídos de uma fatura, sem o texto do PDF. É o que volta da leitura (em série ou nos processos de leitura)
+    e possui os mesmos atributos usados de uma Fatura após o main() (nome, consumo, demanda...)
+    Usa __slots__ e guarda o histórico como arrays do numpy (uma por coluna), assim o texto das páginas é descartado
+    logo após a leitura de cada fatura e só os dados extraídos ficam em memória até a gravação
+
+    Args:
+        caminho (str): O caminho para o arquivo PDF da fatura.
+        distribuidora (str): Nome da distribuidora (nome da classe que leu a fatura)
+        nome (str): Nome do cliente
+        consumo e demanda (DataFrame): Tabelas de (consumos | demandas) registrados no histórico
+        medida_demanda e medida_consumo (str): Descricao da unidade de medida da (consumo | demanda)
+        ths (str): Descricao da tarifa horosazonal do cliente
+        tempos (Dict[str, float]): Tempos (s) de abertura, extração de texto, identificação e leitura da fatura
+        erro (str | None): Erro inesperado na leitura da fatura (tipo e mensagem), None se a leitura não gerou erro
+
+    Attributes:
+        uc (str): Unidade consumidora, nome do arquivo PDF sem a extensão
+        consumo e demanda (DataFrame): Tabelas montadas a partir das arrays a cada acesso (podem ser alteradas sem afetar o resultado)
+    """
+
+    __slots__ = (
+        "caminho", "distribuidora", "nome", "medida_consumo", "medida_demanda", "ths", "tempos", "erro", "_consumo", "_demanda"
+    )
+
+    def __init__(
+            self,
+            caminho: str,
+            distribuidora: str,
+            nome: str = None,
+            consumo: DataFrame = None,
+            demanda: DataFrame = None,
+            medida_consumo: str = None,
+            medida_demanda: str = None,
+            ths: str = None,
+            tempos: Dict[str, float] = None,
+            erro: str = None
+            ) -> None:
+        self.caminho = caminho
+        self.distribuidora = distribuidora
+        self.nome = nome
+        self.consumo = consumo
+        self.demanda = demanda
+        self.medida_consumo = medida_consumo
+        self.medida_demanda = medida_demanda
+        self.ths = ths
+        self.tempos = tempos or {}
+        self.erro = erro
+
+    @classmethod
+    def de_fatura(cls, fatura: Fatura) -> "ResultadoFatura":
+        """
+        Copia os dados extraídos de uma Fatura, descartando o texto do PDF
+
+        Args:
+            - fatura (Fatura): fatura da distribuidora, ja processada pelo main() quando suportada
+
+        Returns:
+            - ResultadoFatura: dados extraídos da fatura
+        """
+        return cls(
+            caminho=fatura.caminho,
+            distribuidora=fatura.distribuidora,
+            nome=fatura.nome,
+            consumo=fatura.consumo,
+            demanda=fatura.demanda,
+            medida_consumo=fatura.medida_consumo,
+            medida_demanda=fatura.medida_demanda,
+            ths=fatura.ths,
+            tempos=fatura.tempos
+        )
+
+    @classmethod
+    def de_erro(cls, caminho: str, erro: Exception) -> "ResultadoFatura":
+        """
+        Resultado de uma fatura cuja leitura gerou um erro inesperado (sem distribuidora e sem dados)
+
+        Args:
+            - caminho (str): O caminho para o arquivo PDF da fatura.
+            - erro (Exception): erro gerado na leitura
+
+        Returns:
+            - ResultadoFatura: resultado com o erro (tipo e mensagem)
+        """
+        return cls(caminho=caminho, distribuidora=None, erro=f"{type(erro).__name__}: {erro}")
+
+    @property
+    def uc(self) -> str:
+        return self.caminho.split("\\")[-1][:-4]
+
+    @property
+    def consumo(self) -> Optional[DataFrame]:
+        return tabela(self._consumo)
+
+    @consumo.setter
+    def consumo(self, consumo: Optional[DataFrame]) -> None:
+        self._consumo = colunas(consumo)
+
+    @property
+    def demanda(self) -> Optional[DataFrame]:
+        return tabela(self._demanda)
+
+    @demanda.setter
+    def demanda(self, demanda: Optional[DataFrame]) -> None:
+        self._demanda = colunas(demanda)
+
+    def __repr__(self) -> str:
+        return f"ResultadoFatura(distribuidora={self.distribuidora!r}, nome={self.nome!r}, caminho={self.caminho!r})"
+
+
+def colunas(df: Optional[DataFrame]) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Converte o DataFrame em uma array do numpy por coluna (mantendo os tipos e a ordem das colunas), None se não houver tabela
+    """
+    if df is None:
+        return None
+    return {coluna: df[coluna].to_numpy(copy=True) for coluna in df.columns}
+
+
+def tabela(arrays: Optional[Dict[str, np.ndarray]]) -> Optional[DataFrame]:
+    """
+    Monta um novo DataFrame a partir das arrays de cada coluna (inverso de colunas), None se não houver tabela
+    """
+    if arrays is None:
+        return None
+    return DataFrame(arrays)
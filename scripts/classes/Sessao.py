@@ -0,0 +1,134 @@
+import logging
+import sqlite3
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+# o pandas só é importado ao inserir um DataFrame, consultas simples (ex.: cli.py stats) não pagam a importação
+if TYPE_CHECKING:
+    from pandas import DataFrame
+
+logger = logging.getLogger(__name__)
+
+class Sessao:
+    """
+    Conexão única com o banco de dados durante toda a execução.
+    Aplica os pragmas de desempenho ao conectar. As gravações não são confirmadas a cada inserção: quem usa a sessão
+    confirma (commit) ao final de cada etapa (ex.: a cada lote de faturas, ver main.ingere_faturas) ou desfaz (rollback) a etapa com erro;
+    ao sair do with, o que estiver pendente é confirmado, ou desfeito se ocorrer algum erro
+
+    Args:
+        db_path (str): caminho para o banco de dados
+
+    Attributes:
+        conn (sqlite3.Connection): conexão com o banco de dados
+
+    Exemplo:
+        with Sessao(db_path) as sessao:
+            clientes = get_clientes_existentes(sessao)
+    """
+
+    PRAGMAS: Dict[str, Any] = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,  # 64 MB
+        "mmap_size": 268435456,  # 256 MB
+        "temp_store": "MEMORY",
+    }
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        for pragma, valor in self.PRAGMAS.items():
+            self.conn.execute(f"PRAGMA {pragma} = {valor}")
+        self._chaves_unicas = set()
+
+    def __enter__(self) -> "Sessao":
+        return self
+
+    def __exit__(self, tipo, *args) -> None:
+        if tipo is None:
+            self.commit()
+        else:
+            self.rollback()
+        self.fechar()
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def rollback(self) -> None:
+        """
+        Desfaz a transação atual, inclusive os indices unicos criados nela (que precisam ser verificados novamente)
+        """
+        self.conn.rollback()
+        self._chaves_unicas.clear()
+
+    def fechar(self) -> None:
+        self.conn.close()
+
+    def tabela_existe(self, tabela: str) -> bool:
+        cursor = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name = ?", (tabela,))
+        return cursor.fetchone() is not None
+
+    def garante_chave_unica(self, tabela: str, colunas: List[str]) -> int:
+        """
+        Cria um indice UNIQUE nas colunas da tabela, caso ainda não exista.
+        Ao criar o indice em uma tabela ja existente, as linhas repetidas nas colunas da chave são removidas
+        (mantem a primeira gravada), pois o sqlite não cria o indice com valores repetidos.
+        A quantidade de linhas removidas é registrada (logging) e retornada
+
+        Args:
+            tabela (str): nome da tabela
+            colunas (List[str]): colunas que formam a chave unica
+
+        Returns:
+            int: quantidade de linhas repetidas removidas (0 se o indice ja existia)
+        """
+        indice = f"ux_{tabela}_{'_'.join(colunas)}".lower()
+        if indice in self._chaves_unicas:
+            return 0
+        removidas = 0
+        cursor = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name = ?", (indice,))
+        if cursor.fetchone() is None:
+            chave = ", ".join(f'"{coluna}"' for coluna in colunas)
+            cursor = self.conn.execute(
+                f'DELETE FROM "{tabela}" WHERE rowid NOT IN (SELECT MIN(rowid) FROM "{tabela}" GROUP BY {chave})'
+            )
+            removidas = max(cursor.rowcount, 0)
+            if removidas:
+                logger.warning("%d linha(s) repetida(s) em %s (%s) removida(s) ao criar a chave unica", removidas, tabela, chave)
+            self.conn.execute(f'CREATE UNIQUE INDEX "{indice}" ON "{tabela}" ({chave})')
+        self._chaves_unicas.add(indice)
+        return removidas
+
+    def insere(self, df: "DataFrame", tabela: str, chave: Optional[List[str]] = None) -> None:
+        """
+        Insere as linhas do DataFrame na tabela (criando a tabela se ainda não existir), sem confirmar a transação
+        (diferente do DataFrame.to_sql, que faz um commit a cada chamada)
+        Com a chave informada, as linhas que ja existem na tabela (mesma chave) são ignoradas pelo proprio banco
+        (INSERT ... ON CONFLICT DO NOTHING), sem precisar ler a tabela para comparar
+
+        Args:
+            df (DataFrame): dados a inserir, as colunas devem ter os mesmos nomes das colunas da tabela
+            tabela (str): nome da tabela
+            chave (List[str] | None): colunas da chave unica da tabela
+        """
+        import pandas as pd
+        if not self.tabela_existe(tabela):
+            self.conn.execute(pd.io.sql.get_schema(df, tabela, con=self.conn))
+        conflito = ""
+        if chave is not None:
+            self.garante_chave_unica(tabela, chave)
+            conflito = " ON CONFLICT DO NOTHING"
+        colunas = ", ".join(f'"{coluna}"' for coluna in df.columns)
+        valores = ", ".join("?" * len(df.columns))
+        self.conn.executemany(f'INSERT INTO "{tabela}" ({colunas}) VALUES ({valores}){conflito}', linhas(df))
+
+
+def linhas(df: "DataFrame") -> List[tuple]:
+    """
+    Converte o DataFrame em uma lista de tuplas com tipos nativos do python (NaN/NaT => None, datas => texto como no to_sql),
+    para uso com executemany
+    """
+    df = df.copy()
+    for coluna in df.select_dtypes(include=["datetime", "datetimetz"]).columns:
+        df[coluna] = df[coluna].dt.strftime("%Y-%m-%d %H:%M:%S")
+    return list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
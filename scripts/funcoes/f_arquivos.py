@@ -0,0 +1,84 @@
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Iterable, Iterator, Optional, Tuple
+from scripts.classes.Documento import LIMITE_ARQUIVO_GRANDE
+
+# threads que leem os arquivos antecipadamente (leitura de rede/disco em paralelo com a extração de texto)
+THREADS_PRE_CARGA: int = 8
+
+
+def varre_pasta(PATH: str) -> Iterator[os.DirEntry]:
+    """
+    Gera os arquivos da pasta, um por vez, com os.scandir: o tamanho e a data de modificação vem junto da listagem
+    (entrada.stat() não acessa o disco novamente no windows, e no linux só acessa uma vez por arquivo)
+    O stat de cada arquivo é obtido na listagem e fica guardado na entrada, os arquivos removidos durante a listagem são ignorados
+
+    Args:
+        - PATH (str): caminho para os pdfs
+
+    Returns:
+        - Iterator[os.DirEntry]: arquivos da pasta (as subpastas são ignoradas)
+    """
+    with os.scandir(PATH) as entradas:
+        for entrada in entradas:
+            if entrada.is_file():
+                try:
+                    entrada.stat()
+                except OSError:
+                    continue
+                yield entrada
+
+
+def le_conteudo(entrada: os.DirEntry) -> Optional[bytes]:
+    """
+    Lê o conteudo do arquivo para a memória
+
+    Args:
+        - entrada (os.DirEntry): arquivo, de varre_pasta
+
+    Returns:
+        - bytes | None: conteudo do arquivo, None para os arquivos grandes (lidos depois em modo mmap, sem carregar na memória)
+        ou se a leitura falhar: o arquivo é lido novamente no hash do cache ou na leitura da fatura, e o erro vai para as falhas
+        do lote (motivo no diário), sem interromper a execução (ver main.set_distribuidoras)
+    """
+    try:
+        if entrada.stat().st_size >= LIMITE_ARQUIVO_GRANDE:
+            return None
+        with open(entrada.path, "rb") as arquivo:
+            return arquivo.read()
+    except OSError:
+        return None
+
+
+def pre_carrega(
+        entradas: Iterable[os.DirEntry],
+        threads: int = THREADS_PRE_CARGA,
+        adiantados: int = 200
+        ) -> Iterator[Tuple[os.DirEntry, Optional[bytes]]]:
+    """
+    Lê o conteudo dos arquivos antecipadamente com algumas threads, mantendo a ordem das entradas,
+    para que a latência da rede (pasta mapeada) ocorra em paralelo com a extração de texto das faturas
+    No maximo `adiantados` arquivos ficam lidos (ou sendo lidos) a frente do consumidor, limitando a memória usada
+
+    Args:
+        - entradas (Iterable[os.DirEntry]): arquivos, de varre_pasta
+        - threads (int): quantidade de threads de leitura, 0 não lê antecipadamente (o conteudo é sempre None)
+        - adiantados (int): quantidade maxima de arquivos lidos a frente do consumidor
+
+    Returns:
+        - Iterator[Tuple[os.DirEntry, bytes | None]]: cada arquivo e o seu conteudo (ver le_conteudo)
+    """
+    if threads <= 0:
+        yield from ((entrada, None) for entrada in entradas)
+        return
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        fila: Deque = deque()
+        for entrada in entradas:
+            fila.append((entrada, executor.submit(le_conteudo, entrada)))
+            if len(fila) >= max(1, adiantados):
+                entrada, futuro = fila.popleft()
+                yield entrada, futuro.result()
+        while fila:
+            entrada, futuro = fila.popleft()
+            yield entrada, futuro.result()
@@ -0,0 +1,136 @@
+import pickle
+import logging
+import sqlite3
+from typing import Dict, Iterable, List, Union
+from scripts.classes.Sessao import Sessao
+from scripts.classes.Fatura import VERSAO_PARSER
+from scripts.classes.Extrator import get_extrator
+from scripts.classes.ResultadoFatura import ResultadoFatura
+from scripts.funcoes.f_distribuidoras import assinatura_catalogo
+
+TABELA_CACHE = "cache_faturas"
+
+logger = logging.getLogger(__name__)
+
+
+def get_versao_extrator() -> str:
+    """
+    Returns:
+        - str: nome e versão do extrator de texto da execução (ex.: "PyPDF2-3.0.1"), parte da chave do cache,
+        o mesmo pdf lido com outro extrator (ou outra versão da biblioteca) pode ter outro resultado
+    """
+    return get_extrator().versao()
+
+
+def cria_tabela_cache(conn: sqlite3.Connection) -> None:
+    """
+    Cria a tabela do cache de faturas ja lidas, caso ainda não exista
+    A tabela de um formato anterior (sem as colunas extrator e catalogo) é descartada, os pdfs são lidos novamente
+
+    Args:
+        - conn (Connection): conexao com o banco de dados
+    """
+    colunas = [coluna[1] for coluna in conn.execute(f"PRAGMA table_info({TABELA_CACHE})")]
+    if colunas and not {"extrator", "catalogo"} <= set(colunas):
+        conn.execute(f"DROP TABLE {TABELA_CACHE}")
+    conn.execute(
+        f"""CREATE TABLE IF NOT EXISTS {TABELA_CACHE} (
+            hash TEXT NOT NULL,
+            versao INTEGER NOT NULL,
+            extrator TEXT NOT NULL,
+            catalogo TEXT NOT NULL,
+            distribuidora TEXT,
+            nome TEXT,
+            ths TEXT,
+            medida_consumo TEXT,
+            medida_demanda TEXT,
+            consumo BLOB,
+            demanda BLOB,
+            PRIMARY KEY (hash, versao, extrator, catalogo)
+        )"""
+    )
+
+
+def get_resultados_em_cache(sessao: Sessao, hashes: Iterable[str]) -> Dict[str, Union[ResultadoFatura, None]]:
+    """
+    Obtem do banco de dados os resultados ja extraídos das faturas com os hashes informados,
+    na versão atual dos leitores, com o extrator de texto da execução e com o catalogo atual de distribuidoras
+    (assinatura_catalogo: uma fatura não identificada é identificada novamente após declarar uma nova distribuidora)
+    Faturas que não puderam ser lidas/identificadas ficam no cache como None
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+        - hashes (Iterable[str]): hashes dos arquivos pdf
+
+    Returns:
+        - Dict[str, ResultadoFatura | None]: relação hash <-> resultado, apenas para os hashes encontrados no cache
+        (o caminho do resultado fica None, e deve ser preenchido com o caminho atual do arquivo)
+    """
+    hashes: List[str] = list(set(hashes))
+    resultados: Dict[str, Union[ResultadoFatura, None]] = {}
+    if not hashes:
+        return resultados
+    extrator, catalogo = get_versao_extrator(), assinatura_catalogo()
+    cria_tabela_cache(sessao.conn)
+    for i in range(0, len(hashes), 500):
+        lote = hashes[i: i + 500]
+        cursor = sessao.conn.execute(
+            f"""SELECT hash, distribuidora, nome, ths, medida_consumo, medida_demanda, consumo, demanda
+            FROM {TABELA_CACHE}
+            WHERE versao = ? AND extrator = ? AND catalogo = ? AND hash IN ({", ".join("?" * len(lote))})""",
+            [VERSAO_PARSER, extrator, catalogo, *lote]
+        )
+        for _hash, distribuidora, nome, ths, medida_consumo, medida_demanda, consumo, demanda in cursor.fetchall():
+            resultados[_hash] = None if distribuidora is None else ResultadoFatura(
+                caminho=None,
+                distribuidora=distribuidora,
+                nome=nome,
+                consumo=pickle.loads(consumo) if consumo is not None else None,
+                demanda=pickle.loads(demanda) if demanda is not None else None,
+                medida_consumo=medida_consumo,
+                medida_demanda=medida_demanda,
+                ths=ths
+            )
+    return resultados
+
+
+def salva_resultados_em_cache(sessao: Sessao, resultados: Dict[str, Union[ResultadoFatura, None]]) -> bool:
+    """
+    Salva os resultados extraídos das faturas no cache, na versão atual dos leitores, com o extrator de texto da execução
+    e com o catalogo atual de distribuidoras (na transação da sessão)
+    Um erro do banco de dados na gravação é registrado (logging) sem interromper a leitura:
+    os resultados não gravados são lidos novamente na proxima execução
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+        - resultados (Dict[str, ResultadoFatura | None]): relação hash <-> resultado (None = fatura não lida/identificada)
+
+    Returns:
+        - bool: status de sucesso ou falha na insercao dos novos valores
+    """
+    if not resultados:
+        return True
+    extrator, catalogo = get_versao_extrator(), assinatura_catalogo()
+    linhas = [
+        (_hash, VERSAO_PARSER, extrator, catalogo, None, None, None, None, None, None, None) if resultado is None else (
+            _hash,
+            VERSAO_PARSER,
+            extrator,
+            catalogo,
+            resultado.distribuidora,
+            resultado.nome,
+            resultado.ths,
+            resultado.medida_consumo,
+            resultado.medida_demanda,
+            pickle.dumps(resultado.consumo) if resultado.consumo is not None else None,
+            pickle.dumps(resultado.demanda) if resultado.demanda is not None else None,
+        )
+        for _hash, resultado in resultados.items()
+    ]
+    try:
+        cria_tabela_cache(sessao.conn)
+        sessao.conn.executemany(f"INSERT OR REPLACE INTO {TABELA_CACHE} VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", linhas)
+    except sqlite3.Error as erro:
+        logger.warning("Cache de faturas não gravado (%d faturas): %s: %s", len(linhas), type(erro).__name__, erro)
+        return False
+    return True
@@ -0,0 +1,15 @@
+from typing import List
+
+# valores padrão da execução, em um modulo sem dependências para que a linha de comando (cli.py) não importe o pandas
+
+# banco de dados com os clientes, consumos, diário e cache das faturas lidas
+CAMINHO_BANCO: str = r".\leitor_pdf\banco_de_dados\distribuidoras.db"
+# pasta padrão das exportações (csv/parquet) lidas pela previsão de consumo (ARIMA)
+PASTA_EXPORTACAO: str = r"q:\0. PASTAS PESSOAIS\MATEUS COLAÇO\MODELOS\ARIMA\previsao_consumo_arima\distribuidoras"
+FORMATOS_EXPORTACAO: List[str] = ["csv", "parquet"]
+# faturas gravadas (e confirmadas no banco) por vez, None = todas as faturas em uma unica transação
+TAMANHO_LOTE: int = 200
+# pasta do cache de textos extraídos dos pdfs e limites da limpeza do cache ao final de cada execução
+PASTA_CACHE_TEXTOS: str = r".\leitor_pdf\cache_textos"
+IDADE_MAXIMA_CACHE_TEXTOS_DIAS: float = 180
+TAMANHO_MAXIMO_CACHE_TEXTOS_MB: float = 2048
@@ -0,0 +1,121 @@
+import re
+import logging
+import numpy as np
+import pandas as pd
+from pandas import Series
+from typing import Dict, Union
+
+logger = logging.getLogger(__name__)
+
+MESES: Dict[str, int] = {
+    "jan": 1,
+    "fev": 2,
+    "mar": 3,
+    "abr": 4,
+    "mai": 5,
+    "jun": 6,
+    "jul": 7,
+    "ago": 8,
+    "set": 9,
+    "out": 10,
+    "nov": 11,
+    "dez": 12,
+}
+
+# remove o separador de milhar e troca o separador decimal por ponto, de acordo com o separador decimal
+TRADUCOES_NUMERO: Dict[str, Dict[int, Union[str, None]]] = {
+    ",": str.maketrans({".": None, ",": ".", " ": None}),
+    ".": str.maketrans({",": None, " ": None}),
+}
+
+# mês (nome ou numero) => numero do mês, nomes pelas 3 primeiras letras
+MESES_TEXTO: Dict[str, int] = {**MESES, **{str(n): n for n in range(1, 13)}, **{f"{n:02d}": n for n in range(1, 13)}}
+
+# mês (3 primeiras letras do nome, ou numero) no inicio do texto e ano (4 ou 2 digitos) no final, como na leitura antiga
+# (mes = texto[:3], ano = texto[-4:] ou texto[-2:]), o que estiver entre os dois é ignorado ('jan/2023', 'janeiro de 2023')
+PADRAO_DATA = re.compile(r"^\s*(?P<mes>[a-zç]{3}|\d{1,2}).*?(?P<ano>\d{4}|\d{2})\s*$")
+
+
+def datas_invalidas(datas: Series) -> Series:
+    """
+    Obtem as datas que não podem ser convertidas por converte_datas (valores vazios não são considerados invalidos)
+
+    Args:
+        - datas (Series): datas em texto
+
+    Returns:
+        - Series: valores originais que não foram reconhecidos, com o mesmo indice da Series original
+    """
+    convertidas = converte_datas(datas, erros="coerce")
+    return datas[convertidas.isna() & datas.notna()]
+
+
+def converte_datas(datas: Series, erros: str = "raise") -> Series:
+    """
+    Converte de uma vez todas as datas em texto da Series ('jan/2023', 'jan/23', 'janeiro 2023', '01/2023', '01/23')
+    para datetime64, no primeiro dia do mês. Anos com 2 digitos seguem o padrão do %y (00-68 => 20xx, 69-99 => 19xx)
+    O mês e o ano são separados pelo Series.str.extract (PADRAO_DATA), o mês é convertido pelo Series.map (MESES_TEXTO)
+    e a conversão para datetime64 é feita com operações do numpy na coluna inteira (meses desde 1970),
+    sem chamar o pd.to_datetime para cada valor
+
+    Args:
+        - datas (Series): datas em texto
+        - erros (str): "raise" (padrão, como a leitura antiga, que gerava um erro na primeira data invalida) gera um ValueError
+        com todas as datas não reconhecidas, "coerce" as transforma em NaT
+
+    Returns:
+        - Series: datas convertidas (datetime64), com o mesmo indice e nome da Series original
+    """
+    partes = datas.astype("string").str.lower().str.extract(PADRAO_DATA)
+    mes = partes["mes"].map(MESES_TEXTO).fillna(0).to_numpy(dtype=np.int64)
+    ano = pd.to_numeric(partes["ano"]).fillna(0).to_numpy(dtype=np.int64)
+    ano_curto = (partes["ano"].str.len() == 2).fillna(False).to_numpy(dtype=bool)
+    ano = np.where(ano_curto, ano + 2000 - 100 * (ano >= 69), ano)
+
+    convertidas = ((ano - 1970) * 12 + mes - 1).astype("datetime64[M]").astype("datetime64[ns]")
+    convertidas[mes == 0] = np.datetime64("NaT")
+    convertidas = pd.Series(convertidas, index=datas.index, name=datas.name)
+    if erros == "raise":
+        invalidas = datas[convertidas.isna() & datas.notna()]
+        if not invalidas.empty:
+            raise ValueError(f"Datas não reconhecidas: {invalidas.to_list()}")
+    return convertidas
+
+
+def _limpa_numeros(valores: Series, decimal: str) -> Series:
+    """
+    Remove os espaços e o separador de milhar e troca o separador decimal por ponto, com os metodos vetorizados do Series.str
+    (valores que não são texto, ex.: ja numericos, são mantidos)
+    """
+    try:
+        return valores.str.strip().str.translate(TRADUCOES_NUMERO[decimal]).fillna(valores)
+    except AttributeError:  # nenhum valor em texto
+        return valores
+
+
+def converte_numeros(valores: Series, decimal: str = ",", erros: str = "coerce") -> Series:
+    """
+    Converte de uma vez todos os numeros em texto da Series para float64, no padrão brasileiro por padrão ('1.234,56' => 1234.56)
+    Cada texto é limpo pelo Series.str (strip e translate: remove o separador de milhar e troca o decimal por ponto)
+    e a conversão é feita pelo pd.to_numeric na coluna inteira
+
+    Args:
+        - valores (Series): numeros em texto (valores ja numericos são mantidos)
+        - decimal (str): separador decimal, "," ('1.234,56') ou "." ('1,234.56')
+        - erros (str): "coerce" transforma os valores não reconhecidos em NaN, como o pd.to_numeric(errors="coerce") usado
+        antes pelos leitores (na tabela de consumos os NaN viram -1), e registra um aviso (logging) com a quantidade e os valores;
+        "raise" gera um ValueError com os valores não reconhecidos
+
+    Returns:
+        - Series: valores convertidos (float64), com o mesmo indice e nome da Series original
+    """
+    limpos = _limpa_numeros(valores, decimal)
+    convertidos = pd.to_numeric(limpos, errors="coerce").astype(np.float64)
+    invalidos = valores[convertidos.isna() & limpos.notna() & limpos.ne("")]
+    if not invalidos.empty:
+        if erros == "raise":
+            raise ValueError(f"Numeros não reconhecidos: {invalidos.to_list()}")
+        logger.warning(
+            "%d numero(s) não reconhecido(s) em %s, convertido(s) em NaN: %s", len(invalidos), valores.name, invalidos.to_list()
+        )
+    return convertidos
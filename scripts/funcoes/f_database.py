@@ -1,26 +1,35 @@
-import sqlite3
 import pandas as pd
 from uuid import uuid4
-from datetime import datetime
 from pandas import Series, DataFrame
+from typing import Iterable, List, Optional
+from scripts.classes.Sessao import Sessao
+from scripts.funcoes.f_conversoes import converte_datas, converte_numeros
+
+# chaves unicas das tabelas, a deduplicação dos dados é feita pelo banco ao inserir
+CHAVE_CLIENTES: List[str] = ["nome", "uc"]
+CHAVE_CONSUMOS: List[str] = ["cliente_id", "competencia"]
+# colunas da tabela consumos (ver f_esquema)
+COLUNAS_CONSUMOS: List[str] = [
+    "cliente_id", "distribuidora", "competencia", "consumo_ponta", "consumo_fora_de_ponta",
+    "demanda_ponta", "demanda_fora_de_ponta", "medida_consumo", "medida_demanda"
+]
 
 ##############
 ## CLIENTES ##
 ##############
-def adiciona_novos_clientes(df: DataFrame, db_path: str):
+def adiciona_novos_clientes(df: DataFrame, sessao: Sessao):
     """
     Args:
         - df (DataFrame): Tabela com os dados de cliente|distribuidora|uc
-        - db_path (str): Caminho para o arquivo .db
+        - sessao (Sessao): Conexão com o banco de dados
 
     Returns:
         - bool: Status do script (True => Funcionou || False => Erro)
     """
     clientes = adiciona_novo_id_clientes(df)
-    clientes_existentes = get_clientes_existentes(db_path)
-    novos_clientes = mantem_novos_clientes(clientes, clientes_existentes, col="nome")
-    if not(novos_clientes.empty):
-        salva_novos_clientes(ucs_nova=novos_clientes, db_path=db_path)
+    if not(clientes.empty):
+        return salva_novos_clientes(ucs_nova=clientes, sessao=sessao)
+    return True
 
 
 def adiciona_novo_id_clientes(ucs_nova: DataFrame) -> DataFrame:
@@ -42,20 +51,25 @@ def adiciona_novo_id_clientes(ucs_nova: DataFrame) -> DataFrame:
     return ucs_nova
 
 
-def get_clientes_existentes(db_path: str) -> DataFrame:
+def get_clientes_existentes(sessao: Sessao, nomes: Optional[Iterable[str]] = None) -> DataFrame:
     """
     Obtem os clientes ja adicionados ao banco de dados com seus respectivos ids
 
     Args:
-        - db_path (str): caminho para o arquivo .db
+        - sessao (Sessao): Conexão com o banco de dados
+        - nomes (Iterable[str] | None): se informado, obtem apenas os clientes com estes nomes (busca pelo indice da chave unica)
 
     Returns:
         - DataFrame: Tabela com os dados obtidos do banco
     """
-    conn = sqlite3.connect(db_path)
-    df = pd.read_sql("SELECT * FROM clientes", conn)
-    conn.close()
-    return df
+    if nomes is None:
+        return pd.read_sql("SELECT * FROM clientes", sessao.conn)
+    nomes: List[str] = list(set(nomes))
+    lotes = [
+        pd.read_sql(f"SELECT * FROM clientes WHERE nome IN ({', '.join('?' * len(lote))})", sessao.conn, params=lote)
+        for lote in (nomes[i: i + 500] for i in range(0, len(nomes), 500))
+    ]
+    return pd.concat(lotes, ignore_index=True) if lotes else pd.read_sql("SELECT * FROM clientes WHERE 0", sessao.conn)
 
 
 def mantem_novos_clientes(novos_clientes: DataFrame, clientes_existentes: DataFrame, col: str) -> DataFrame:
@@ -74,124 +88,73 @@ def mantem_novos_clientes(novos_clientes: DataFrame, clientes_existentes: DataFr
     return novos_clientes[~novos_clientes[col].isin(nomes_db)].reset_index(drop=True)
 
 
-def salva_novos_clientes(ucs_nova: DataFrame, db_path: str) -> bool:
+def salva_novos_clientes(ucs_nova: DataFrame, sessao: Sessao) -> bool:
     """
-    Adiciona os novos clientes com seus respectivos ids ao banco
+    Adiciona os novos clientes com seus respectivos ids ao banco (na transação da sessão)
+    Os clientes que ja existem no banco (mesmo nome e uc) são ignorados e mantem o id original
 
     Args:
         - ucs_nova (DataFrame): clientes com ids obtidos apos a funcao adiciona_novo_id_clientes
-        - db_path (str): caminho para o banco de dados
+        - sessao (Sessao): Conexão com o banco de dados
 
     Returns:
-        - bool: status de sucesso ou falha na insercao dos novos valores
+        - bool: True, um erro na inserção é propagado (para desfazer o lote inteiro, ver main.ingere_faturas)
     """
-    try:
-        conn = sqlite3.connect(db_path)
-        ucs_nova.drop_duplicates(["nome", "uc"])[["id", "distribuidora", "nome", "uc"]].to_sql("clientes", conn, index=False, if_exists="append")
-        conn.close()
-        return True
-    except Exception:
-        return False
+    sessao.insere(ucs_nova.drop_duplicates(CHAVE_CLIENTES)[["id", "distribuidora", "nome", "uc"]], "clientes", chave=CHAVE_CLIENTES)
+    return True
 
 ##############
 ## CONSUMOS ##
 ##############
-def adiciona_novos_consumos(df: DataFrame, dist: str, db_path: str):
+def adiciona_novos_consumos(df: DataFrame, dist: str, sessao: Sessao):
     """
     Processa os dados para salva-los no banco 
 
     Args:
         - df (DataFrame): consumos obtidos da leitura do pdf
-        - db_path (str): caminho para o banco de dados
+        - sessao (Sessao): Conexão com o banco de dados
         - dist (str): nome da distribuidora
 
     Returns:
     """
 
-    clientes = get_clientes_existentes(db_path)
-    novos_consumos = criar_id_consumos(df_id=clientes, df_consumo=df.drop_duplicates(subset=["nome", "uc", "datas"]))
+    clientes = get_clientes_existentes(sessao, nomes=df.nome)
+    novos_consumos = criar_consumos(df_clientes=clientes, df_consumo=df.drop_duplicates(subset=["nome", "uc", "datas"]))
     
-    consumos_existentes = get_consumos_existentes(db_path, dist)
-    novos_consumos_filtrados = mantem_novos_consumos(novos_consumos=novos_consumos, consumos_existentes=consumos_existentes)
-    
-    if not(novos_consumos_filtrados.empty):
-        salva_novos_consumos(novos_consumos_filtrados, db_path, dist)
+    if not(novos_consumos.empty):
+        salva_novos_consumos(novos_consumos, sessao, dist)
 
 
-def criar_id_consumos(df_id: DataFrame, df_consumo: DataFrame) -> DataFrame:
+def criar_consumos(df_clientes: DataFrame, df_consumo: DataFrame) -> DataFrame:
     """
-    Cria coluna de id para nao gravar dados repetidos de consumo por cliente
+    Monta as linhas da tabela consumos: id inteiro do cliente (cliente_id) e competencia (primeiro dia do mês, AAAA-MM-01)
     Args:
-        - df_id (DataFrame): tabela com os ids originais
+        - df_clientes (DataFrame): tabela com os clientes do banco de dados (com a coluna cliente_id)
         - df_consumo (DataFrame): tabela com os consumos obtidos dos pdfs
 
     Returns:
-        - DataFrame: tabela com os novos ids gerados a partir das datas e ids originais
-    """
-    df = df_id.merge(df_consumo, on=["nome", "uc", "distribuidora"])
-    df["id_datas"] = df["id"] + "-" + df["datas"].dt.strftime("%m%Y")
-    try:
-        return df.drop(columns=["nome", "id", "datas", "uc", "distribuidora", "ths"])
-    except KeyError:
-        return df.drop(columns=["nome", "id", "datas", "uc", "distribuidora"])
-
-
-
-def get_consumos_existentes(db_path: str, distribuidora: str) -> DataFrame:
-    """
-    Le o banco de dados e obtem as informacoes de consumo
-
-    Args:
-        - db_path (str): Caminho para o arquivo .db
-        - distribuidora (str): nome da distribuidora/tabela do banco
-        
-    Returns:
-        - DataFrame: DataFrame obtido do banco de dados
+        - DataFrame: tabela com as colunas da tabela consumos
     """
-    conn = sqlite3.connect(db_path)
-    consumos = pd.read_sql(f"SELECT * FROM {distribuidora}", conn)
-    conn.close()
-    return consumos
+    df = df_clientes.merge(df_consumo, on=["nome", "uc", "distribuidora"])
+    df["competencia"] = df["datas"].dt.strftime("%Y-%m-01")
+    return df.reindex(columns=COLUNAS_CONSUMOS)
 
 
-def mantem_novos_consumos(
-    novos_consumos: DataFrame, consumos_existentes: DataFrame
-) -> DataFrame:
+def salva_novos_consumos(novos_consumos: DataFrame, sessao: Sessao, dist: str) -> bool:
     """
-    Filtra os consumos ja adicionados, e retorna apenas os consumos necessarios para insercao no banco de dados
+    salva os novos consumos com seus respectivos ids ao banco (na transação da sessão)
+    Os consumos que ja existem no banco (mesmo cliente e competencia) são ignorados pelo proprio banco
 
     Args:
-        - novos_consumos (DataFrame): Tabela com os dados de consumo obtidos dos pdfs
-        - consumos_existentes (DataFrame): Tabela com os dados de consumo obtidos do banco de dados
-
-    Return:
-        - DataFrame: Tabela apenas com os dados de consumo que nao estao presentes no banco de dados
-    """
-    id_col = "id_datas"
-    ids = consumos_existentes[id_col]
-    return novos_consumos[~novos_consumos[id_col].isin(ids)]
-
-
-def salva_novos_consumos(novos_consumos: DataFrame, db_path: str, dist: str) -> bool:
-    """
-    salva os novos consumos com seus respectivos ids ao banco
-
-    Args:
-        - novos_consumos (DataFrame): consumos ainda nao adicionados ao banco
-        - db_path (str): caminho para o banco de dados
+        - novos_consumos (DataFrame): consumos ainda nao adicionados ao banco, com as colunas da tabela consumos (ver criar_consumos)
+        - sessao (Sessao): Conexão com o banco de dados
         - dist (str): nome da distribuidora
 
     Returns:
-        - bool: status de sucesso ou falha na insercao dos novos valores
+        - bool: True, um erro na inserção é propagado (para desfazer o lote inteiro, ver main.ingere_faturas)
     """
-
-    try:
-        conn = sqlite3.connect(db_path)
-        novos_consumos.to_sql(dist, conn, index=False, if_exists="append")
-        conn.close()
-        return True
-    except Exception:
-        return False
+    sessao.insere(novos_consumos.assign(distribuidora=dist), "consumos", chave=CHAVE_CONSUMOS)
+    return True
 
 ############
 ## OUTROS ##
@@ -206,8 +169,7 @@ def arruma_decimal(coluna: Series) -> Series:
     Returns:
         - Series: Uma nova coluna com vírgulas substituídas por pontos e convertida para float.
     """
-    coluna = coluna.str.replace(".", "", regex=False)
-    return coluna.str.replace(",", ".", regex=False).astype(float)
+    return converte_numeros(coluna, erros="raise")
 
 
 def remove_datas_duplicadas(df: DataFrame, col: str) -> DataFrame:
@@ -247,21 +209,4 @@ def texto_para_data(texto: str):
     Returns:
         - datetime: Um objeto datetime representando a data correspondente ao texto fornecido.
     """
-    meses = {
-        "jan": 1,
-        "fev": 2,
-        "mar": 3,
-        "abr": 4,
-        "mai": 5,
-        "jun": 6,
-        "jul": 7,
-        "ago": 8,
-        "set": 9,
-        "out": 10,
-        "nov": 11,
-        "dez": 12,
-    }
-    partes = texto.split("/")
-    numero_mes = meses.get(partes[0].lower())
-    ano = int(partes[1])
-    return datetime(ano, numero_mes, 1)
+    return converte_datas(pd.Series([texto])).iloc[0].to_pydatetime()
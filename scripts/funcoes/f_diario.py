@@ -0,0 +1,83 @@
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set, Tuple
+from scripts.classes.Sessao import Sessao
+
+TABELA_DIARIO = "diario"
+
+# status de cada arquivo no diário da execução
+PENDENTE: str = "pendente"  # ainda não lido (lote iniciado)
+LIDA: str = "lida"  # lido e identificado, consumos ainda não gravados
+GRAVADA: str = "gravada"  # consumos gravados no banco (ou distribuidora sem leitor), não é lido novamente ao retomar
+FALHA: str = "falha"  # erro ao ler, identificar ou gravar o arquivo (motivo gravado), é lido novamente ao retomar
+
+ChaveArquivo = Tuple[str, int, int]
+
+
+def chave_arquivo(caminho: str, info: Optional[os.stat_result] = None) -> ChaveArquivo:
+    """
+    Chave do arquivo no diário: caminho, data de modificação (ns) e tamanho (bytes).
+    Um arquivo alterado depois de gravado recebe uma nova chave, e é lido novamente ao retomar
+
+    Args:
+        - caminho (str): caminho para o arquivo pdf
+        - info (os.stat_result | None): informações do arquivo ja obtidas (ex.: os.DirEntry.stat()), se None consulta o disco
+
+    Returns:
+        - Tuple[str, int, int]: caminho, mtime (ns) e tamanho
+    """
+    info = info or os.stat(caminho)
+    return caminho, info.st_mtime_ns, info.st_size
+
+
+def inicia_diario(sessao: Sessao, retomar: bool = False) -> Set[ChaveArquivo]:
+    """
+    Inicia o diário da execução (na transação da sessão): sem retomar, apaga o diário da execução anterior
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+        - retomar (bool): se True, mantem o diário e retorna os arquivos ja concluídos
+
+    Returns:
+        - Set[Tuple[str, int, int]]: chaves dos arquivos com status gravada (vazio sem retomar)
+    """
+    if not retomar:
+        sessao.conn.execute(f"DELETE FROM {TABELA_DIARIO}")
+        return set()
+    cursor = sessao.conn.execute(f"SELECT caminho, mtime_ns, tamanho FROM {TABELA_DIARIO} WHERE status = ?", (GRAVADA,))
+    return set(cursor.fetchall())
+
+
+def registra_status(
+        sessao: Sessao,
+        chaves: Iterable[ChaveArquivo],
+        status: str,
+        motivos: Optional[Dict[str, str]] = None
+        ) -> None:
+    """
+    Grava o status dos arquivos no diário (na transação da sessão, sem confirmar)
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+        - chaves (Iterable[Tuple[str, int, int]]): chaves dos arquivos, de chave_arquivo
+        - status (str): PENDENTE, LIDA, GRAVADA ou FALHA
+        - motivos (Dict[str, str] | None): relação caminho <-> motivo (ex.: erro da leitura)
+    """
+    motivos = motivos or {}
+    atualizado = datetime.now().isoformat(timespec="seconds")
+    sessao.conn.executemany(
+        f"INSERT OR REPLACE INTO {TABELA_DIARIO} (caminho, mtime_ns, tamanho, status, motivo, atualizado) VALUES (?, ?, ?, ?, ?, ?)",
+        [(caminho, mtime_ns, tamanho, status, motivos.get(caminho), atualizado) for caminho, mtime_ns, tamanho in chaves]
+    )
+
+
+def resumo_diario(sessao: Sessao) -> Dict[str, int]:
+    """
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+
+    Returns:
+        - Dict[str, int]: quantidade de arquivos do diário por status
+    """
+    cursor = sessao.conn.execute(f"SELECT status, COUNT(*) FROM {TABELA_DIARIO} GROUP BY status ORDER BY status")
+    return dict(cursor.fetchall())
@@ -0,0 +1,67 @@
+import hashlib
+import importlib
+from typing import Dict, NamedTuple, Optional, Tuple
+
+
+class Distribuidora(NamedTuple):
+    """
+    Declaração de uma distribuidora, usada para identificar as faturas sem importar os leitores (que importam o pandas)
+
+    Attributes:
+        - marcadores (Tuple[str, ...]): textos (em letras minúsculas) encontrados apenas nas faturas da distribuidora
+        - prioridade (int): quando marcadores de mais de uma distribuidora são encontrados, vence a de maior prioridade
+        (empate = fatura não identificada)
+        - suportada (bool): se a leitura do histórico (main) está implementada, as não suportadas são apenas identificadas
+    """
+    marcadores: Tuple[str, ...]
+    prioridade: int = 0
+    suportada: bool = False
+
+
+# distribuidoras conhecidas, pelo nome da distribuidora (o mesmo nome do modulo e da classe em scripts/classes, ex.: CPFL.CPFL)
+CATALOGO: Dict[str, Distribuidora] = {
+    "CEMIG": Distribuidora(("fale com cemig",), suportada=True),
+    "COPEL": Distribuidora(("copel distribuição s.a",), suportada=True),
+    "CPFL": Distribuidora(("cpflempresas",), suportada=True),
+    "EDP": Distribuidora(("edp são paulo distribuição de energia s.a.",), suportada=True),
+    "ELEKTRO": Distribuidora(("elektro redes s.a.",)),
+    "ENEL": Distribuidora(("eletropaulo metropolitana eletricidade de são paulo s.a",), suportada=True),
+}
+
+
+def suportada(distribuidora: str) -> bool:
+    """
+    Args:
+        - distribuidora (str): nome da distribuidora (ex.: "CPFL")
+
+    Returns:
+        - bool: se a distribuidora está no catalogo e a leitura do histórico está implementada
+    """
+    declaracao = CATALOGO.get(distribuidora)
+    return declaracao is not None and declaracao.suportada
+
+
+def assinatura_catalogo() -> str:
+    """
+    Hash das declarações do CATALOGO (nomes, marcadores, prioridades e se são suportadas), parte da chave do cache de faturas:
+    ao declarar uma distribuidora ou mudar um marcador, as faturas ja lidas (inclusive as não identificadas) são lidas novamente
+
+    Returns:
+        - str: hash em hexadecimal (16 caracteres)
+    """
+    return hashlib.sha256(repr(sorted(CATALOGO.items())).encode("utf-8")).hexdigest()[:16]
+
+
+def get_classe(distribuidora: Optional[str]) -> Optional[type]:
+    """
+    Importa o leitor da distribuidora apenas quando a primeira fatura dela é lida
+
+    Args:
+        - distribuidora (str | None): nome da distribuidora (ex.: "CPFL")
+
+    Returns:
+        - type | None: classe da distribuidora (subclasse de Fatura), ou None se a distribuidora não está no catalogo
+    """
+    if distribuidora not in CATALOGO:
+        return None
+    return getattr(importlib.import_module(f"scripts.classes.{distribuidora}"), distribuidora)
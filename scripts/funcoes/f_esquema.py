@@ -0,0 +1,174 @@
+from typing import Callable, Dict, List
+from scripts.classes.Sessao import Sessao
+
+# versão do esquema do banco de dados (PRAGMA user_version), incrementar ao adicionar uma migração
+VERSAO_ESQUEMA: int = 3
+
+# colunas de consumo copiadas das tabelas antigas das distribuidoras (as ausentes na tabela antiga ficam nulas)
+COLUNAS_LEGADAS: List[str] = [
+    "consumo_ponta", "consumo_fora_de_ponta", "demanda_ponta", "demanda_fora_de_ponta", "medida_consumo", "medida_demanda",
+]
+
+SQL_CLIENTES: List[str] = [
+    """CREATE TABLE IF NOT EXISTS clientes (
+        cliente_id INTEGER PRIMARY KEY,
+        id TEXT,
+        distribuidora TEXT,
+        nome TEXT,
+        uc TEXT
+    )""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_clientes_nome_uc ON clientes (nome, uc)",
+]
+
+SQL_CONSUMOS: List[str] = [
+    """CREATE TABLE IF NOT EXISTS consumos (
+        cliente_id INTEGER NOT NULL REFERENCES clientes (cliente_id),
+        distribuidora TEXT NOT NULL,
+        competencia TEXT NOT NULL,
+        consumo_ponta REAL,
+        consumo_fora_de_ponta REAL,
+        demanda_ponta REAL,
+        demanda_fora_de_ponta REAL,
+        medida_consumo TEXT,
+        medida_demanda TEXT
+    )""",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ux_consumos_cliente_id_competencia ON consumos (cliente_id, competencia)",
+    "CREATE INDEX IF NOT EXISTS ix_consumos_distribuidora_competencia ON consumos (distribuidora, competencia)",
+]
+
+SQL_EXPORTACOES: List[str] = [
+    """CREATE TABLE IF NOT EXISTS exportacoes (
+        cliente_id INTEGER NOT NULL REFERENCES clientes (cliente_id),
+        formato TEXT NOT NULL,
+        ultima_competencia TEXT NOT NULL,
+        quantidade INTEGER NOT NULL,
+        PRIMARY KEY (cliente_id, formato)
+    )""",
+]
+
+SQL_DIARIO: List[str] = [
+    """CREATE TABLE IF NOT EXISTS diario (
+        caminho TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,
+        tamanho INTEGER NOT NULL,
+        status TEXT NOT NULL,
+        motivo TEXT,
+        atualizado TEXT,
+        PRIMARY KEY (caminho, mtime_ns, tamanho)
+    )""",
+]
+
+
+def get_versao_esquema(sessao: Sessao) -> int:
+    """
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+
+    Returns:
+        - int: versão do esquema do banco de dados (0 = banco novo ou anterior as migrações)
+    """
+    return sessao.conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def tabelas_legadas(sessao: Sessao) -> List[str]:
+    """
+    Obtem as tabelas de consumo no formato antigo (uma tabela por distribuidora, com a coluna id_datas)
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+
+    Returns:
+        - List[str]: nome das tabelas (distribuidoras)
+    """
+    tabelas = [linha[0] for linha in sessao.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+    return [
+        tabela for tabela in tabelas
+        if tabela not in ("clientes", "consumos")
+        and "id_datas" in (coluna[1] for coluna in sessao.conn.execute(f'PRAGMA table_info("{tabela}")'))
+    ]
+
+
+def _migra_para_v1(sessao: Sessao) -> None:
+    """
+    Tabela consumos normalizada (cliente_id inteiro, distribuidora e competencia) no lugar de uma tabela por distribuidora:
+        - recria a tabela clientes com a chave inteira cliente_id, mantendo os ids (uuid) e a ordem dos clientes
+        - cria a tabela consumos e copia os consumos das tabelas de cada distribuidora,
+        a competencia (AAAA-MM-01) vem do final do id_datas (MMAAAA),
+        as colunas de consumo que não existem na tabela antiga (ex.: demanda_ponta da CPFL) ficam nulas
+    As tabelas antigas das distribuidoras são mantidas, mas deixam de ser atualizadas
+    """
+    conn = sessao.conn
+    legadas = tabelas_legadas(sessao)
+    colunas_clientes = [coluna[1] for coluna in conn.execute('PRAGMA table_info("clientes")')]
+    if colunas_clientes and "cliente_id" not in colunas_clientes:
+        conn.execute("DROP INDEX IF EXISTS ux_clientes_nome_uc")
+        conn.execute("ALTER TABLE clientes RENAME TO clientes_v0")
+        for sql in SQL_CLIENTES:
+            conn.execute(sql)
+        conn.execute(
+            "INSERT OR IGNORE INTO clientes (id, distribuidora, nome, uc) SELECT id, distribuidora, nome, uc FROM clientes_v0 ORDER BY rowid"
+        )
+        conn.execute("DROP TABLE clientes_v0")
+    for sql in SQL_CLIENTES + SQL_CONSUMOS:
+        conn.execute(sql)
+
+    for tabela in legadas:
+        existentes = {coluna[1] for coluna in conn.execute(f'PRAGMA table_info("{tabela}")')}
+        selecao = ", ".join(
+            f'"{tabela}".{coluna}' if coluna in existentes else f"NULL AS {coluna}" for coluna in COLUNAS_LEGADAS
+        )
+        conn.execute(
+            f"""INSERT OR IGNORE INTO consumos (
+                cliente_id, distribuidora, competencia, {", ".join(COLUNAS_LEGADAS)}
+            )
+            SELECT
+                clientes.cliente_id, ?, SUBSTR(id_datas, -4) || '-' || SUBSTR(id_datas, -6, 2) || '-01', {selecao}
+            FROM "{tabela}" INNER JOIN clientes ON clientes.id = SUBSTR(id_datas, 1, LENGTH(id_datas) - 7)""",
+            (tabela,)
+        )
+
+
+def _migra_para_v2(sessao: Sessao) -> None:
+    """
+    Tabela exportacoes: ultima competencia e quantidade de consumos ja exportados de cada cliente, por formato de exportação
+    """
+    for sql in SQL_EXPORTACOES:
+        sessao.conn.execute(sql)
+
+
+def _migra_para_v3(sessao: Sessao) -> None:
+    """
+    Tabela diario: status de cada arquivo da ultima execução (pendente, lida, gravada ou falha), para retomar uma execução interrompida
+    """
+    for sql in SQL_DIARIO:
+        sessao.conn.execute(sql)
+
+
+MIGRACOES: Dict[int, Callable[[Sessao], None]] = {
+    1: _migra_para_v1,
+    2: _migra_para_v2,
+    3: _migra_para_v3,
+}
+
+
+def migra_banco(sessao: Sessao) -> int:
+    """
+    Aplica as migrações ainda não aplicadas ao banco de dados (de acordo com o PRAGMA user_version)
+    As migrações e a nova versão são confirmadas juntas, em uma transação separada das gravações da execução
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+
+    Returns:
+        - int: versão do esquema após as migrações
+    """
+    versao = get_versao_esquema(sessao)
+    if versao >= VERSAO_ESQUEMA:
+        return versao
+    if not sessao.conn.in_transaction:
+        sessao.conn.execute("BEGIN")
+    for nova_versao in range(versao + 1, VERSAO_ESQUEMA + 1):
+        MIGRACOES[nova_versao](sessao)
+        sessao.conn.execute(f"PRAGMA user_version = {nova_versao}")
+    sessao.commit()
+    return VERSAO_ESQUEMA
@@ -0,0 +1,47 @@
+from typing import Any, Dict, List
+from scripts.classes.Sessao import Sessao
+from scripts.funcoes.f_esquema import VERSAO_ESQUEMA, get_versao_esquema
+from scripts.funcoes.f_diario import TABELA_DIARIO, resumo_diario
+
+
+def consumos_por_distribuidora(sessao: Sessao) -> List[Dict[str, Any]]:
+    """
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+
+    Returns:
+        - List[Dict[str, Any]]: por distribuidora, quantidade de clientes e de consumos, primeira e ultima competencia
+    """
+    if not (sessao.tabela_existe("clientes") and sessao.tabela_existe("consumos")):
+        return []
+    cursor = sessao.conn.execute(
+        """SELECT clientes.distribuidora, COUNT(DISTINCT clientes.cliente_id), COUNT(consumos.competencia),
+            MIN(consumos.competencia), MAX(consumos.competencia)
+        FROM clientes LEFT JOIN consumos ON consumos.cliente_id = clientes.cliente_id
+        GROUP BY clientes.distribuidora ORDER BY clientes.distribuidora"""
+    )
+    colunas = ["distribuidora", "clientes", "consumos", "primeira_competencia", "ultima_competencia"]
+    return [dict(zip(colunas, linha)) for linha in cursor]
+
+
+def get_estatisticas(sessao: Sessao) -> Dict[str, Any]:
+    """
+    Resumo do banco de dados apenas com consultas sql (sem pandas): versão do esquema, consumos por distribuidora,
+    status dos arquivos no diário da ultima execução e clientes exportados por formato
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+
+    Returns:
+        - Dict[str, Any]: estatisticas do banco
+    """
+    exportados = {}
+    if sessao.tabela_existe("exportacoes"):
+        exportados = dict(sessao.conn.execute("SELECT formato, COUNT(*) FROM exportacoes GROUP BY formato ORDER BY formato"))
+    return {
+        "versao_esquema": get_versao_esquema(sessao),
+        "versao_esquema_atual": VERSAO_ESQUEMA,
+        "distribuidoras": consumos_por_distribuidora(sessao),
+        "diario": resumo_diario(sessao) if sessao.tabela_existe(TABELA_DIARIO) else {},
+        "exportados": exportados,
+    }
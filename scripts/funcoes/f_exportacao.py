@@ -0,0 +1,49 @@
+import pandas as pd
+from pandas import DataFrame
+from scripts.classes.Sessao import Sessao
+
+
+def get_marcas_exportacao(sessao: Sessao, formato: str, apenas_alteradas: bool = True) -> DataFrame:
+    """
+    Obtem a marca atual (ultima competencia e quantidade de consumos) de cada cliente na tabela consumos,
+    comparando com a marca da ultima exportação no formato informado (tabela exportacoes)
+    Como os consumos gravados não são alterados (apenas novos são inseridos), a marca so muda quando o cliente recebe novos consumos
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+        - formato (str): formato da exportação (ex.: "csv")
+        - apenas_alteradas (bool): se True, retorna apenas os clientes com consumos novos desde a ultima exportação
+
+    Returns:
+        - DataFrame: tabela com as colunas cliente_id, distribuidora, ultima_competencia e quantidade
+    """
+    filtro = """WHERE exportacoes.cliente_id IS NULL
+        OR exportacoes.ultima_competencia <> marcas.ultima_competencia
+        OR exportacoes.quantidade <> marcas.quantidade"""
+    return pd.read_sql(
+        f"""SELECT marcas.cliente_id, clientes.distribuidora, marcas.ultima_competencia, marcas.quantidade FROM (
+            SELECT cliente_id, MAX(competencia) AS ultima_competencia, COUNT(*) AS quantidade FROM consumos GROUP BY cliente_id
+        ) AS marcas INNER JOIN clientes ON clientes.cliente_id = marcas.cliente_id
+        LEFT JOIN exportacoes ON exportacoes.cliente_id = marcas.cliente_id AND exportacoes.formato = ?
+        {filtro if apenas_alteradas else ""}""",
+        sessao.conn,
+        params=(formato,)
+    )
+
+
+def registra_exportacao(sessao: Sessao, marcas: DataFrame, formato: str) -> None:
+    """
+    Grava as marcas dos clientes exportados (na transação da sessão), para que a proxima exportação ignore os clientes sem consumos novos
+
+    Args:
+        - sessao (Sessao): Conexão com o banco de dados
+        - marcas (DataFrame): marcas obtidas por get_marcas_exportacao, dos clientes exportados
+        - formato (str): formato da exportação (ex.: "csv")
+    """
+    sessao.conn.executemany(
+        "INSERT OR REPLACE INTO exportacoes (cliente_id, formato, ultima_competencia, quantidade) VALUES (?, ?, ?, ?)",
+        [
+            (int(cliente_id), formato, ultima_competencia, int(quantidade))
+            for cliente_id, ultima_competencia, quantidade in marcas[["cliente_id", "ultima_competencia", "quantidade"]].itertuples(index=False)
+        ]
+    )
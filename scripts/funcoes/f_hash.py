@@ -0,0 +1,33 @@
+import hashlib
+
+
+def hash_arquivo(caminho: str, tamanho_bloco: int = 1 << 20) -> str:
+    """
+    Calcula o hash (sha256) do conteudo do arquivo, usado como chave do cache de faturas ja lidas (f_cache)
+    e do cache de textos (CacheTextos)
+
+    Args:
+        - caminho (str): caminho para o arquivo pdf
+        - tamanho_bloco (int): quantidade de bytes lidos por vez
+
+    Returns:
+        - str: hash do conteudo do arquivo em hexadecimal
+    """
+    sha = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(tamanho_bloco):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def hash_conteudo(conteudo: bytes) -> str:
+    """
+    Mesmo hash de hash_arquivo, a partir do conteudo do arquivo ja lido (sem ler o arquivo novamente)
+
+    Args:
+        - conteudo (bytes): conteudo do arquivo pdf
+
+    Returns:
+        - str: hash do conteudo em hexadecimal
+    """
+    return hashlib.sha256(conteudo).hexdigest()
@@ -0,0 +1,121 @@
+import os
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+from scripts.classes.Identificador import Identificador
+from scripts.funcoes.f_arquivos import varre_pasta
+
+# status de cada arquivo na identificação (sem leitura do histórico)
+IDENTIFICADA: str = "identificada"
+SEM_MARCADOR: str = "sem_marcador"  # nenhum marcador encontrado (distribuidora desconhecida ou pdf sem texto)
+AMBIGUA: str = "ambigua"  # marcadores de mais de uma distribuidora, sem desempate pela prioridade
+ERRO: str = "erro"  # pdf não pode ser aberto
+PULADA: str = "pulada"  # maior que o tamanho maximo, não é aberto
+
+COLUNAS: List[str] = ["arquivo", "caminho", "tamanho", "status", "distribuidora", "candidatas", "erro", "tempo_s"]
+
+
+def identifica_arquivo(caminho: str, tamanho: int, tamanho_maximo: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Identifica a distribuidora de um pdf, sem ler o histórico (usado em paralelo por identifica_pasta)
+
+    Args:
+        - caminho (str): caminho para o pdf
+        - tamanho (int): tamanho do arquivo (bytes), da listagem da pasta
+        - tamanho_maximo (int | None): arquivos maiores (bytes) não são abertos, None abre todos
+
+    Returns:
+        - Dict[str, Any]: classificação do arquivo (COLUNAS), candidatas separadas por "|"
+    """
+    inicio = time.perf_counter()
+    registro = {
+        "arquivo": os.path.basename(caminho), "caminho": caminho, "tamanho": tamanho, "status": PULADA,
+        "distribuidora": None, "candidatas": "", "erro": None, "tempo_s": 0.0,
+    }
+    if tamanho_maximo is not None and tamanho > tamanho_maximo:
+        return registro
+    try:
+        identificador = Identificador(infos={registro["arquivo"]: caminho}, tamanho=tamanho)
+        with identificador.documento:
+            distribuidora = identificador.get_distribuidora()
+    except Exception as erro:
+        registro.update(status=ERRO, erro=f"{type(erro).__name__}: {erro}")
+    else:
+        status = IDENTIFICADA if distribuidora else AMBIGUA if len(identificador.candidatas) > 1 else SEM_MARCADOR
+        registro.update(status=status, distribuidora=distribuidora, candidatas="|".join(identificador.candidatas))
+    registro["tempo_s"] = time.perf_counter() - inicio
+    return registro
+
+
+def identifica_pasta(PATH: str, processos: Optional[int] = None, tamanho_maximo_mb: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Identifica todos os arquivos da pasta, em série ou em paralelo, mantendo a ordem da listagem
+
+    Args:
+        - PATH (str): caminho para os pdfs
+        - processos (int | None): quantidade de processos, None usa a quantidade de CPUs e 1 identifica em série
+        - tamanho_maximo_mb (float | None): arquivos maiores são pulados sem abrir, None abre todos
+
+    Returns:
+        - List[Dict[str, Any]]: classificação de cada arquivo (ver identifica_arquivo)
+    """
+    entradas = [(entrada.path, entrada.stat().st_size) for entrada in varre_pasta(PATH)]
+    caminhos, tamanhos = [caminho for caminho, _ in entradas], [tamanho for _, tamanho in entradas]
+    maximos = [None if tamanho_maximo_mb is None else int(tamanho_maximo_mb * 1024 * 1024)] * len(entradas)
+    processos = processos or os.cpu_count() or 1
+    if processos == 1 or len(entradas) <= 1:
+        return list(map(identifica_arquivo, caminhos, tamanhos, maximos))
+    chunksize = max(1, len(entradas) // (processos * 4))
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        return list(executor.map(identifica_arquivo, caminhos, tamanhos, maximos, chunksize=chunksize))
+
+
+def resume_identificacao(registros: List[Dict[str, Any]], tempo: float) -> Dict[str, Any]:
+    """
+    Contagens da identificação: arquivos por distribuidora e por status, e a vazão (arquivos/s)
+
+    Args:
+        - registros (List[Dict[str, Any]]): classificação de cada arquivo, de identifica_pasta
+        - tempo (float): tempo total da identificação (s)
+
+    Returns:
+        - Dict[str, Any]: resumo da identificação
+    """
+    distribuidoras: Dict[str, int] = {}
+    status: Dict[str, int] = {situacao: 0 for situacao in (IDENTIFICADA, SEM_MARCADOR, AMBIGUA, ERRO, PULADA)}
+    for registro in registros:
+        status[registro["status"]] += 1
+        if registro["distribuidora"]:
+            distribuidoras[registro["distribuidora"]] = distribuidoras.get(registro["distribuidora"], 0) + 1
+    return {
+        "arquivos": len(registros),
+        "distribuidoras": dict(sorted(distribuidoras.items())),
+        "status": status,
+        "nao_identificados": status[SEM_MARCADOR] + status[AMBIGUA] + status[ERRO],
+        "tempo_s": tempo,
+        "arquivos_por_s": len(registros) / tempo if tempo else None,
+    }
+
+
+def salva_identificacao(registros: List[Dict[str, Any]], resumo: Dict[str, Any], caminho: str) -> None:
+    """
+    Salva a classificação de cada arquivo em csv (uma linha por arquivo, separado por ;) ou em json (com o resumo),
+    de acordo com a extensão do caminho
+
+    Args:
+        - registros (List[Dict[str, Any]]): classificação de cada arquivo, de identifica_pasta
+        - resumo (Dict[str, Any]): resumo da identificação, de resume_identificacao
+        - caminho (str): arquivo de destino (.csv ou .json)
+    """
+    if os.path.dirname(caminho):
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    if caminho.lower().endswith(".json"):
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"resumo": resumo, "arquivos": registros}, arquivo, ensure_ascii=False, indent=2)
+        return
+    with open(caminho, "w", encoding="utf-8", newline="") as arquivo:
+        escritor = csv.DictWriter(arquivo, fieldnames=COLUNAS, delimiter=";")
+        escritor.writeheader()
+        escritor.writerows(registros)
@@ -0,0 +1,83 @@
+import os
+import importlib
+from types import ModuleType
+from typing import Dict, Pattern
+
+# motores de regex suportados, "regex" é o pacote externo (pip install regex) e "re" o da biblioteca padrão
+MOTORES: tuple = ("re", "regex")
+
+# motor padrão, o mais rapido para os padrões abaixo segundo o benchmarks/bench_regex.py
+# pode ser alterado pela variavel de ambiente LEITOR_REGEX (ex.: LEITOR_REGEX=regex)
+MOTOR_PADRAO: str = "re"
+
+# padrões usados pelas distribuidoras, por distribuidora e nome
+PADROES: Dict[str, Dict[str, str]] = {
+    "CEMIG": {
+        "espacos": r"\s+",
+        "medida_consumo": r"energia\((\w*)\)",
+        "medida_demanda": r"demanda\((\w*)\)",
+        "nome": r"cliente: (\w.*) unidade:",
+        "ths": r"ths (\w+)\s",
+    },
+    "COPEL": {
+        "medida_consumo": r"consumo \((\wwh)",
+        "medida_demanda": r"demanda \((\ww)",
+    },
+    "CPFL": {
+        "demanda_fim": r"ll.*",
+        "datas_fim": r"(jul)?ll.*",
+        "datas_dias": r"\n\w.*dias",
+        "espaco": r"\s",
+    },
+    "ELEKTRO": {
+        "medida_consumo": r"consumo ponta te (\wwh)",
+        "medida_demanda": r"demanda tusd (\ww)",
+        "ths": r"horária (\w*)\s/",
+        "data": r"leitura atual: \d.*/(\d*/\d*)",
+    },
+    "ENEL": {
+        "nome_separador": r"\s{2,}|\s\-\s",
+        "medidas": r"quant\.\n?.*\((\ww)\/\s?\n?(\wwh)",
+        "medidas_alternativo": r"\((\ww)\/(\wwh)\/",
+        "historico_fim": r"\d\s(28|30|31)( \w+|\w+)",
+        "historico_colunas": r"\s+|\t",
+    },
+}
+
+
+def get_motor(nome: str = None) -> ModuleType:
+    """
+    Obtem o modulo do motor de regex
+
+    Args:
+        - nome (str | None): "re" ou "regex", se None usa a variavel de ambiente LEITOR_REGEX ou o MOTOR_PADRAO
+
+    Returns:
+        - ModuleType: modulo re ou regex (com a mesma interface: compile, search, sub, split...)
+    """
+    nome = nome or os.environ.get("LEITOR_REGEX", MOTOR_PADRAO)
+    if nome not in MOTORES:
+        raise ValueError(f"Motor de regex desconhecido: {nome} (opções: {', '.join(MOTORES)})")
+    return importlib.import_module(nome)
+
+
+def compila_padroes(motor: ModuleType) -> Dict[str, Dict[str, Pattern]]:
+    """
+    Compila todos os padrões das distribuidoras com o motor informado
+
+    Args:
+        - motor (ModuleType): modulo re ou regex, obtido por get_motor
+
+    Returns:
+        - Dict[str, Dict[str, Pattern]]: padrões compilados, por distribuidora e nome
+    """
+    return {
+        distribuidora: {nome: motor.compile(padrao) for nome, padrao in padroes.items()}
+        for distribuidora, padroes in PADROES.items()
+    }
+
+
+MOTOR: ModuleType = get_motor()
+
+# padrões compilados uma unica vez por processo (na importação), ex.: REGEX["CEMIG"]["nome"].search(texto)
+REGEX: Dict[str, Dict[str, Pattern]] = compila_padroes(MOTOR)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# os testes importam os modulos a partir da raiz do repositório, como o main.py e os benchmarks
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,139 @@
+import os
+import logging
+import main
+from scripts.classes import CacheTextos, Documento, Extrator, Identificador
+from scripts.funcoes import f_cache, f_distribuidoras
+from scripts.funcoes.f_hash import hash_arquivo
+from benchmarks import faturas_sinteticas
+from scripts.classes.Sessao import Sessao
+from scripts.funcoes.f_esquema import migra_banco
+
+
+def test_arquivo_inexistente_vai_para_falhas(tmp_path):
+    pasta = str(tmp_path / "pdfs")
+    (distribuidora, caminho), = faturas_sinteticas.salva_pdfs(pasta, 1)
+    inexistente = str(tmp_path / "naoexiste.pdf")
+    paths = [{"naoexiste": inexistente}, {distribuidora: caminho}]
+
+    falhas = {}
+    DISTRIBUIDORAS = main.set_distribuidoras(paths, processos=1, falhas=falhas)
+    assert list(falhas) == [inexistente]
+    assert [fatura.caminho for fatura in DISTRIBUIDORAS[distribuidora]] == [caminho]
+
+    with Sessao(str(tmp_path / "banco.db")) as sessao:
+        migra_banco(sessao)
+        falhas = {}
+        DISTRIBUIDORAS = main.set_distribuidoras(paths, processos=1, sessao=sessao, falhas=falhas)
+    assert list(falhas) == [inexistente]
+    assert falhas[inexistente].startswith(main.MOTIVO_ARQUIVO_INACESSIVEL)
+    assert [fatura.caminho for fatura in DISTRIBUIDORAS[distribuidora]] == [caminho]
+
+
+def test_leitura_em_paralelo_igual_a_leitura_em_serie(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    paths = [{distribuidora: caminho} for distribuidora, caminho in faturas_sinteticas.salva_pdfs(pasta, 12)]
+    # os processos de leitura herdam as variaveis de ambiente
+    monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "PyPDF2")
+    monkeypatch.setenv(CacheTextos.VARIAVEL_AMBIENTE, "")
+
+    def dados(DISTRIBUIDORAS):
+        return {
+            distribuidora: [
+                (fatura.caminho, fatura.nome, fatura.ths, fatura.medida_consumo, fatura.medida_demanda,
+                 None if fatura.consumo is None else fatura.consumo.to_dict("list"),
+                 None if fatura.demanda is None else fatura.demanda.to_dict("list"))
+                for fatura in faturas
+            ]
+            for distribuidora, faturas in DISTRIBUIDORAS.items()
+        }
+
+    em_serie = dados(main.set_distribuidoras(paths, processos=1))
+    assert sum(map(len, em_serie.values())) == len(paths)
+    assert dados(main.set_distribuidoras(paths, processos=2)) == em_serie
+
+
+def test_cache_de_faturas_por_extrator(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    (distribuidora, caminho), = faturas_sinteticas.salva_pdfs(pasta, 1)
+    resultado = main.processa_fatura_compacta({distribuidora: caminho})
+    _hash = hash_arquivo(caminho)
+    with Sessao(str(tmp_path / "banco.db")) as sessao:
+        migra_banco(sessao)
+        monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "PyPDF2")
+        f_cache.salva_resultados_em_cache(sessao, {_hash: resultado})
+        assert f_cache.get_resultados_em_cache(sessao, [_hash])[_hash].distribuidora == distribuidora
+        monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "pypdf")
+        assert f_cache.get_resultados_em_cache(sessao, [_hash]) == {}
+
+
+def test_fatura_nao_identificada_lida_novamente_apos_declarar_distribuidora(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    (distribuidora, caminho), = faturas_sinteticas.salva_pdfs(pasta, 1)
+    monkeypatch.setenv(CacheTextos.VARIAVEL_AMBIENTE, "")
+
+    def declara_catalogo(catalogo):
+        monkeypatch.setattr(f_distribuidoras, "CATALOGO", catalogo)
+        monkeypatch.setattr(Identificador, "CATALOGO", catalogo)
+        textos = {marcador: nome for nome, declaracao in catalogo.items() for marcador in declaracao.marcadores}
+        monkeypatch.setattr(Identificador, "TEXTOS_A_ENCONTRAR", textos)
+        monkeypatch.setattr(Identificador, "PADRAO_TEXTOS", Identificador.MOTOR.compile(
+            "|".join(map(Identificador.MOTOR.escape, textos))
+        ))
+
+    catalogo = dict(f_distribuidoras.CATALOGO)
+    with Sessao(str(tmp_path / "banco.db")) as sessao:
+        migra_banco(sessao)
+        declara_catalogo({nome: declaracao for nome, declaracao in catalogo.items() if nome != distribuidora})
+        falhas = {}
+        assert main.set_distribuidoras([{distribuidora: caminho}], processos=1, sessao=sessao, falhas=falhas) == {}
+        assert falhas == {caminho: main.MOTIVO_NAO_IDENTIFICADA}
+        # a fatura não identificada fica no cache, mas com a assinatura do catalogo sem a distribuidora
+        assert f_cache.get_resultados_em_cache(sessao, [hash_arquivo(caminho)]) == {hash_arquivo(caminho): None}
+
+        declara_catalogo(catalogo)
+        assert f_cache.get_resultados_em_cache(sessao, [hash_arquivo(caminho)]) == {}
+        DISTRIBUIDORAS = main.set_distribuidoras([{distribuidora: caminho}], processos=1, sessao=sessao)
+    assert [fatura.caminho for fatura in DISTRIBUIDORAS[distribuidora]] == [caminho]
+
+
+def test_erro_ao_gravar_cache_registrado(tmp_path, caplog):
+    with Sessao(str(tmp_path / "banco.db")) as sessao:
+        migra_banco(sessao)
+        f_cache.cria_tabela_cache(sessao.conn)
+        sessao.conn.execute(f"CREATE TRIGGER bloqueia BEFORE INSERT ON {f_cache.TABELA_CACHE} BEGIN SELECT RAISE(ABORT, 'bloqueado'); END")
+        with caplog.at_level(logging.WARNING, logger=f_cache.__name__):
+            assert f_cache.salva_resultados_em_cache(sessao, {"abc": None}) is False
+    assert "bloqueado" in caplog.text
+
+
+def test_tamanho_da_listagem_sem_consultar_o_disco(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    (distribuidora, caminho), = faturas_sinteticas.salva_pdfs(pasta, 1)
+    monkeypatch.setenv(CacheTextos.VARIAVEL_AMBIENTE, "")
+
+    def getsize_repetido(_caminho):
+        raise AssertionError("o tamanho do pdf foi consultado novamente no disco")
+
+    monkeypatch.setattr(Documento.os.path, "getsize", getsize_repetido)
+    falhas = {}
+    DISTRIBUIDORAS = main.set_distribuidoras(
+        [{distribuidora: caminho}], processos=1, falhas=falhas, tamanhos=[os.stat(caminho).st_size]
+    )
+    assert falhas == {}
+    assert [fatura.caminho for fatura in DISTRIBUIDORAS[distribuidora]] == [caminho]
+
+
+def test_hash_calculado_uma_vez_com_cache_de_textos(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    (distribuidora, caminho), = faturas_sinteticas.salva_pdfs(pasta, 1)
+    monkeypatch.setenv(CacheTextos.VARIAVEL_AMBIENTE, str(tmp_path / "textos"))
+
+    def hash_repetido(_caminho):
+        raise AssertionError("o hash do pdf foi calculado novamente no Documento")
+
+    monkeypatch.setattr(Documento, "hash_arquivo", hash_repetido)
+    with Sessao(str(tmp_path / "banco.db")) as sessao:
+        migra_banco(sessao)
+        DISTRIBUIDORAS = main.set_distribuidoras([{distribuidora: caminho}], processos=1, sessao=sessao)
+    assert [fatura.caminho for fatura in DISTRIBUIDORAS[distribuidora]] == [caminho]
+    assert os.listdir(tmp_path / "textos")
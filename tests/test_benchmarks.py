@@ -0,0 +1,20 @@
+import json
+from benchmarks import bench_leitor, faturas_sinteticas
+from scripts.funcoes.f_distribuidoras import CATALOGO
+
+
+def test_faturas_sinteticas_de_todas_as_distribuidoras():
+    faturas = faturas_sinteticas.faturas(len(CATALOGO) * 2)
+    assert {distribuidora for distribuidora, _, _ in faturas} == set(CATALOGO)
+    assert len({arquivo for _, arquivo, _ in faturas}) == len(faturas)
+
+
+def test_bench_leitor(tmp_path, capsys):
+    saida = str(tmp_path / "bench.json")
+    relatorio = bench_leitor.main_bench([12], repeticoes=1, saida=saida)
+    etapas = {resultado["etapa"] for resultado in relatorio["resultados"]}
+    assert etapas == {"identificacao", "leitura", "dataframe", "gravacao"}
+    assert all(resultado["faturas"] > 0 for resultado in relatorio["resultados"])
+    with open(saida, encoding="utf-8") as arquivo:
+        assert json.load(arquivo)["resultados"] == relatorio["resultados"]
+    assert "faturas/s" in capsys.readouterr().out
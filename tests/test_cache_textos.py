@@ -0,0 +1,37 @@
+import os
+import time
+import main
+from benchmarks import faturas_sinteticas
+from scripts.classes import CacheTextos, Extrator
+from scripts.classes.CacheTextos import CacheTextos as Cache
+
+
+def test_texto_do_cache_sem_abrir_o_pdf(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    (distribuidora, caminho), = faturas_sinteticas.salva_pdfs(pasta, 1)
+    monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "PyPDF2")
+    monkeypatch.setenv(CacheTextos.VARIAVEL_AMBIENTE, str(tmp_path / "textos"))
+    primeira = main.processa_fatura_compacta({distribuidora: caminho})
+
+    def abre(self, fonte):
+        raise AssertionError("o pdf foi aberto com o texto no cache")
+
+    monkeypatch.setattr(Extrator.ExtratorPyPDF2, "__init__", abre)
+    segunda = main.processa_fatura_compacta({distribuidora: caminho})
+    assert segunda.erro is None
+    assert (segunda.distribuidora, segunda.nome) == (primeira.distribuidora, primeira.nome)
+    assert segunda.consumo.equals(primeira.consumo)
+
+
+def test_limpeza_por_idade_e_tamanho(tmp_path):
+    cache = Cache(str(tmp_path), versao="extrator-1")
+    for chave in ("aa01", "bb02", "cc03"):
+        cache.salva(chave, 1, {"pagina_0": chave * 1000})
+    antigo = time.time() - 10 * 86400
+    os.utime(cache._caminho("aa01"), (antigo, antigo))
+
+    assert cache.limpa(idade_maxima_dias=5) == 1
+    assert cache.le("aa01") is None and cache.le("bb02") == (1, {"pagina_0": "bb02" * 1000})
+    # le atualiza a data de modificação: o texto usado por ultimo é mantido
+    assert cache.limpa(tamanho_maximo_mb=os.path.getsize(cache._caminho("bb02")) / (1024 * 1024)) == 1
+    assert cache.le("cc03") is None and cache.le("bb02") is not None
@@ -0,0 +1,84 @@
+import os
+import json
+import runpy
+import pytest
+import cli
+import main
+from benchmarks import bench_inicializacao, faturas_sinteticas
+from scripts.classes import Extrator
+from scripts.funcoes import f_identificacao
+
+
+@pytest.fixture
+def chamadas(monkeypatch):
+    """
+    Substitui os subcomandos, registrando o subcomando executado e os argumentos
+    """
+    registro = []
+    for nome in cli.SUBCOMANDOS:
+        monkeypatch.setitem(cli.SUBCOMANDOS, nome, lambda args, nome=nome: registro.append((nome, args)))
+    return registro
+
+
+@pytest.mark.parametrize("argv, subcomando, esperados", [
+    (["ingest", "pdfs", "--lote", "10", "--resume", "--sem-exportacao"], "ingest", {"path": "pdfs", "lote": 10, "retomar": True, "sem_exportacao": True}),
+    (["export", "--formato", "parquet", "--saida", "destino", "--banco", "b.db"], "export", {"formato": "parquet", "saida": "destino", "banco": "b.db"}),
+    (["identify", "pdfs", "--processos", "2", "--tamanho-maximo-mb", "1.5"], "identify", {"path": "pdfs", "processos": 2, "tamanho_maximo_mb": 1.5}),
+    (["stats", "--banco", "b.db"], "stats", {"banco": "b.db"}),
+])
+def test_subcomandos(chamadas, argv, subcomando, esperados):
+    cli.executa(argv)
+    (nome, args), = chamadas
+    assert nome == subcomando
+    assert {chave: getattr(args, chave) for chave in esperados} == esperados
+
+
+def test_main_py_pasta_executa_ingest(chamadas, monkeypatch):
+    monkeypatch.setattr("sys.argv", ["main.py", "pdfs", "--processos", "1"])
+    runpy.run_path(main.__file__, run_name="__main__")
+    (nome, args), = chamadas
+    assert (nome, args.path, args.processos) == ("ingest", "pdfs", 1)
+
+    # um subcomando explicito não é trocado pelo padrão
+    cli.executa(["stats"], padrao="ingest")
+    assert chamadas[-1][0] == "stats"
+
+
+def test_identify_pasta(tmp_path, monkeypatch, capsys):
+    pasta = str(tmp_path / "pdfs")
+    distribuidoras = sorted(distribuidora for distribuidora, _ in faturas_sinteticas.salva_pdfs(pasta, 6))
+    with open(os.path.join(pasta, "sem_marcador.pdf"), "wb") as arquivo:
+        arquivo.write(faturas_sinteticas.gera_pdf(["documento sem nenhum marcador"]))
+    monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "PyPDF2")
+    saida = str(tmp_path / "identificacao.json")
+    cli.executa(["identify", pasta, "--processos", "1", "--saida", saida])
+
+    with open(saida, encoding="utf-8") as arquivo:
+        resultado = json.load(arquivo)
+    assert sorted(registro["distribuidora"] for registro in resultado["arquivos"] if registro["distribuidora"]) == distribuidoras
+    assert resultado["resumo"]["arquivos"] == len(distribuidoras) + 1
+    assert resultado["resumo"]["status"][f_identificacao.SEM_MARCADOR] == 1
+    assert resultado["resumo"]["nao_identificados"] == 1
+    assert "arquivos/s" in capsys.readouterr().out
+
+
+def test_identify_valida_o_extrator_antes_de_iniciar(tmp_path, monkeypatch):
+    monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "PyPDF2")
+    monkeypatch.setattr(Extrator.EXTRATORES["pypdf"], "modulo", "pacote_que_nao_existe")
+
+    def identifica_pasta(*args, **kwargs):
+        raise AssertionError("a identificação começou com um extrator indisponivel")
+
+    monkeypatch.setattr(f_identificacao, "identifica_pasta", identifica_pasta)
+    with pytest.raises(ImportError, match="pypdf"):
+        cli.executa(["identify", str(tmp_path), "--extrator", "pypdf"])
+    assert os.environ[Extrator.VARIAVEL_AMBIENTE] == "PyPDF2"
+
+
+@pytest.mark.parametrize("subcomando", ["identify", "stats"])
+def test_subcomandos_leves_nao_importam_pandas(tmp_path, subcomando):
+    pasta, banco = str(tmp_path / "pdfs"), str(tmp_path / "banco.db")
+    os.makedirs(pasta)
+    # processo novo: os testes ja importaram o pandas neste processo
+    importados = bench_inicializacao.mede(bench_inicializacao.comandos(pasta, banco)[subcomando], repeticoes=1)["importados"]
+    assert importados == {"pandas": False, "numpy": False, "scripts.classes.CPFL": False}
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from benchmarks import faturas_sinteticas
+from scripts.classes.COPEL import COPEL
+from scripts.classes.Documento import Documento
+from scripts.funcoes.f_conversoes import converte_datas, converte_numeros, datas_invalidas
+
+
+def test_converte_datas_formatos_da_leitura_antiga():
+    datas = pd.Series(["jan/2023", "JAN/23", "janeiro de 2023", "01/2023", "1/23", "dez/99", "set-2024", None], name="datas")
+    convertidas = converte_datas(datas)
+    assert convertidas.name == "datas"
+    assert convertidas.iloc[:5].eq(pd.Timestamp(2023, 1, 1)).all()
+    assert convertidas.iloc[5] == pd.Timestamp(1999, 12, 1)
+    assert convertidas.iloc[6] == pd.Timestamp(2024, 9, 1)
+    assert pd.isna(convertidas.iloc[7])
+
+
+def test_converte_datas_invalidas():
+    datas = pd.Series(["fev/2023", "total"])
+    assert datas_invalidas(datas).to_list() == ["total"]
+    assert pd.isna(converte_datas(datas, erros="coerce").iloc[1])
+    with pytest.raises(ValueError, match="total"):
+        converte_datas(datas)
+
+
+def test_converte_numeros(caplog):
+    valores = pd.Series(["1.234,56", " 7 ", "", None, 3, "total"], name="consumo")
+    convertidos = converte_numeros(valores)
+    assert convertidos.iloc[:2].to_list() == [1234.56, 7.0]
+    assert convertidos.iloc[2:4].isna().all() and convertidos.iloc[4] == 3.0 and pd.isna(convertidos.iloc[5])
+    assert "1 numero(s) não reconhecido(s) em consumo" in caplog.text and "total" in caplog.text
+    assert converte_numeros(pd.Series(["1,234.5"]), decimal=".").to_list() == [1234.5]
+    with pytest.raises(ValueError, match="total"):
+        converte_numeros(valores, erros="raise")
+
+
+def test_copel_decimal_com_ponto():
+    paginas = faturas_sinteticas.copel(0)
+    paginas[1] = paginas[1].replace(" 80 90", " 80.5 90", 1)
+    fatura = COPEL("COPEL_0.pdf", Documento.de_textos(paginas))
+    fatura.main()
+    assert 80.5 in fatura.demanda.demanda_ponta.to_list()
@@ -0,0 +1,85 @@
+import os
+import main
+from benchmarks import faturas_sinteticas
+from scripts.classes.Sessao import Sessao
+from scripts.funcoes.f_esquema import migra_banco
+from scripts.funcoes.f_diario import FALHA, GRAVADA
+
+
+def ingere(db_path: str, pasta: str, retomar: bool = False) -> int:
+    with Sessao(db_path) as sessao:
+        migra_banco(sessao)
+        return sum(main.ingere_faturas(sessao, pasta, tamanho_lote=2, processos=1, retomar=retomar, pre_carga=0))
+
+
+def diario(db_path: str) -> dict:
+    with Sessao(db_path) as sessao:
+        return dict(sessao.conn.execute("SELECT caminho, status FROM diario"))
+
+
+def consumos(db_path: str) -> int:
+    with Sessao(db_path) as sessao:
+        return sessao.conn.execute("SELECT COUNT(*) FROM consumos").fetchone()[0]
+
+
+def test_falha_ao_gravar_lote_e_retomada(tmp_path, monkeypatch):
+    pasta, db_path = str(tmp_path / "pdfs"), str(tmp_path / "banco.db")
+    caminhos = [caminho for distribuidora, caminho in faturas_sinteticas.salva_pdfs(pasta, 6) if distribuidora in ("CPFL", "EDP")]
+    insere = Sessao.insere
+
+    def insere_com_falha(self, df, tabela, chave=None):
+        if tabela == "consumos":
+            raise RuntimeError("disco cheio")
+        return insere(self, df, tabela, chave)
+
+    monkeypatch.setattr(Sessao, "insere", insere_com_falha)
+    ingere(db_path, pasta)
+    status = diario(db_path)
+    assert all(status[caminho] == FALHA for caminho in caminhos)
+    assert consumos(db_path) == 0
+
+    # sem a falha, a retomada lê novamente os arquivos do lote que não foi gravado
+    monkeypatch.setattr(Sessao, "insere", insere)
+    puladas = main.CONTADORES["faturas_puladas"]
+    ingere(db_path, pasta, retomar=True)
+    status = diario(db_path)
+    assert all(status[caminho] == GRAVADA for caminho in caminhos)
+    assert main.CONTADORES["faturas_puladas"] == puladas
+    assert consumos(db_path) > 0
+    with Sessao(db_path) as sessao:
+        assert sessao.conn.execute("SELECT COUNT(*) FROM clientes").fetchone()[0] == len(os.listdir(pasta)) - 1
+
+
+def test_contadores_reiniciados_a_cada_execucao(tmp_path, monkeypatch):
+    pasta, db_path = str(tmp_path / "pdfs"), str(tmp_path / "banco.db")
+    faturas_sinteticas.salva_pdfs(pasta, 4)
+    monkeypatch.setenv("LEITOR_EXTRATOR", "PyPDF2")
+    monkeypatch.setenv("LEITOR_CACHE_TEXTOS", "")
+    executa = lambda: main.main(pasta, processos=1, retomar=True, cache_textos=None, exportar=False, banco=db_path, pre_carga=0)
+    executa()
+    puladas = []
+    for _ in range(2):
+        executa()
+        puladas.append(main.CONTADORES["faturas_puladas"])
+    assert puladas[0] > 0 and puladas == [puladas[0]] * 2
+
+
+def test_retomar_pula_gravadas_e_le_novamente_as_falhas(tmp_path):
+    pasta, db_path = str(tmp_path / "pdfs"), str(tmp_path / "banco.db")
+    caminhos = [caminho for _, caminho in faturas_sinteticas.salva_pdfs(pasta, 6)]
+    assert ingere(db_path, pasta) == len(caminhos)
+    assert set(diario(db_path).values()) == {GRAVADA}
+
+    # diário de uma execução anterior com uma falha
+    with Sessao(db_path) as sessao:
+        sessao.conn.execute("UPDATE diario SET status = ?, motivo = 'erro' WHERE caminho = ?", (FALHA, caminhos[0]))
+
+    main.reinicia_contadores()
+    assert ingere(db_path, pasta, retomar=True) == 1
+    assert main.CONTADORES["faturas_puladas"] == len(caminhos) - 1
+    assert diario(db_path) == {caminho: GRAVADA for caminho in caminhos}
+
+    # sem retomar, todos os arquivos são lidos novamente
+    main.reinicia_contadores()
+    assert ingere(db_path, pasta) == len(caminhos)
+    assert main.CONTADORES["faturas_puladas"] == 0
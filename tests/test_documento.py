@@ -0,0 +1,58 @@
+import main
+from benchmarks import faturas_sinteticas
+from scripts.classes import CacheTextos, Extrator
+from scripts.classes import Documento as modulo_documento
+from scripts.classes.Documento import Documento
+
+
+def test_pdf_aberto_e_extraido_uma_vez_por_fatura(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "PyPDF2")
+    monkeypatch.setenv(CacheTextos.VARIAVEL_AMBIENTE, "")
+    aberturas, extracoes = [], []
+    inicia, texto = Extrator.ExtratorPyPDF2.__init__, Extrator.ExtratorPyPDF2.texto
+    monkeypatch.setattr(Extrator.ExtratorPyPDF2, "__init__", lambda self, fonte: aberturas.append(1) or inicia(self, fonte))
+    monkeypatch.setattr(Extrator.ExtratorPyPDF2, "texto", lambda self, n: extracoes.append(n) or texto(self, n))
+
+    for distribuidora, caminho in faturas_sinteticas.salva_pdfs(pasta, 6):
+        aberturas.clear()
+        extracoes.clear()
+        # o Identificador e a classe da distribuidora compartilham o mesmo documento
+        fatura = main.processa_fatura({distribuidora: caminho})
+        assert fatura.distribuidora == distribuidora
+        assert len(aberturas) == 1
+        assert sorted(extracoes) == sorted(set(extracoes))
+
+
+def test_paginas_extraidas_sob_demanda(monkeypatch):
+    monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "PyPDF2")
+    monkeypatch.setenv(CacheTextos.VARIAVEL_AMBIENTE, "")
+    paginas = faturas_sinteticas.cpfl(0) + [f"pagina {n} sem historico" for n in range(8)]
+    documento = Documento("fatura.pdf", conteudo=faturas_sinteticas.gera_pdf(paginas))
+    assert len(documento.paginas) == len(paginas)
+    assert documento.paginas.extraidas == 0
+
+    assert documento.ultima_pagina == paginas[-1]
+    assert "cpfl" in documento.primeira_pagina
+    assert documento.primeira_pagina is documento.paginas["pagina_0"]
+    assert documento.paginas.extraidas == 2
+    assert set(documento.paginas.textos) == {"pagina_0", f"pagina_{len(paginas) - 1}"}
+
+
+def test_arquivo_grande_lido_do_disco_com_mmap(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    (distribuidora, caminho), = faturas_sinteticas.salva_pdfs(pasta, 1)
+    monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "PyPDF2")
+    monkeypatch.setenv(CacheTextos.VARIAVEL_AMBIENTE, "")
+    pequena = main.processa_fatura_compacta({distribuidora: caminho})
+
+    # qualquer arquivo passa a ser grande: não é carregado na memória nem pulado
+    monkeypatch.setattr(modulo_documento, "LIMITE_ARQUIVO_GRANDE", 1)
+    with Documento(caminho) as documento:
+        assert documento.grande and documento._mapa is not None
+        assert distribuidora.lower() in documento.primeira_pagina
+    assert documento._mapa is None and documento.primeira_pagina
+
+    grande = main.processa_fatura_compacta({distribuidora: caminho})
+    assert (grande.distribuidora, grande.nome) == (pequena.distribuidora, pequena.nome)
+    assert grande.consumo.equals(pequena.consumo)
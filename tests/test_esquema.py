@@ -0,0 +1,93 @@
+import sqlite3
+import pandas as pd
+from scripts.classes.Sessao import Sessao
+from scripts.funcoes.f_esquema import VERSAO_ESQUEMA, migra_banco, tabelas_legadas
+
+# clientes e consumos gravados pela versão anterior ao esquema (to_sql): id texto (uuid-nome-uc)
+# e uma tabela por distribuidora, com o id_datas (id-MMAAAA) e apenas as colunas lidas pelo leitor da distribuidora
+CLIENTES_LEGADOS = pd.DataFrame({
+    "id": ["3f1c9a2e-0b6d-4c8e-9f41-7d2a5b6c8e90-LNUF-123", "a7e4d1b0-5c2f-4e8a-b3d6-1f9c0e2a4b77-NRC-456/7", "sem-consumos"],
+    "distribuidora": ["CPFL", "CEMIG", "EDP"],
+    "nome": ["FULANO", "CICLANO", "BELTRANO"],
+    "uc": ["123", "456/7", "789"],
+})
+CONSUMOS_LEGADOS = {
+    "CPFL": pd.DataFrame({
+        "consumo_ponta": [10.5, 11.0],
+        "consumo_fora_de_ponta": [20.0, 21.0],
+        "medida_consumo": ["kWh", "kWh"],
+        "id_datas": [f"{CLIENTES_LEGADOS.id[0]}-122022", f"{CLIENTES_LEGADOS.id[0]}-012023"],
+    }),
+    "CEMIG": pd.DataFrame({
+        "consumo_ponta": [1.0, 2.0, 3.0],
+        "consumo_fora_de_ponta": [4.0, 5.0, 6.0],
+        "demanda_ponta": [7.0, 8.0, 9.0],
+        "demanda_fora_de_ponta": [10.0, 11.0, 12.0],
+        "medida_consumo": ["kWh"] * 3,
+        "medida_demanda": ["kW"] * 3,
+        # o ultimo consumo é de um cliente que não existe mais na tabela clientes
+        "id_datas": [f"{CLIENTES_LEGADOS.id[1]}-112022", f"{CLIENTES_LEGADOS.id[1]}-122022", "removido-uuid-X-1-122022"],
+    }),
+}
+
+
+def cria_banco_legado(db_path: str) -> None:
+    conn = sqlite3.connect(db_path)
+    CLIENTES_LEGADOS.to_sql("clientes", conn, index=False)
+    for distribuidora, consumos in CONSUMOS_LEGADOS.items():
+        consumos.to_sql(distribuidora, conn, index=False)
+    conn.close()
+
+
+def test_migracao_tabela_legada_sem_todas_as_colunas(tmp_path):
+    db_path = str(tmp_path / "legado.db")
+    with Sessao(db_path) as sessao:
+        sessao.conn.executescript(
+            """
+            CREATE TABLE clientes (id TEXT, distribuidora TEXT, nome TEXT, uc TEXT);
+            INSERT INTO clientes VALUES ('c1', 'CPFL', 'FULANO', '123');
+            CREATE TABLE CPFL (id_datas TEXT, consumo_ponta REAL, consumo_fora_de_ponta REAL, medida_consumo TEXT);
+            INSERT INTO CPFL VALUES ('c1-012023', 10.5, 20.0, 'kWh');
+            """
+        )
+        sessao.commit()
+
+    with Sessao(db_path) as sessao:
+        assert migra_banco(sessao) == VERSAO_ESQUEMA
+        consumos = sessao.conn.execute(
+            "SELECT distribuidora, competencia, consumo_ponta, consumo_fora_de_ponta, demanda_ponta, demanda_fora_de_ponta, "
+            "medida_consumo, medida_demanda FROM consumos"
+        ).fetchall()
+    assert consumos == [("CPFL", "2023-01-01", 10.5, 20.0, None, None, "kWh", None)]
+
+
+def test_migracao_do_banco_legado_para_consumos(tmp_path):
+    db_path = str(tmp_path / "legado.db")
+    cria_banco_legado(db_path)
+
+    with Sessao(db_path) as sessao:
+        assert sorted(tabelas_legadas(sessao)) == ["CEMIG", "CPFL"]
+        assert migra_banco(sessao) == VERSAO_ESQUEMA
+        clientes = sessao.conn.execute("SELECT cliente_id, id, distribuidora, nome, uc FROM clientes ORDER BY cliente_id").fetchall()
+        consumos = sessao.conn.execute(
+            """SELECT clientes.nome, consumos.distribuidora, competencia, consumo_ponta, consumo_fora_de_ponta,
+            demanda_ponta, demanda_fora_de_ponta, medida_consumo, medida_demanda
+            FROM consumos INNER JOIN clientes USING (cliente_id) ORDER BY clientes.nome, competencia"""
+        ).fetchall()
+        tabelas = {linha[0] for linha in sessao.conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+
+    # os clientes ganham a chave inteira, na mesma ordem e com o id antigo
+    assert clientes == [(i + 1, *linha) for i, linha in enumerate(CLIENTES_LEGADOS.itertuples(index=False, name=None))]
+    assert consumos == [
+        ("CICLANO", "CEMIG", "2022-11-01", 1.0, 4.0, 7.0, 10.0, "kWh", "kW"),
+        ("CICLANO", "CEMIG", "2022-12-01", 2.0, 5.0, 8.0, 11.0, "kWh", "kW"),
+        ("FULANO", "CPFL", "2022-12-01", 10.5, 20.0, None, None, "kWh", None),
+        ("FULANO", "CPFL", "2023-01-01", 11.0, 21.0, None, None, "kWh", None),
+    ]
+    # as tabelas antigas são mantidas, e as tabelas das migrações seguintes são criadas
+    assert {"CPFL", "CEMIG", "consumos", "exportacoes", "diario"} <= tabelas
+
+    # migrar novamente não duplica os consumos
+    with Sessao(db_path) as sessao:
+        assert migra_banco(sessao) == VERSAO_ESQUEMA
+        assert sessao.conn.execute("SELECT COUNT(*) FROM consumos").fetchone()[0] == len(consumos)
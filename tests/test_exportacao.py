@@ -0,0 +1,64 @@
+import os
+import pytest
+import pandas as pd
+import main
+from benchmarks import faturas_sinteticas
+from scripts.classes.Sessao import Sessao
+from scripts.funcoes.f_esquema import migra_banco
+
+
+def test_exportacao_incremental(tmp_path, monkeypatch):
+    pasta, db_path = str(tmp_path / "pdfs"), str(tmp_path / "banco.db")
+    faturas_sinteticas.salva_pdfs(pasta, 6)
+    exportados = []
+    monkeypatch.setattr(main, "salva_consumos_csv", lambda resultados, path_base: exportados.append(resultados))
+
+    with Sessao(db_path) as sessao:
+        migra_banco(sessao)
+        sum(main.ingere_faturas(sessao, pasta, processos=1, pre_carga=0))
+        clientes = sessao.conn.execute("SELECT COUNT(DISTINCT cliente_id) FROM consumos").fetchone()[0]
+        assert clientes > 1
+        assert main.exporta_consumos(sessao, path_base=str(tmp_path / "saida")) == clientes
+        sessao.commit()
+
+    # sem consumos novos, nenhum cliente é exportado novamente
+    with Sessao(db_path) as sessao:
+        assert main.exporta_consumos(sessao, path_base=str(tmp_path / "saida")) == 0
+        assert exportados[-1] == {}
+
+        # um consumo novo exporta apenas o seu cliente
+        cliente_id, distribuidora, nome, uc = sessao.conn.execute(
+            "SELECT cliente_id, distribuidora, nome, uc FROM clientes WHERE cliente_id IN (SELECT cliente_id FROM consumos) LIMIT 1"
+        ).fetchone()
+        sessao.conn.execute(
+            "INSERT INTO consumos (cliente_id, distribuidora, competencia, consumo_ponta, consumo_fora_de_ponta) "
+            "VALUES (?, ?, '2099-01-01', 1.0, 2.0)",
+            (cliente_id, distribuidora)
+        )
+        assert main.exporta_consumos(sessao, path_base=str(tmp_path / "saida")) == 1
+        assert [(linha[0], linha[1]) for linhas in exportados[-1].values() for linha in linhas] == [(nome, uc)] * (
+            sessao.conn.execute("SELECT COUNT(*) FROM consumos WHERE cliente_id = ?", (cliente_id,)).fetchone()[0]
+        )
+        assert main.exporta_consumos(sessao, path_base=str(tmp_path / "saida")) == 0
+
+
+def test_exportacao_parquet_particionada(tmp_path):
+    pytest.importorskip("pyarrow")
+    pasta, db_path, saida = str(tmp_path / "pdfs"), str(tmp_path / "banco.db"), str(tmp_path / "parquet")
+    faturas_sinteticas.salva_pdfs(pasta, 6)
+    with Sessao(db_path) as sessao:
+        migra_banco(sessao)
+        sum(main.ingere_faturas(sessao, pasta, processos=1, pre_carga=0))
+        clientes = sessao.conn.execute("SELECT COUNT(DISTINCT cliente_id) FROM consumos").fetchone()[0]
+        consumos = dict(sessao.conn.execute("SELECT distribuidora, COUNT(*) FROM consumos GROUP BY distribuidora"))
+        assert main.exporta_consumos(sessao, formato="parquet", path_base=saida) == clientes
+
+    df = pd.read_parquet(saida)
+    assert sorted(os.listdir(saida)) == sorted(f"distribuidora={distribuidora}" for distribuidora in consumos)
+    # cada cliente ganha a linha da previsão (mês seguinte ao ultimo, sem consumo)
+    por_distribuidora = df.groupby("distribuidora", observed=True).size().to_dict()
+    assert por_distribuidora == {
+        distribuidora: quantidade + df.loc[df.distribuidora == distribuidora, ["nome", "uc"]].drop_duplicates().shape[0]
+        for distribuidora, quantidade in consumos.items()
+    }
+    assert df.consumo_total.isna().sum() == df[["distribuidora", "nome", "uc"]].drop_duplicates().shape[0]
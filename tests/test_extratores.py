@@ -0,0 +1,23 @@
+import io
+import pytest
+from benchmarks import faturas_sinteticas
+from scripts.classes.Extrator import ExtratorPdfminer
+
+
+def test_pdfminer_extrai_todas_as_paginas_em_uma_passada(monkeypatch):
+    pytest.importorskip("pdfminer")
+    from pdfminer.high_level import extract_text
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter
+
+    conteudo = faturas_sinteticas.gera_pdf(faturas_sinteticas.copel(0))
+    esperados = [extract_text(io.BytesIO(conteudo), page_numbers=[n], laparams=LAParams()) for n in range(2)]
+
+    processadas = []
+    process_page = PDFPageInterpreter.process_page
+    monkeypatch.setattr(PDFPageInterpreter, "process_page", lambda self, pagina: processadas.append(pagina) or process_page(self, pagina))
+    extrator = ExtratorPdfminer(conteudo)
+    assert len(extrator) == 2
+    # a ultima página primeiro (como na identificação), e as páginas pedidas novamente não são interpretadas outra vez
+    assert [extrator.texto(1), extrator.texto(0), extrator.texto(1)] == [esperados[1], esperados[0], esperados[1]]
+    assert len(processadas) == 2
@@ -0,0 +1,24 @@
+from benchmarks import faturas_sinteticas
+from benchmarks.conformidade_extratores import carrega_pdfs, identificacoes_divergentes
+from scripts.classes.Identificador import Identificador
+
+
+def test_conteudo_bruto_identifica_a_mesma_distribuidora_do_texto(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    faturas_sinteticas.salva_pdfs(pasta, 12)
+    monkeypatch.setenv("LEITOR_EXTRATOR", "PyPDF2")
+    monkeypatch.setenv("LEITOR_CACHE_TEXTOS", "")
+    assert identificacoes_divergentes("PyPDF2", carrega_pdfs(pasta)) == 0
+
+
+def test_fonte_cid_identificada_pelo_texto_extraido(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    caminhos = faturas_sinteticas.salva_pdfs(pasta, 6, cid=True)
+    monkeypatch.setenv("LEITOR_EXTRATOR", "PyPDF2")
+    monkeypatch.setenv("LEITOR_CACHE_TEXTOS", "")
+    for distribuidora, caminho in caminhos:
+        identificador = Identificador({distribuidora: caminho})
+        # o texto em hexadecimal não aparece no conteudo bruto, que nem é descomprimido
+        assert identificador.documento.conteudo_bruto() == ""
+        assert identificador.get_distribuidora() == distribuidora
+    assert identificacoes_divergentes("PyPDF2", carrega_pdfs(pasta)) == 0
@@ -0,0 +1,31 @@
+import sqlite3
+import main
+from benchmarks import faturas_sinteticas
+from scripts.classes.Sessao import Sessao
+from scripts.funcoes.f_esquema import migra_banco
+from scripts.funcoes.f_diario import GRAVADA
+
+
+def test_em_lotes_consome_o_iteravel_aos_poucos():
+    consumidos = []
+    itens = (consumidos.append(i) or i for i in range(7))
+    lotes = main.em_lotes(itens, 3)
+    assert next(lotes) == [0, 1, 2] and consumidos == [0, 1, 2]
+    assert list(lotes) == [[3, 4, 5], [6]]
+    assert list(main.em_lotes(range(5), None)) == [[0, 1, 2, 3, 4]]
+    assert list(main.em_lotes([], 3)) == []
+
+
+def test_cada_lote_gravado_e_confirmado(tmp_path):
+    pasta, db_path = str(tmp_path / "pdfs"), str(tmp_path / "banco.db")
+    faturas_sinteticas.salva_pdfs(pasta, 6)
+    with Sessao(db_path) as sessao:
+        migra_banco(sessao)
+        lotes = main.ingere_faturas(sessao, pasta, tamanho_lote=2, processos=1, pre_carga=0)
+        assert next(lotes) == 2
+        # o primeiro lote ja está confirmado no banco antes de ler os demais arquivos
+        outra_conexao = sqlite3.connect(db_path)
+        gravadas = outra_conexao.execute("SELECT COUNT(*) FROM diario WHERE status = ?", (GRAVADA,)).fetchone()[0]
+        outra_conexao.close()
+        assert gravadas == 2
+        assert list(lotes) == [2, 2]
@@ -0,0 +1,57 @@
+import os
+import json
+import tracemalloc
+import pytest
+import main
+from benchmarks import faturas_sinteticas
+from scripts.classes import CacheTextos, Extrator
+from scripts.classes.Metricas import VARIAVEL_AMBIENTE, Metricas, mede_memoria
+
+
+def test_pico_de_memoria_por_etapa_aninhada(tmp_path):
+    metricas = Metricas()
+    fatura = {}
+    with metricas.etapa("externa"):
+        grande = bytearray(8 * 1024 * 1024)
+        del grande
+        with metricas.etapa("interna"):
+            with mede_memoria(fatura):
+                pequeno = bytearray(1024 * 1024)
+                del pequeno
+    interna, externa = metricas.etapas
+    assert 1 <= fatura["pico_tracemalloc_mb"] < 2
+    assert 1 <= interna["pico_tracemalloc_mb"] < 2
+    assert externa["pico_tracemalloc_mb"] > 7.5
+
+    metricas.salva(str(tmp_path / "relatorio.json"))
+    assert not tracemalloc.is_tracing()
+    assert VARIAVEL_AMBIENTE not in os.environ
+
+
+def test_sem_medicao_com_metricas_inativas():
+    metricas = Metricas(ativo=False)
+    fatura = {}
+    with metricas.etapa("etapa"), mede_memoria(fatura):
+        pass
+    assert fatura == {} and metricas.etapas == []
+
+
+def test_relatorio_salvo_e_medicao_encerrada_com_erro(tmp_path, monkeypatch):
+    pasta = str(tmp_path / "pdfs")
+    faturas_sinteticas.salva_pdfs(pasta, 2)
+    # variaveis de ambiente definidas pela main, restauradas ao final do teste
+    monkeypatch.setenv(Extrator.VARIAVEL_AMBIENTE, "PyPDF2")
+    monkeypatch.setenv(CacheTextos.VARIAVEL_AMBIENTE, "")
+
+    def exportacao_com_erro(*args, **kwargs):
+        raise RuntimeError("falha na exportação")
+
+    monkeypatch.setattr(main, "exporta_consumos", exportacao_com_erro)
+    relatorio = str(tmp_path / "relatorio.json")
+    with pytest.raises(RuntimeError):
+        main.main(pasta, processos=1, relatorio=relatorio, cache_textos=None, banco=str(tmp_path / "banco.db"))
+    assert not tracemalloc.is_tracing()
+    assert VARIAVEL_AMBIENTE not in os.environ
+    with open(relatorio, encoding="utf-8") as arquivo:
+        etapas = [etapa["nome"] for etapa in json.load(arquivo)["etapas"]]
+    assert "ingere_faturas" in etapas
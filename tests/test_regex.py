@@ -0,0 +1,26 @@
+import re
+import pytest
+from benchmarks import faturas_sinteticas
+from scripts.funcoes import f_regex
+
+
+def test_padroes_compilados_uma_vez_na_importacao():
+    assert set(f_regex.REGEX) == set(f_regex.PADROES)
+    for distribuidora, padroes in f_regex.PADROES.items():
+        assert {nome: padrao.pattern for nome, padrao in f_regex.REGEX[distribuidora].items()} == padroes
+
+
+def test_motores_encontram_os_mesmos_textos():
+    regex = pytest.importorskip("regex")
+    padroes_re, padroes_regex = f_regex.compila_padroes(re), f_regex.compila_padroes(regex)
+    for distribuidora, _, paginas in faturas_sinteticas.faturas(12):
+        texto = "\n".join(paginas).lower()
+        for nome, padrao in padroes_re.get(distribuidora, {}).items():
+            assert padrao.findall(texto) == padroes_regex[distribuidora][nome].findall(texto), (distribuidora, nome)
+
+
+def test_motor_desconhecido(monkeypatch):
+    monkeypatch.setenv("LEITOR_REGEX", "pcre")
+    with pytest.raises(ValueError, match="pcre"):
+        f_regex.get_motor()
+    assert f_regex.get_motor("re") is re
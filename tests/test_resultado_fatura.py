@@ -0,0 +1,28 @@
+import pickle
+import pytest
+from benchmarks import faturas_sinteticas
+from scripts.classes.Documento import Documento
+from scripts.classes.ResultadoFatura import ResultadoFatura
+from scripts.funcoes.f_distribuidoras import get_classe, suportada
+
+
+def test_resultado_sem_texto_do_pdf():
+    for distribuidora, arquivo, paginas in faturas_sinteticas.faturas(12):
+        if not suportada(distribuidora):
+            continue
+        fatura = get_classe(distribuidora)(arquivo, Documento.de_textos(paginas, arquivo))
+        fatura.main()
+        resultado = ResultadoFatura.de_fatura(fatura)
+
+        assert not hasattr(resultado, "__dict__")
+        with pytest.raises(AttributeError):
+            resultado.pdf = fatura.pdf
+        assert (resultado.distribuidora, resultado.nome, resultado.ths) == (fatura.distribuidora, fatura.nome, fatura.ths)
+        assert resultado.consumo.equals(fatura.consumo)
+        # cada acesso monta uma nova tabela, alterar a tabela não altera o resultado
+        resultado.consumo.iloc[0, 0] = None
+        assert resultado.consumo.equals(fatura.consumo)
+
+        # o resultado volta dos processos de leitura (pickle) sem o texto das páginas
+        copia = pickle.loads(pickle.dumps(resultado))
+        assert copia.consumo.equals(fatura.consumo) and copia.caminho == arquivo
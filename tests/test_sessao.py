@@ -0,0 +1,43 @@
+import logging
+import pytest
+import pandas as pd
+from scripts.classes import Sessao as modulo_sessao
+from scripts.classes.Sessao import Sessao
+
+
+def test_sessao_confirma_ou_desfaz_ao_sair(tmp_path):
+    db_path = str(tmp_path / "banco.db")
+    with Sessao(db_path) as sessao:
+        assert sessao.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        # insere não confirma a cada chamada (diferente do to_sql)
+        sessao.insere(pd.DataFrame({"nome": ["FULANO"], "uc": ["123"]}), "clientes")
+        assert sessao.conn.in_transaction
+
+    with pytest.raises(RuntimeError), Sessao(db_path) as sessao:
+        sessao.insere(pd.DataFrame({"nome": ["CICLANO"], "uc": ["456"]}), "clientes")
+        raise RuntimeError("erro durante a gravação")
+
+    with Sessao(db_path) as sessao:
+        assert sessao.conn.execute("SELECT nome FROM clientes").fetchall() == [("FULANO",)]
+
+
+def test_chave_unica_remove_e_informa_linhas_repetidas(tmp_path, caplog):
+    with Sessao(str(tmp_path / "banco.db")) as sessao:
+        sessao.conn.executescript(
+            """
+            CREATE TABLE clientes (id INTEGER, nome TEXT, uc TEXT);
+            INSERT INTO clientes VALUES (1, 'FULANO', '123'), (2, 'FULANO', '123'), (3, 'CICLANO', '456'), (4, 'FULANO', '123');
+            """
+        )
+        with caplog.at_level(logging.WARNING, logger=modulo_sessao.__name__):
+            assert sessao.garante_chave_unica("clientes", ["nome", "uc"]) == 2
+        assert "2 linha(s) repetida(s) em clientes" in caplog.text
+        assert [_id for _id, in sessao.conn.execute("SELECT id FROM clientes ORDER BY id")] == [1, 3]
+
+        # o indice ja existe: nada é removido, e as linhas repetidas são ignoradas ao inserir
+        assert sessao.garante_chave_unica("clientes", ["nome", "uc"]) == 0
+        sessao.insere(pd.DataFrame({"id": [5, 6], "nome": ["FULANO", "BELTRANO"], "uc": ["123", "789"]}), "clientes", chave=["nome", "uc"])
+        assert [_id for _id, in sessao.conn.execute("SELECT id FROM clientes ORDER BY id")] == [1, 3, 6]
+
+    with Sessao(str(tmp_path / "banco.db")) as sessao:
+        assert sessao.garante_chave_unica("clientes", ["nome", "uc"]) == 0